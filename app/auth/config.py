@@ -6,6 +6,11 @@ class Settings(BaseSettings):
     access_token_expire_day: int = Field(default=3)
     secret_key: str
     algorithm: str
+    # Shared-memory table of the roles and statuses of the users, read by the access checks of every worker
+    user_table_enabled: bool = Field(default=False)
+    user_table_name: str = Field(default="fastapi_base_users")
+    user_table_capacity: int = Field(default=65536)
+    user_table_refresh_seconds: float = Field(default=30.0)
 
 
 settings = Settings()
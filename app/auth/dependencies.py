@@ -0,0 +1,111 @@
+from fastapi import Request
+from monitoring.timing import span
+from utils import value
+
+from .exceptions import AuthErrorCode
+from .services import auth_services
+from .user_table import user_table
+
+
+class Principal:
+    """
+    The authenticated caller of a request.
+
+    Instances are created once per request from the bearer token and stored on `request.state.principal`,
+    so every later consumer (CommonsDependencies, services, controllers) reads the already decoded claims.
+
+    Attributes:
+        user_id (str): The ID of the authenticated user.
+        user_type (str): The role of the authenticated user (e.g., admin, user).
+    """
+
+    __slots__ = ("user_id", "user_type")
+
+    def __init__(self, user_id: str, user_type: str) -> None:
+        self.user_id = user_id
+        self.user_type = user_type
+
+    def is_admin(self) -> bool:
+        return self.user_type == value.UserRoles.ADMIN.value
+
+
+def get_bearer_token(authorization: str | None) -> str | None:
+    """
+    Extracts the token from an `Authorization: Bearer <token>` header value.
+
+    Args:
+        authorization (str | None): The raw value of the Authorization header.
+
+    Returns:
+        str | None: The token, or None if the header is missing or does not use the Bearer scheme.
+    """
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token.strip() or None
+
+
+async def resolve_principal(request: Request) -> Principal | None:
+    """
+    Resolves the principal of the request, parsing the bearer token at most once per request.
+
+    The result (including a failed resolution) is memoized on `request.state.principal`.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        Principal | None: The authenticated principal, or None if the token is missing or invalid.
+    """
+    state = request.state
+    if hasattr(state, "principal"):
+        return state.principal
+    principal = None
+    token = get_bearer_token(request.headers.get("authorization"))
+    if token:
+        payload = await auth_services.validate_access_token(token=token)
+        if payload:
+            principal = Principal(user_id=payload.get("user_id"), user_type=payload.get("user_type"))
+            # The current role and status of the user, when the shared table knows them, prevail over the claims of the token
+            access = user_table.get(user_id=principal.user_id)
+            if access is not None:
+                principal = None if access.deleted else Principal(user_id=principal.user_id, user_type=access.user_type or principal.user_type)
+    state.principal = principal
+    return principal
+
+
+class AccessControl:
+    """
+    A route dependency for controlling access to an api based on user roles.
+
+    Declare it on the route, e.g. `@router.get("/users", dependencies=[Depends(AccessControl(admin=True))])`.
+    FastAPI resolves route dependencies before the class-based view, so `CommonsDependencies` always sees the resolved principal.
+
+    Args:
+        admin (bool, optional): If set to True, the route will only be accessible to admin users. Defaults to False.
+        public (bool, optional): If set to True, the route will be accessible to all users without a token. Defaults to False.
+
+    Attributes:
+        admin (bool): Indicates whether the route should be restricted to admin users.
+        public (bool): Indicates whether the route is public.
+    """
+
+    __slots__ = ("admin", "public")
+
+    def __init__(self, admin: bool = False, public: bool = False) -> None:
+        self.admin = admin
+        self.public = public
+
+    async def __call__(self, request: Request) -> Principal | None:
+        request.state.is_public_api = self.public
+        if self.public:
+            return None
+        with span("auth"):
+            principal = await resolve_principal(request=request)
+        if principal is None:
+            raise AuthErrorCode.Unauthorize()
+        if self.admin and not principal.is_admin():
+            raise AuthErrorCode.Forbidden()
+        return principal
@@ -1,4 +1,5 @@
-from auth.decoractor import access_control
+from auth.dependencies import AccessControl
+from core.routing import TimedRoute
 from core.schemas import CommonsDependencies
 from fastapi import Depends
 from fastapi_restful.cbv import cbv
@@ -10,6 +11,7 @@ from .controllers import auth_controllers
 router = InferringRouter(
     prefix="/v1",
     tags=["v1/auth"],
+    route_class=TimedRoute,
 )
 
 
@@ -17,14 +19,14 @@ router = InferringRouter(
 class RoutersCBV:
     commons: CommonsDependencies = Depends(CommonsDependencies)  # type: ignore
 
-    @router.post("/auth/register", status_code=201, responses={201: {"model": schemas.LoginResponse, "description": "Register user success"}})
-    @access_control(public=True)
+    @router.post(
+        "/auth/register", status_code=201, responses={201: {"model": schemas.LoginResponse, "description": "Register user success"}}, dependencies=[Depends(AccessControl(public=True))]
+    )
     async def register(self, data: schemas.RegisterRequest):
         result = await auth_controllers.register_user(data=data)
         return schemas.LoginResponse.model_validate(obj=result)
 
-    @router.post("/auth/login", status_code=201, responses={201: {"model": schemas.LoginResponse, "description": "Register user success"}})
-    @access_control(public=True)
+    @router.post("/auth/login", status_code=201, responses={201: {"model": schemas.LoginResponse, "description": "Register user success"}}, dependencies=[Depends(AccessControl(public=True))])
     async def login(self, data: schemas.LoginRequest):
         result = await auth_controllers.login_user(data=data)
         return schemas.LoginResponse.model_validate(obj=result)
@@ -0,0 +1,251 @@
+import asyncio
+import fcntl
+import os
+import struct
+import tempfile
+import time
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Awaitable, Callable, Iterable
+
+from bson import ObjectId
+from loguru import logger
+
+from .config import settings
+
+# Header: magic, capacity, sequence (odd while the loader writes), time of the last load
+HEADER = struct.Struct("<4sIQd")
+HEADER_SIZE = 32
+MAGIC = b"UTB1"
+# Slot: the 12 bytes of the user ObjectId, the role and the status flags; an all-zero key marks an empty slot
+SLOT = struct.Struct("<12sBB2x")
+EMPTY_KEY = bytes(12)
+
+ROLES = {"admin": 1, "user": 2}
+ROLE_NAMES = {code: name for name, code in ROLES.items()}
+STATUS_ACTIVE = 1
+STATUS_DELETED = 2
+MAX_READ_ATTEMPTS = 1000
+
+# (user id, role, deleted)
+Entry = tuple[str, str, bool]
+
+
+class UserAccess:
+    """The role and status of a user, as read from the table."""
+
+    __slots__ = ("user_type", "deleted")
+
+    def __init__(self, user_type: str | None, deleted: bool) -> None:
+        self.user_type = user_type
+        self.deleted = deleted
+
+
+class SharedUserTable:
+    """
+    A fixed-size hash table of the roles and statuses of the users, in shared memory.
+
+    The workers of a host map the same memory segment. One of them is the loader, the only writer, which fills the table from
+    the `users` collection and refreshes it periodically; the others attach to it and only read. The loader is elected with
+    an exclusive lock on a file, released by the system when the process exits, so another worker takes over within a refresh.
+    A lookup is a few hashed probes in the mapped memory, without lock, database access or per-process copy of the users.
+
+    Readers use a sequence lock: the loader makes the sequence odd while it writes and even again after, and a reader
+    retries when the sequence was odd or changed during its read. The table is ignored when its last load is older than
+    `stale_seconds` (e.g. the loader died), and callers then fall back to the claims of the access token.
+
+    Args:
+        name (str): The name of the shared memory segment.
+        capacity (int): The number of slots, kept at most 3/4 full.
+        refresh_seconds (float): The interval of the full reloads by the loader.
+    """
+
+    def __init__(self, name: str, capacity: int, refresh_seconds: float) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.refresh_seconds = refresh_seconds
+        self.stale_seconds = refresh_seconds * 3
+        self.memory: shared_memory.SharedMemory | None = None
+        self.buffer: memoryview | None = None
+        self.is_loader = False
+        self.lock_file = None
+        self.task: asyncio.Task | None = None
+
+    def elect(self) -> bool:
+        """Tries to become the loader; returns whether this process is the loader."""
+        if self.is_loader:
+            return True
+        if self.lock_file is None:
+            self.lock_file = open(os.path.join(tempfile.gettempdir(), f"{self.name}.lock"), "a+")
+        try:
+            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        self.is_loader = True
+        if self.memory is None:
+            try:
+                self.memory = shared_memory.SharedMemory(name=self.name, create=True, size=HEADER_SIZE + self.capacity * SLOT.size)
+                self.untrack()
+                HEADER.pack_into(self.memory.buf, 0, MAGIC, self.capacity, 0, 0.0)
+                self.buffer = self.memory.buf
+            except FileExistsError:
+                # Left by a loader that exited
+                self.attach()
+        return True
+
+    def attach(self) -> bool:
+        """Maps the segment of the loader; returns False if it does not exist yet."""
+        if self.memory is not None:
+            return True
+        try:
+            self.memory = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        self.untrack()
+        magic, capacity, _, _ = HEADER.unpack_from(self.memory.buf, 0)
+        if magic != MAGIC:
+            self.memory.close()
+            self.memory = None
+            raise RuntimeError(f"The shared memory segment {self.name} is not a user table")
+        self.capacity = capacity
+        self.buffer = self.memory.buf
+        return True
+
+    def untrack(self) -> None:
+        # Before Python 3.13 the resource tracker of a process unlinks the segments it created or attached to when the process
+        # exits: the segment is owned by the table instead, and only unlinked explicitly with `close(unlink=True)`
+        resource_tracker.unregister(self.memory._name, "shared_memory")
+
+    def close(self, unlink: bool = False) -> None:
+        self.buffer = None
+        if self.memory is not None:
+            self.memory.close()
+            if unlink:
+                # `unlink` unregisters the segment from the resource tracker, which must know it
+                resource_tracker.register(self.memory._name, "shared_memory")
+                self.memory.unlink()
+            self.memory = None
+        if self.lock_file is not None:
+            # Closing the file releases the lock of the loader
+            self.lock_file.close()
+            self.lock_file = None
+        self.is_loader = False
+
+    def get_slot(self, key: bytes) -> int:
+        return zlib.crc32(key) % self.capacity
+
+    def get(self, user_id: str) -> UserAccess | None:
+        """
+        Looks up a user.
+
+        Args:
+            user_id (str): The ID of the user.
+
+        Returns:
+            UserAccess | None: The role and status of the user, or None if the table is not loaded, stale or does not know the user.
+        """
+        buffer = self.buffer
+        if buffer is None or not ObjectId.is_valid(user_id):
+            return None
+        key = ObjectId(user_id).binary
+        # Bounded, in case the loader died in the middle of a write
+        for _ in range(MAX_READ_ATTEMPTS):
+            _, _, sequence, loaded_at = HEADER.unpack_from(buffer, 0)
+            if sequence % 2:
+                continue
+            if time.time() - loaded_at > self.stale_seconds:
+                return None
+            result = None
+            slot = self.get_slot(key)
+            for _ in range(self.capacity):
+                slot_key, role, status = SLOT.unpack_from(buffer, HEADER_SIZE + slot * SLOT.size)
+                if slot_key == key:
+                    result = UserAccess(user_type=ROLE_NAMES.get(role), deleted=bool(status & STATUS_DELETED))
+                    break
+                if slot_key == EMPTY_KEY:
+                    break
+                slot = (slot + 1) % self.capacity
+            if HEADER.unpack_from(buffer, 0)[2] == sequence:
+                return result
+        return None
+
+    def build(self, entries: Iterable[Entry]) -> bytearray:
+        slots = bytearray(self.capacity * SLOT.size)
+        limit = self.capacity * 3 // 4
+        count = 0
+        for user_id, user_type, deleted in entries:
+            if count >= limit:
+                logger.warning(f"The user table is full ({limit} users), the other users fall back to the token claims")
+                break
+            self.write_slot(slots, 0, ObjectId(user_id).binary, user_type, deleted)
+            count += 1
+        return slots
+
+    def write_slot(self, buffer, offset: int, key: bytes, user_type: str, deleted: bool) -> None:
+        slot = self.get_slot(key)
+        for _ in range(self.capacity):
+            position = offset + slot * SLOT.size
+            slot_key = bytes(buffer[position : position + 12])
+            if slot_key in (key, EMPTY_KEY):
+                SLOT.pack_into(buffer, position, key, ROLES.get(user_type, 0), STATUS_DELETED if deleted else STATUS_ACTIVE)
+                return
+            slot = (slot + 1) % self.capacity
+
+    def write(self, apply: Callable[[], None]) -> None:
+        _, _, sequence, loaded_at = HEADER.unpack_from(self.buffer, 0)
+        # Normalised on entry: a previous loader may have died mid-write and left the sequence odd
+        writing = sequence | 1
+        HEADER.pack_into(self.buffer, 0, MAGIC, self.capacity, writing, loaded_at)
+        try:
+            apply()
+        finally:
+            HEADER.pack_into(self.buffer, 0, MAGIC, self.capacity, writing + 1, time.time())
+
+    def load(self, entries: Iterable[Entry]) -> None:
+        """Replaces the content of the table; a no-op outside the loader."""
+        if not self.is_loader:
+            return
+        slots = self.build(entries)
+        self.write(lambda: self.buffer.__setitem__(slice(HEADER_SIZE, HEADER_SIZE + len(slots)), slots))
+
+    def update(self, user_id: str, user_type: str, deleted: bool = False) -> None:
+        """Updates a user after a write of this process; a no-op outside the loader, whose next reload brings the change."""
+        if not self.is_loader or self.buffer is None:
+            return
+        self.write(lambda: self.write_slot(self.buffer, HEADER_SIZE, ObjectId(user_id).binary, user_type, deleted))
+
+    async def start(self, loader: Callable[[], Awaitable[list[Entry]]]) -> None:
+        """
+        Joins the table: loads it if this process is elected loader, else attaches to it. Then maintains it in the background.
+
+        Args:
+            loader (Callable[[], Awaitable[list[Entry]]]): Reads the (user id, role, deleted) entries of every user.
+        """
+        if self.elect():
+            self.load(await loader())
+        else:
+            self.attach()
+        self.task = asyncio.create_task(self.maintain(loader=loader))
+
+    async def maintain(self, loader: Callable[[], Awaitable[list[Entry]]]) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                # A reader takes over when the loader exited
+                if self.elect():
+                    self.load(await loader())
+                else:
+                    self.attach()
+            except Exception as error:
+                logger.warning(f"Could not maintain the user table: {error}")
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        # The segment outlives the loader, so the readers keep mapping valid memory; a new loader reuses it
+        self.close()
+
+
+user_table = SharedUserTable(name=settings.user_table_name, capacity=settings.user_table_capacity, refresh_seconds=settings.user_table_refresh_seconds)
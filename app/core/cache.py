@@ -0,0 +1,103 @@
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from datetime import date, datetime
+from typing import Any
+
+from bson import ObjectId
+
+
+def normalize(value: Any) -> Hashable:
+    """
+    Converts a query (or any part of it) into a hashable value that does not depend on the order of the keys.
+
+    Types are kept next to the values, so `1`, `"1"` and `True` or a string and an ObjectId give different keys.
+    """
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((str(key), normalize(item)) for key, item in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(normalize(item) for item in value))
+    if isinstance(value, re.Pattern):
+        return ("regex", value.pattern, value.flags)
+    if isinstance(value, (ObjectId, datetime, date)):
+        return (type(value).__name__, str(value))
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return (type(value).__name__, value)
+    return (type(value).__name__, repr(value))
+
+
+class CollectionVersions:
+    """
+    Version counters of a collection, bumped on every write so that cached reads become unreachable instead of being deleted.
+
+    A write bumps the version of the collection and, when the owner of the written record is known, the version of this owner.
+    Reads scoped to an owner depend on the version of the owner only, so a user writing their tasks does not invalidate the
+    cached lists of the other users; reads across owners (e.g. an admin listing every task) depend on the version of the collection.
+    A write whose owner is unknown bumps the `epoch`, which every owner scoped read also depends on.
+    """
+
+    __slots__ = ("collection", "epoch", "owners")
+
+    def __init__(self) -> None:
+        self.collection = 0
+        self.epoch = 0
+        self.owners: dict[str, int] = {}
+
+    def bump(self, owner: str | None = None) -> None:
+        self.collection += 1
+        if owner is None:
+            self.epoch += 1
+        else:
+            self.owners[owner] = self.owners.get(owner, 0) + 1
+
+    def get(self, owner: str | None = None) -> tuple[int, ...]:
+        if owner is None:
+            return (self.collection,)
+        return (self.epoch, self.owners.get(owner, 0))
+
+
+class QueryCache:
+    """
+    A bounded, time limited LRU cache of query results.
+
+    Keys embed the versions of `CollectionVersions` at the time of the read, so a write makes the previous entries unreachable;
+    they are evicted by the LRU policy or the TTL. The TTL bounds the staleness of writes that do not go through the services
+    (e.g. other processes, scripts).
+
+    Args:
+        name (str): The name of the cache, reported in the cache metrics.
+        max_entries (int): The maximum number of entries.
+        ttl (float): The lifetime of an entry in seconds.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.versions = CollectionVersions()
+        self.entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, owner: str | None = None) -> None:
+        """Makes the cached reads of an owner (and the reads across owners) unreachable."""
+        self.versions.bump(owner=owner)
+
+    def clear(self) -> None:
+        self.entries.clear()
@@ -1,8 +1,50 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     ownership_field: str = "created_by"
+    # Sorting of list endpoints: the maximum number of sort keys, whether MongoDB may spill sorts to disk
+    # and whether sorts that no declared index supports are rejected with 400
+    sort_max_keys: int = Field(default=3)
+    sort_allow_disk_use: bool = Field(default=True)
+    sort_require_index: bool = Field(default=False)
+    # Results of `BaseServices.get_all` for the services that opt in (`cache_list_results`), see `core.cache.QueryCache`
+    list_cache_enabled: bool = Field(default=True)
+    list_cache_max_entries: int = Field(default=1024)
+    list_cache_ttl: float = Field(default=30.0)
+    # Totals of `get_all`: a short-lived cache of counts per filter (`cache_counts`) and per-owner counters (`count_by_owner`),
+    # reconciled with a count every `counters_reconcile_seconds`
+    count_cache_enabled: bool = Field(default=True)
+    count_cache_max_entries: int = Field(default=1024)
+    count_cache_ttl: float = Field(default=10.0)
+    counters_collection: str = Field(default="counters")
+    counters_reconcile_seconds: float = Field(default=300.0)
+    # Change feeds (`BaseServices.get_changes`) only return writes older than this delay, so that a write committed
+    # after a later one (concurrent requests, other workers) is not skipped by a client that already moved past it
+    sync_settle_seconds: float = Field(default=1.0)
+    sync_max_limit: int = Field(default=500)
+    # Change streams (`core.events`): events waiting for a slow client before it is evicted, and interval of the heartbeats
+    events_queue_size: int = Field(default=256)
+    events_heartbeat_seconds: float = Field(default=15.0)
+    # Cross-worker invalidation of the caches (`core.invalidation`), for deployments with several workers or containers
+    invalidation_bus_enabled: bool = Field(default=False)
+    invalidation_collection: str = Field(default="cache_invalidations")
+    invalidation_collection_size: int = Field(default=16 * 1024 * 1024)
+    invalidation_max_events: int = Field(default=100000)
+    invalidation_max_lag_seconds: float = Field(default=5.0)
+    invalidation_queue_size: int = Field(default=10000)
+    # Serialized bodies of the conditional GET routes, by entity tag (see `core.etag`)
+    etag_cache_max_entries: int = Field(default=2048)
+    # The maximum number of records a bulk operation (`BaseServices.update_many`, bulk routes) may create or select
+    bulk_max_items: int = Field(default=1000)
+    # Responses of the writes sent with an `Idempotency-Key` header (see `core.idempotency`)
+    idempotency_collection: str = Field(default="idempotency_keys")
+    idempotency_ttl_seconds: float = Field(default=24 * 60 * 60)
+    idempotency_lock_seconds: float = Field(default=30.0)
+    idempotency_wait_seconds: float = Field(default=10.0)
+    idempotency_cache_max_entries: int = Field(default=1024)
+    idempotency_key_max_length: int = Field(default=255)
 
 
 settings = Settings()
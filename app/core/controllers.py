@@ -41,12 +41,13 @@ class BaseControllers(Generic[TService]):
     async def get_all(
         self,
         query: dict = None,
+        filters: dict = None,
         search: str = None,
         search_in: list = None,
         page: int = 1,
         limit: int = 20,
         fields_limit: list | str = None,
-        sort_by: str = "created_at",
+        sort_by: str | list = "created_at",
         order_by: str = "desc",
         include_deleted: bool = False,
         commons: CommonsDependencies = None,
@@ -54,6 +55,7 @@ class BaseControllers(Generic[TService]):
         self.ensure_service_provided()
         results = await self.service.get_all(
             query=query,
+            filters=filters,
             search=search,
             search_in=search_in,
             page=page,
@@ -66,6 +68,11 @@ class BaseControllers(Generic[TService]):
         )
         return results
 
+    async def get_changes(self, since: str = None, limit: int = 100, fields_limit: list | str = None, commons: CommonsDependencies = None) -> dict:
+        self.ensure_service_provided()
+        results = await self.service.get_changes(since=since, limit=limit, fields_limit=fields_limit, commons=commons)
+        return results
+
     async def get_by_id(self, _id, fields_limit: list | str = None, ignore_error: bool = False, include_deleted: bool = False, commons: CommonsDependencies = None) -> dict:
         self.ensure_service_provided()
         result = await self.service.get_by_id(_id=_id, fields_limit=fields_limit, ignore_error=ignore_error, include_deleted=include_deleted, commons=commons)
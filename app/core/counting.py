@@ -0,0 +1,111 @@
+import time
+from collections.abc import Hashable
+
+from db.base import BaseCRUD
+from monitoring.metrics import record_cache_access
+
+from .cache import QueryCache, normalize
+
+
+class CountCache:
+    """
+    A short-lived cache of `count_documents` results by normalized filter.
+
+    Counting a large owner or a filtered query scans index entries on every list call, while the total of a page rarely needs
+    to be exact to the last write. A cached total is reported as estimated.
+
+    Like `QueryCache`, keys embed the versions of the owner at the time of the count, so a write through the services makes
+    the counts of its owner unreachable; the TTL only bounds the staleness of the writes made outside the services.
+
+    Args:
+        name (str): The name of the cache, reported in the cache metrics.
+        max_entries (int): The maximum number of filters kept.
+        ttl (float): The lifetime of a count in seconds.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float) -> None:
+        self.cache = QueryCache(name=name, max_entries=max_entries, ttl=ttl)
+
+    def get_key(self, query: dict, owner: str | None = None) -> Hashable:
+        """Returns the key of a count; read it before counting, so a write during the count makes the result unreachable."""
+        return (self.cache.versions.get(owner=owner), owner, normalize(query))
+
+    def get(self, key: Hashable) -> int | None:
+        total = self.cache.get(key)
+        record_cache_access(cache=self.cache.name, hit=total is not None)
+        return total
+
+    def set(self, key: Hashable, total: int) -> None:
+        self.cache.set(key, total)
+
+    def invalidate(self, owner: str | None = None) -> None:
+        self.cache.invalidate(owner=owner)
+
+
+class OwnerCounters:
+    """
+    Numbers of active (not soft-deleted) records per owner, stored in a counters collection.
+
+    The services increment a counter with an atomic `$inc` when a record is created and decrement it when a record is
+    soft or hard deleted, so the total of the default list of a user is a single `_id` lookup instead of a count.
+    Writes only update counters that exist, and every write also increments the `writes` of the counter.
+
+    A counter is reconciled with `count_documents` when it is created and every `reconcile_seconds`: the count is only
+    stored if no write updated the counter in between (a compare-and-set on `writes`), and the counter is reported as
+    inexact until a reconciliation succeeds. A record written between its insert and the `$inc` of its counter can still
+    be counted twice by a reconciliation; the next one corrects it.
+
+    Args:
+        crud (BaseCRUD): The CRUD of the counted collection; the counters live in the same storage.
+        collection (str): The name of the counters collection.
+        reconcile_seconds (float): The interval of the reconciliations of a counter.
+    """
+
+    def __init__(self, crud: BaseCRUD, collection: str, reconcile_seconds: float) -> None:
+        self.crud = crud
+        self.collection = collection
+        self.reconcile_seconds = reconcile_seconds
+
+    def get_collection(self):
+        # Resolved on every call so the counters follow `BaseCRUD.use_storage`
+        return self.crud.storage.get_collection(self.collection)
+
+    def get_counter_id(self, owner: str) -> str:
+        return f"{self.crud.collection_name}:{owner}"
+
+    async def get(self, owner: str, query: dict) -> tuple[int, bool]:
+        """
+        Returns the number of active records of an owner.
+
+        Args:
+            owner (str): The ID of the owner.
+            query (dict): The filter matching the active records of the owner, used to reconcile the counter.
+
+        Returns:
+            tuple[int, bool]: The number of records, and whether it is exact.
+        """
+        collection = self.get_collection()
+        counter_id = self.get_counter_id(owner=owner)
+        counter = await collection.find_one(filter={"_id": counter_id}, comment=self.crud.get_comment())
+        if counter is None:
+            # Created before counting, so the writes made during the count are seen by the reconciliation
+            update = {"$setOnInsert": {"count": 0, "writes": 0, "reconciled_at": None}}
+            await collection.update_one(filter={"_id": counter_id}, update=update, upsert=True, comment=self.crud.get_comment())
+            counter = await collection.find_one(filter={"_id": counter_id}, comment=self.crud.get_comment())
+        reconciled_at = counter.get("reconciled_at")
+        if reconciled_at is None or time.time() - reconciled_at > self.reconcile_seconds:
+            return await self.reconcile(counter=counter, query=query)
+        return max(counter["count"], 0), True
+
+    async def reconcile(self, counter: dict, query: dict) -> tuple[int, bool]:
+        total = await self.crud.count_documents(query=query)
+        update = {"$set": {"count": total, "reconciled_at": time.time()}}
+        modified = await self.get_collection().update_one(filter={"_id": counter["_id"], "writes": counter.get("writes")}, update=update, comment=self.crud.get_comment())
+        return total, modified > 0
+
+    async def reset(self, owner: str) -> None:
+        await self.get_collection().delete_one(filter={"_id": self.get_counter_id(owner=owner)}, comment=self.crud.get_comment())
+
+    async def increment(self, owner: str, amount: int) -> None:
+        update = {"$inc": {"count": amount, "writes": 1}}
+        await self.get_collection().update_one(filter={"_id": self.get_counter_id(owner=owner)}, update=update, comment=self.crud.get_comment())
@@ -0,0 +1,130 @@
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from monitoring.metrics import record_cache_access
+
+from .config import settings
+
+
+def make_etag(*parts: Any) -> str:
+    """Returns a strong entity tag (a quoted hash) of the given parts."""
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def get_version(item: Any) -> str | None:
+    """
+    Returns the version of a record: a hash of its content, so that any write changes it, whatever its path or timing.
+
+    Hashing the record dumped by pydantic-core is much cheaper than building the response, which is only done for a new version.
+
+    Returns:
+        str | None: The version, or None if the record is not a model.
+    """
+    dump = getattr(item, "model_dump_json", None)
+    if dump is None:
+        return None
+    return hashlib.blake2b(dump().encode(), digest_size=16).hexdigest()
+
+
+def document_etag(item: Any, representation: str = "") -> str | None:
+    """
+    Returns the entity tag of a record, derived from its version without building the response.
+
+    Args:
+        item (Any): The record.
+        representation (str, optional): What shapes the response besides the record (the route, the selected fields). Defaults to "".
+
+    Returns:
+        str | None: The entity tag, or None if the version of the record is unknown.
+    """
+    version = get_version(item)
+    return make_etag(representation, version) if version else None
+
+
+def page_etag(page: Any, representation: str = "") -> str | None:
+    """
+    Returns the entity tag of a page of `get_all`, derived from the totals and the versions of the records.
+
+    Returns:
+        str | None: The entity tag, or None if the version of a record is unknown.
+    """
+    versions = [get_version(item) for item in page.results]
+    if any(version is None for version in versions):
+        return None
+    return make_etag(representation, page.total_items, page.total_pages, page.total_items_exact, *versions)
+
+
+def matches_etag(request: Request, etag: str) -> bool:
+    """Checks the `If-None-Match` header of a request against an entity tag, with the weak comparison of RFC 9110."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+class ResponseCache:
+    """
+    Serialized JSON bodies by entity tag.
+
+    The entity tag identifies the content, so a body serialized for a tag can be returned to any client asking for the same tag.
+
+    Args:
+        max_entries (int): The maximum number of bodies kept.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.bodies: OrderedDict[str, bytes] = OrderedDict()
+
+    def get(self, etag: str) -> bytes | None:
+        body = self.bodies.get(etag)
+        record_cache_access(cache="response_bodies", hit=body is not None)
+        if body is not None:
+            self.bodies.move_to_end(etag)
+        return body
+
+    def set(self, etag: str, body: bytes) -> None:
+        self.bodies[etag] = body
+        self.bodies.move_to_end(etag)
+        while len(self.bodies) > self.max_entries:
+            self.bodies.popitem(last=False)
+
+    def respond(self, request: Request, etag: str | None, serialize: Callable[[], Any]) -> Response:
+        """
+        Returns a conditional response: 304 without body when the client already has the content, else the JSON body with its tag.
+
+        Args:
+            request (Request): The request, whose `If-None-Match` header is checked.
+            etag (str | None): The entity tag of the content. If None, it is computed from the serialized body, which still
+                               saves the transfer but not the serialization.
+            serialize (Callable[[], Any]): Builds the content of the response; only called when the body is not cached.
+
+        Returns:
+            Response: The 304 or 200 response.
+        """
+        if etag is not None:
+            if matches_etag(request=request, etag=etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            body = self.get(etag)
+            if body is not None:
+                return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+        # The same encoding as the responses FastAPI builds from the return value of a route
+        body = JSONResponse(content=jsonable_encoder(serialize())).body
+        if etag is None:
+            etag = make_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+            if matches_etag(request=request, etag=etag):
+                return Response(status_code=304, headers={"ETag": etag})
+        else:
+            self.set(etag, body)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+response_cache = ResponseCache(max_entries=settings.etag_cache_max_entries)
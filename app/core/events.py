@@ -0,0 +1,190 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from monitoring.metrics import EVENT_SUBSCRIBERS, EVENT_SUBSCRIBERS_EVICTED
+
+from .config import settings
+from .sync import decode_sync_token, encode_sync_token, get_change_action
+
+Position = tuple[datetime, ObjectId]
+
+
+def get_position(updated_at: datetime | None, _id: str | ObjectId) -> Position:
+    # Records written before `updated_at` was maintained sort first, as in the change feeds
+    return (updated_at or datetime.min, ObjectId(_id))
+
+
+class ChangeEvent:
+    """
+    A write of a record, published by the services.
+
+    The id of the event is the sync token of the record (see `core.sync`), so a client can resume from it on any worker,
+    even after a restart, through the change feed of the service.
+
+    Attributes:
+        collection (str): The collection of the record.
+        action (str): "created", "updated" or "deleted".
+        owner (str | None): The owner of the record.
+        record (Any): The record after the write.
+        event_id (str): The sync token of the record.
+        position (Position): The position of the record in the change feed.
+    """
+
+    __slots__ = ("collection", "action", "owner", "record", "event_id", "position")
+
+    def __init__(self, collection: str, action: str, owner: str | None, record: Any) -> None:
+        self.collection = collection
+        self.action = action
+        self.owner = owner
+        self.record = record
+        self.event_id = encode_sync_token(updated_at=record.updated_at, _id=record.id)
+        self.position = get_position(updated_at=record.updated_at, _id=record.id)
+
+
+class Subscriber:
+    """
+    A consumer of the events of a collection, with a bounded queue.
+
+    Args:
+        collection (str): The collection to follow.
+        owner (str | None): Only receive the events of the records of this owner; None receives every event (admins).
+        queue_size (int): The number of events that may wait for the consumer before it is evicted.
+    """
+
+    __slots__ = ("collection", "owner", "queue", "evicted")
+
+    def __init__(self, collection: str, owner: str | None, queue_size: int) -> None:
+        self.collection = collection
+        self.owner = owner
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=queue_size)
+        self.evicted = False
+
+
+class ChangeBus:
+    """
+    An in-process publish/subscribe bus of record writes.
+
+    Publishing never waits: the event is put in the queue of every matching subscriber, and a subscriber whose queue is full
+    is evicted instead of slowing the writer or growing without bound. An evicted stream ends, and the client reconnects
+    with the id of the last event it received, resuming from the change feed of the service.
+
+    The bus only sees the writes of this process; with several workers, a stream misses the writes of the other workers
+    until it resumes from the change feed.
+
+    Args:
+        queue_size (int): The size of the queue of each subscriber.
+        heartbeat_seconds (float): The interval of the heartbeats of idle streams.
+    """
+
+    def __init__(self, queue_size: int, heartbeat_seconds: float) -> None:
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.subscribers: dict[str, set[Subscriber]] = {}
+
+    def subscribe(self, collection: str, owner: str | None = None) -> Subscriber:
+        subscriber = Subscriber(collection=collection, owner=owner, queue_size=self.queue_size)
+        self.subscribers.setdefault(collection, set()).add(subscriber)
+        EVENT_SUBSCRIBERS.inc()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self.subscribers.get(subscriber.collection)
+        if subscribers and subscriber in subscribers:
+            subscribers.discard(subscriber)
+            EVENT_SUBSCRIBERS.dec()
+
+    def publish(self, collection: str, record: Any, owner: str | None = None, action: str = None) -> None:
+        """
+        Publishes the write of a record to the subscribers of its collection.
+
+        Args:
+            collection (str): The collection of the record.
+            record (Any): The record after the write, with `id`, `created_at`, `updated_at` and `deleted_at`.
+            owner (str | None, optional): The owner of the record. Defaults to None.
+            action (str, optional): The action; derived from the dates of the record by default.
+        """
+        subscribers = self.subscribers.get(collection)
+        if not subscribers:
+            return
+        event = ChangeEvent(collection=collection, action=action or get_change_action(record), owner=str(owner) if owner else None, record=record)
+        for subscriber in list(subscribers):
+            if subscriber.owner is not None and subscriber.owner != event.owner:
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Evicting a slow subscriber of {collection} after {self.queue_size} pending events")
+                subscriber.evicted = True
+                self.unsubscribe(subscriber)
+                EVENT_SUBSCRIBERS_EVICTED.labels(collection=collection).inc()
+
+    async def stream(
+        self,
+        collection: str,
+        serialize: Callable[[Any], Any],
+        owner: str | None = None,
+        last_event_id: str = None,
+        replay: Callable[[str], Awaitable[dict]] = None,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Subscribes to a collection and streams its events in the Server-Sent Events format.
+
+        The subscription starts before the replay of the missed changes, so that no write falls between the two.
+
+        Args:
+            collection (str): The collection to follow.
+            serialize (Callable[[Any], Any]): Builds the data of an event from a record.
+            owner (str | None, optional): Only stream the records of this owner. Defaults to None (every record).
+            last_event_id (str, optional): The id of the last event the client received. Defaults to None.
+            replay (Callable[[str], Awaitable[dict]], optional): Reads the changes after a sync token, a page of
+                `BaseServices.get_changes`. Required to resume from `last_event_id`. Defaults to None.
+            is_disconnected (Callable[[], Awaitable[bool]], optional): Tells whether the client left, checked on heartbeats. Defaults to None.
+
+        Yields:
+            str: The events, and a comment line as heartbeat when the stream is idle.
+        """
+        subscriber = self.subscribe(collection=collection, owner=owner)
+        try:
+            position = None
+            if last_event_id and replay:
+                updated_at, _id = decode_sync_token(token=last_event_id)
+                position = get_position(updated_at=updated_at, _id=_id)
+                token = last_event_id
+                while True:
+                    page = await replay(token)
+                    for record in page["results"]:
+                        event = ChangeEvent(collection=collection, action=get_change_action(record), owner=owner, record=record)
+                        position = event.position
+                        yield format_event(event=event, data=serialize(record))
+                    token = page["next_token"]
+                    if not page["has_more"]:
+                        break
+
+            while not subscriber.evicted:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    if is_disconnected and await is_disconnected():
+                        return
+                    yield ": heartbeat\n\n"
+                    continue
+                # The writes published during the replay may already have been replayed
+                if position and event.position <= position:
+                    continue
+                yield format_event(event=event, data=serialize(event.record))
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def format_event(event: ChangeEvent, data: Any) -> str:
+    payload = json.dumps({"action": event.action, "id": str(event.record.id), "data": jsonable_encoder(data) if event.action != "deleted" else None}, separators=(",", ":"))
+    return f"id: {event.event_id}\nevent: {event.action}\ndata: {payload}\n\n"
+
+
+change_bus = ChangeBus(queue_size=settings.events_queue_size, heartbeat_seconds=settings.events_heartbeat_seconds)
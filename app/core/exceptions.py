@@ -38,6 +38,62 @@ class CoreErrorCode:
             type="core/info/invalid-date", status=400, title="Invalid date format.", detail=f"The {date} is not a valid date. Please provide a valid date with YYYY-MM-DD format and try again."
         )
 
+    @staticmethod
+    def InvalidFilter(field: str, detail: str):
+        return CustomException(type="core/info/invalid-filter", status=400, title="Invalid filter.", detail=f"The filter {field} is not valid. {detail}")
+
+    @staticmethod
+    def InvalidSort(sort_by: str, detail: str):
+        return CustomException(type="core/info/invalid-sort", status=400, title="Invalid sort.", detail=f"The sort {sort_by} is not valid. {detail}")
+
+    @staticmethod
+    def InvalidSyncToken(token: str):
+        return CustomException(
+            type="core/info/invalid-sync-token", status=400, title="Invalid sync token.", detail=f"The sync token {token} is not valid. Please start a new sync without token and try again."
+        )
+
+    @staticmethod
+    def TooManyItems(max_items: int):
+        return CustomException(
+            type="core/info/too-many-items", status=400, title="Too many items.", detail=f"A bulk operation may apply to at most {max_items} items. Please split it and try again."
+        )
+
+    @staticmethod
+    def InvalidBulkSelection():
+        return CustomException(
+            type="core/info/invalid-bulk-selection",
+            status=400,
+            title="Invalid selection.",
+            detail="Select the items of a bulk operation with either a non-empty list of ids or filters, not both.",
+        )
+
+    @staticmethod
+    def InvalidIdempotencyKey(max_length: int):
+        return CustomException(
+            type="core/info/invalid-idempotency-key",
+            status=400,
+            title="Invalid idempotency key.",
+            detail=f"The Idempotency-Key header must not be empty nor longer than {max_length} characters.",
+        )
+
+    @staticmethod
+    def IdempotencyKeyReused():
+        return CustomException(
+            type="core/warning/idempotency-key-reused",
+            status=422,
+            title="Idempotency key reused.",
+            detail="The Idempotency-Key was already used for another request. Please use a new key for a new request.",
+        )
+
+    @staticmethod
+    def IdempotencyRequestInProgress():
+        return CustomException(
+            type="core/warning/idempotency-request-in-progress",
+            status=409,
+            title="Request in progress.",
+            detail="A request with the same Idempotency-Key is still in progress. Please retry later.",
+        )
+
     @staticmethod
     def Unauthorize():
         return CustomException(type="core/warning/unauthorize", status=401, title="Unauthorize.", detail="Could not authorize credentials")
@@ -0,0 +1,178 @@
+import re
+import types
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from types import NoneType
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
+
+from bson import ObjectId
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from .exceptions import CoreErrorCode
+
+# Query parameters handled by `PaginationParams`, never filters
+RESERVED_PARAMS = frozenset({"search", "page", "limit", "fields", "sort_by", "order_by"})
+OPERATOR_SEPARATOR = "__"
+
+EQUALITY_OPERATORS = frozenset({"eq", "ne", "in", "nin"})
+RANGE_OPERATORS = frozenset({"gt", "gte", "lt", "lte"})
+MONGO_OPERATORS = {"eq": "$eq", "ne": "$ne", "in": "$in", "nin": "$nin", "gt": "$gt", "gte": "$gte", "lt": "$lt", "lte": "$lte"}
+
+
+class FilterField:
+    """
+    A filterable field of a model.
+
+    Args:
+        name (str): The name of the field in the query string (the model field name, e.g. `id`).
+        path (str): The name of the field in the database (the alias if any, e.g. `_id`).
+        annotation (Any): The type used to coerce the values of the query string.
+        operators (frozenset): The operators allowed on the field.
+    """
+
+    __slots__ = ("name", "path", "adapter", "operators")
+
+    def __init__(self, name: str, path: str, annotation: Any, operators: frozenset) -> None:
+        self.name = name
+        self.path = path
+        self.adapter = TypeAdapter(annotation)
+        self.operators = operators
+
+    def coerce(self, value: str) -> Any:
+        try:
+            result = self.adapter.validate_python(value)
+        except ValidationError:
+            raise CoreErrorCode.InvalidFilter(field=self.name, detail=f"The value {value} is not valid for {self.name}.")
+        if self.path == "_id":
+            if not ObjectId.is_valid(result):
+                raise CoreErrorCode.InvalidObjectId(_id=result)
+            return ObjectId(result)
+        if isinstance(result, datetime) and result.tzinfo is not None:
+            # Datetimes are stored as naive UTC
+            return result.astimezone(timezone.utc).replace(tzinfo=None)
+        return result
+
+
+def get_field_operators(annotation: Any) -> tuple[Any, frozenset] | None:
+    """
+    Returns the type and the operators of a field annotation, or None if the type is not filterable (e.g. bytes, models).
+    """
+    nullable = False
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        nullable = len(args) < len(get_args(annotation))
+        if len(args) != 1:
+            return None
+        annotation = args[0]
+        origin = get_origin(annotation)
+
+    if origin is Literal or annotation is str:
+        operators = EQUALITY_OPERATORS | ({"startswith"} if annotation is str else set())
+    elif annotation is bool:
+        operators = frozenset({"eq", "ne"})
+    elif annotation in (int, float, datetime, date):
+        operators = EQUALITY_OPERATORS | RANGE_OPERATORS
+    else:
+        return None
+    if nullable:
+        operators = operators | {"isnull"}
+    return annotation, frozenset(operators)
+
+
+def get_filter_fields(model: type[BaseModel], exclude: list[str] = None) -> dict[str, FilterField]:
+    """
+    Derives the filterable fields of a model from its annotations.
+
+    Args:
+        model (type[BaseModel]): The model of the service.
+        exclude (list[str], optional): Fields that must never be filterable (e.g. password). Defaults to None.
+
+    Returns:
+        dict[str, FilterField]: The filterable fields by name.
+    """
+    fields = {}
+    for name, field_info in model.model_fields.items():
+        if exclude and name in exclude:
+            continue
+        result = get_field_operators(field_info.annotation)
+        if result is None:
+            continue
+        annotation, operators = result
+        # Keep the validators of the field (e.g. ObjectIdStr) for the coercion of the values
+        if field_info.metadata:
+            annotation = Annotated[(annotation, *field_info.metadata)]
+        fields[name] = FilterField(name=name, path=field_info.alias or name, annotation=annotation, operators=operators)
+    return fields
+
+
+class FilterCompiler:
+    """
+    Compiles query string filters such as `status__in=to_do,done` or `created_at__gte=2026-01-01` into MongoDB filters.
+
+    A parameter is `<field>` (equality) or `<field>__<operator>`. The operators depend on the type of the field:
+    `eq`, `ne`, `in`, `nin` for every type, `gt`, `gte`, `lt`, `lte` for numbers and dates, `startswith` for strings
+    (an anchored, index friendly regex) and `isnull` for optional fields. `in` and `nin` take comma-separated values.
+
+    Values are coerced to the type of the model field, so the filter matches the stored BSON type and can use indexes.
+    The resolution of the parameter names (the shape of the query) is cached; only the values are converted per request.
+
+    Args:
+        model (type[BaseModel]): The model of the service.
+        exclude (list[str], optional): Fields that must never be filterable. Defaults to None.
+        cache_size (int, optional): The number of query shapes kept. Defaults to 256.
+    """
+
+    def __init__(self, model: type[BaseModel], exclude: list[str] = None, cache_size: int = 256) -> None:
+        self.fields = get_filter_fields(model=model, exclude=exclude)
+        self.compile_shape = lru_cache(maxsize=cache_size)(self._compile_shape)
+
+    def _compile_shape(self, shape: tuple[str, ...]) -> tuple[tuple[str, FilterField, str], ...]:
+        plan = []
+        for key in shape:
+            name, _, operator = key.partition(OPERATOR_SEPARATOR)
+            operator = operator or "eq"
+            field = self.fields.get(name)
+            if field is None:
+                raise CoreErrorCode.InvalidFilter(field=key, detail=f"The field {name} is not filterable.")
+            if operator not in field.operators:
+                raise CoreErrorCode.InvalidFilter(field=key, detail=f"The operator {operator} is not supported by {name}. Supported: {', '.join(sorted(field.operators))}.")
+            plan.append((key, field, operator))
+        return tuple(plan)
+
+    def compile(self, params: dict[str, str]) -> dict:
+        """
+        Compiles query string parameters into a MongoDB filter.
+
+        Args:
+            params (dict[str, str]): The query string parameters, without the pagination parameters.
+
+        Returns:
+            dict: The MongoDB filter.
+
+        Raises:
+            CoreErrorCode.InvalidFilter: If a field is not filterable, an operator is not supported or a value is not valid.
+        """
+        params = {key: value for key, value in params.items() if key not in RESERVED_PARAMS}
+        if not params:
+            return {}
+        conditions: dict[str, dict] = {}
+        for key, field, operator in self.compile_shape(tuple(sorted(params))):
+            raw_value = params[key]
+            if operator in ("in", "nin"):
+                value = [field.coerce(item) for item in raw_value.split(",") if item != ""]
+            elif operator == "isnull":
+                if raw_value not in ("true", "false"):
+                    raise CoreErrorCode.InvalidFilter(field=key, detail="The value of isnull must be true or false.")
+                operator, value = ("eq", None) if raw_value == "true" else ("ne", None)
+            elif operator == "startswith":
+                operator, value = "regex", f"^{re.escape(field.coerce(raw_value))}"
+            else:
+                value = field.coerce(raw_value)
+            conditions.setdefault(field.path, {})[f"${operator}" if operator == "regex" else MONGO_OPERATORS[operator]] = value
+
+        query = {}
+        for path, operators in conditions.items():
+            # A single equality stays a plain value, the form every index and the ownership query use
+            query[path] = operators["$eq"] if list(operators) == ["$eq"] else operators
+        return query
@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from db.engine import app_engine
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from monitoring.metrics import record_cache_access
+from pymongo.errors import DuplicateKeyError
+
+from .cache import QueryCache
+from .config import settings
+from .exceptions import CoreErrorCode
+
+HEADER = "idempotency-key"
+
+
+def get_fingerprint(request: Request, body: bytes) -> str:
+    """Returns the hash of what a retry must repeat: the method, the path, the query string and the body."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (request.method.encode(), request.url.path.encode(), request.url.query.encode(), body):
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    The responses of the writes sent with an `Idempotency-Key` header, replayed to the retries of the same write.
+
+    A request claims its key by inserting a pending record in an indexed collection, whose records expire with a TTL index,
+    runs, then stores its serialized response in the record. A retry returns the stored response without running the write
+    again, from a local LRU cache in front of the collection when it reaches the same worker. Duplicates that arrive while the
+    first request runs wait for it: on the same worker through a future, across workers by polling the record. A pending record
+    whose worker died is taken over once its lock expires.
+
+    Keys are scoped by user, method and path, and a retry must send the same body: reusing a key for another request is a 422.
+    Only successful responses are stored; when the write fails, the claim is released and a retry runs the write again.
+
+    Args:
+        collection (str): The name of the collection of the records.
+        ttl (float): The lifetime of a stored response in seconds.
+        lock_seconds (float): The time after which the pending record of a request is considered abandoned.
+        wait_seconds (float): The maximum time a duplicate waits for the first request before a 409.
+        max_entries (int): The maximum number of responses kept in the local cache.
+        poll_interval (float, optional): The interval of the reads of a record pending on another worker. Defaults to 0.05.
+    """
+
+    def __init__(self, collection: str, ttl: float, lock_seconds: float, wait_seconds: float, max_entries: int, poll_interval: float = 0.05) -> None:
+        self.collection_name = collection
+        self.ttl = timedelta(seconds=ttl)
+        self.lock = timedelta(seconds=lock_seconds)
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        self.cache = QueryCache(name="idempotency", max_entries=max_entries, ttl=ttl)
+        self.pending: dict[str, asyncio.Future] = {}
+
+    def get_collection(self):
+        return app_engine.get_storage().get_collection(self.collection_name)
+
+    async def ensure_indexes(self) -> None:
+        # Records are removed by MongoDB once `expires_at` is past
+        await self.get_collection().create_index([("expires_at", 1)], expireAfterSeconds=0)
+
+    def get_key(self, request: Request, key: str) -> str:
+        principal = getattr(request.state, "principal", None)
+        user_id = principal.user_id if principal else ""
+        return hashlib.blake2b(f"{user_id}|{request.method}|{request.url.path}|{key}".encode(), digest_size=16).hexdigest()
+
+    def build_response(self, stored: dict, fingerprint: str, replayed: bool) -> Response:
+        if stored["fingerprint"] != fingerprint:
+            raise CoreErrorCode.IdempotencyKeyReused()
+        headers = {"Idempotent-Replayed": "true"} if replayed else None
+        return Response(content=stored["body"], status_code=stored["status_code"], media_type="application/json", headers=headers)
+
+    async def respond(self, request: Request, execute: Callable[[], Awaitable[Any]], status_code: int = 200) -> Any:
+        """
+        Runs a write at most once per idempotency key.
+
+        Args:
+            request (Request): The request, whose `Idempotency-Key` header is read.
+            execute (Callable[[], Awaitable[Any]]): Runs the write and returns the content of the response.
+            status_code (int, optional): The status code of the response. Defaults to 200.
+
+        Returns:
+            Any: The result of `execute` when the request has no key, else the JSON response, replayed for the retries.
+
+        Raises:
+            CoreErrorCode.InvalidIdempotencyKey: If the key is empty or too long.
+            CoreErrorCode.IdempotencyKeyReused: If the key was used for another request.
+            CoreErrorCode.IdempotencyRequestInProgress: If the first request with the key is still running after `wait_seconds`.
+        """
+        key = request.headers.get(HEADER)
+        if key is None:
+            return await execute()
+        if not key.strip() or len(key) > settings.idempotency_key_max_length:
+            raise CoreErrorCode.InvalidIdempotencyKey(max_length=settings.idempotency_key_max_length)
+        storage_key = self.get_key(request=request, key=key)
+        fingerprint = get_fingerprint(request=request, body=await request.body())
+
+        while True:
+            stored = self.cache.get(storage_key)
+            record_cache_access(cache=self.cache.name, hit=stored is not None)
+            if stored is not None:
+                return self.build_response(stored=stored, fingerprint=fingerprint, replayed=True)
+            future = self.pending.get(storage_key)
+            if future is None:
+                break
+            # The first request runs on this worker: its response is cached once it completes, or the claim is free again
+            await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[storage_key] = future
+        try:
+            stored = await self.claim(storage_key=storage_key, fingerprint=fingerprint)
+            replayed = stored is not None
+            if not replayed:
+                try:
+                    result = await execute()
+                except BaseException:
+                    await self.release(storage_key=storage_key)
+                    raise
+                # The same encoding as the responses FastAPI builds from the return value of a route
+                body = JSONResponse(content=jsonable_encoder(result)).body
+                stored = {"fingerprint": fingerprint, "status_code": status_code, "body": body}
+                await self.complete(storage_key=storage_key, stored=stored)
+            self.cache.set(storage_key, stored)
+            return self.build_response(stored=stored, fingerprint=fingerprint, replayed=replayed)
+        finally:
+            del self.pending[storage_key]
+            future.set_result(None)
+
+    async def claim(self, storage_key: str, fingerprint: str) -> dict | None:
+        """
+        Claims a key for this request.
+
+        Returns:
+            dict | None: None if this request must run, else the response stored by another request.
+        """
+        collection = self.get_collection()
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                await collection.insert_one(document={"_id": storage_key, "fingerprint": fingerprint, "state": "pending", "locked_until": now + self.lock, "expires_at": now + self.ttl})
+                return None
+            except DuplicateKeyError:
+                pass
+            document = await collection.find_one(filter={"_id": storage_key})
+            if document is None:
+                # Released or expired in between
+                continue
+            if document["state"] == "completed":
+                return {"fingerprint": document["fingerprint"], "status_code": document["status_code"], "body": document["body"]}
+            # Take over the claim of a worker that died while running the request
+            abandoned = {"_id": storage_key, "state": "pending", "locked_until": {"$lt": now}}
+            if await collection.update_one(filter=abandoned, update={"$set": {"fingerprint": fingerprint, "locked_until": now + self.lock}}):
+                return None
+            if time.monotonic() > deadline:
+                raise CoreErrorCode.IdempotencyRequestInProgress()
+            await asyncio.sleep(self.poll_interval)
+
+    async def complete(self, storage_key: str, stored: dict) -> None:
+        update = {"$set": {"state": "completed", **stored, "expires_at": datetime.now(timezone.utc) + self.ttl}, "$unset": {"locked_until": ""}}
+        await self.get_collection().update_one(filter={"_id": storage_key}, update=update)
+
+    async def release(self, storage_key: str) -> None:
+        await self.get_collection().delete_one(filter={"_id": storage_key, "state": "pending"})
+
+
+idempotency_store = IdempotencyStore(
+    collection=settings.idempotency_collection,
+    ttl=settings.idempotency_ttl_seconds,
+    lock_seconds=settings.idempotency_lock_seconds,
+    wait_seconds=settings.idempotency_wait_seconds,
+    max_entries=settings.idempotency_cache_max_entries,
+)
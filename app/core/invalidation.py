@@ -0,0 +1,175 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from bson import ObjectId
+from db.backends.base import CollectionBackend, StorageBackend
+from loguru import logger
+from monitoring.metrics import CACHE_INVALIDATION_BUS_HEALTHY, CACHE_INVALIDATION_EVENTS
+
+from .config import settings
+
+Handler = Callable[[str | None], None]
+
+
+def forget_before(received: dict[ObjectId, None], _id: ObjectId) -> None:
+    """Drops the received events older than `_id`, which a reopened tail does not return again, in their order of arrival."""
+    while received:
+        oldest = next(iter(received))
+        if oldest > _id:
+            return
+        del received[oldest]
+
+
+class InvalidationBus:
+    """
+    Propagates the writes of a worker to the caches of the other workers (processes or containers) sharing the database.
+
+    Every write through a caching service publishes a compact `(collection, _id, version, owner)` event to a capped collection,
+    and each worker follows the collection with a tailable await cursor, applying the events of the other workers to its local
+    caches within milliseconds. Capped collections and tailable cursors work on a standalone mongod: no replica set is needed.
+
+    Events are written in batches by a background task, so writes never wait for the bus. When the tail falls behind (the events
+    arrive later than `max_lag` or the capped collection overwrote its position) or fails, the bus invalidates every local cache
+    once and the caches fall back to their TTL until the tail catches up.
+
+    Args:
+        collection (str): The name of the capped collection.
+        size (int): The maximum size of the capped collection in bytes.
+        max_documents (int): The maximum number of events kept.
+        max_lag (float): The delay in seconds after which an event is considered late.
+        retry_interval (float): The delay before reopening a dead cursor.
+    """
+
+    def __init__(self, collection: str, size: int, max_documents: int, max_lag: float, retry_interval: float = 1.0) -> None:
+        self.collection_name = collection
+        self.size = size
+        self.max_documents = max_documents
+        self.max_lag = timedelta(seconds=max_lag)
+        self.retry_interval = retry_interval
+        self.handlers: dict[str, list[Handler]] = {}
+        self.collection: CollectionBackend | None = None
+        self.worker_id: str | None = None
+        self.queue: asyncio.Queue[dict] | None = None
+        self.tasks: list[asyncio.Task] = []
+        self.healthy = False
+
+    def register(self, collection: str, handler: Handler) -> None:
+        """
+        Registers the invalidation of a local cache.
+
+        Args:
+            collection (str): The collection whose writes invalidate the cache.
+            handler (Handler): Called with the owner of the written record, or None to invalidate every owner.
+        """
+        self.handlers.setdefault(collection, []).append(handler)
+
+    def is_running(self) -> bool:
+        return bool(self.tasks)
+
+    def publish(self, collection: str, _id: str | None = None, owner: str | None = None, version: int = 0) -> None:
+        """Queues the event of a write; a no-op when the bus is not started."""
+        if self.queue is None:
+            return
+        event = {"_id": ObjectId(), "c": collection, "i": str(_id) if _id else None, "v": version, "o": str(owner) if owner else None, "w": self.worker_id}
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The other workers miss this write until their TTL expires
+            CACHE_INVALIDATION_EVENTS.labels(result="dropped").inc()
+
+    def apply(self, event: dict) -> None:
+        for handler in self.handlers.get(event["c"], []):
+            handler(event.get("o"))
+
+    def degrade(self, reason: str) -> None:
+        """Invalidates every local cache, since events may have been missed; only once, when the bus stops being healthy."""
+        if not self.healthy:
+            return
+        logger.warning(f"Cache invalidation bus degraded to TTL-only caching: {reason}")
+        self.healthy = False
+        CACHE_INVALIDATION_BUS_HEALTHY.set(0)
+        for handlers in self.handlers.values():
+            for handler in handlers:
+                handler(None)
+
+    def recover(self) -> None:
+        if not self.healthy:
+            logger.info("Cache invalidation bus is following the writes of the other workers")
+        self.healthy = True
+        CACHE_INVALIDATION_BUS_HEALTHY.set(1)
+
+    async def start(self, storage: StorageBackend) -> None:
+        if self.is_running():
+            return
+        self.collection = await storage.create_capped_collection(name=self.collection_name, size=self.size, max_documents=self.max_documents)
+        # Generated after the workers are forked, so each worker recognizes its own events
+        self.worker_id = str(ObjectId())
+        self.queue = asyncio.Queue(maxsize=settings.invalidation_queue_size)
+        self.tasks = [asyncio.create_task(self.publish_events()), asyncio.create_task(self.follow_events())]
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.queue = None
+        self.healthy = False
+
+    async def publish_events(self) -> None:
+        while True:
+            events = [await self.queue.get()]
+            while not self.queue.empty():
+                events.append(self.queue.get_nowait())
+            try:
+                await self.collection.insert_many(documents=events, ordered=False)
+                CACHE_INVALIDATION_EVENTS.labels(result="published").inc(len(events))
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger.warning(f"Could not publish {len(events)} cache invalidation events: {error}")
+                CACHE_INVALIDATION_EVENTS.labels(result="dropped").inc(len(events))
+
+    async def follow_events(self) -> None:
+        # The newest event seen; the tail starts slightly in the past, replaying a few events only invalidates a little more
+        newest = ObjectId.from_datetime(datetime.now(timezone.utc))
+        last_id = None
+        received: dict[ObjectId, None] = {}
+        self.recover()
+        while True:
+            try:
+                if last_id is not None and await self.collection.find_one(filter={"_id": last_id}) is None:
+                    self.degrade("the capped collection overwrote the position of the tail")
+                # Workers batch their events and have their own clocks, so an event can be inserted after events with later ids:
+                # the tail reopens `max_lag` before the newest event and skips the events it already received
+                window_start = ObjectId.from_datetime(newest.generation_time - self.max_lag)
+                forget_before(received=received, _id=window_start)
+                async for event in self.collection.tail(filter={"_id": {"$gt": window_start}}):
+                    last_id = event["_id"]
+                    if last_id in received:
+                        continue
+                    received[last_id] = None
+                    if last_id > newest:
+                        newest = last_id
+                        forget_before(received=received, _id=ObjectId.from_datetime(newest.generation_time - self.max_lag))
+                    if datetime.now(timezone.utc) - last_id.generation_time > self.max_lag:
+                        self.degrade(f"the events are more than {self.max_lag.total_seconds()}s late")
+                    else:
+                        self.recover()
+                    if event.get("w") != self.worker_id:
+                        CACHE_INVALIDATION_EVENTS.labels(result="applied").inc()
+                        self.apply(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                self.degrade(str(error))
+            # The cursor died (e.g. the collection was empty) or failed
+            await asyncio.sleep(self.retry_interval)
+
+
+invalidation_bus = InvalidationBus(
+    collection=settings.invalidation_collection,
+    size=settings.invalidation_collection_size,
+    max_documents=settings.invalidation_max_events,
+    max_lag=settings.invalidation_max_lag_seconds,
+)
@@ -0,0 +1,47 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from monitoring.timing import server_timing_context
+
+
+class TimedRoute(APIRoute):
+    """
+    An `APIRoute` that reports the time spent in the endpoint (`router` span) and in the response
+    serialization (`serialize` span) to the Server-Timing collector of the request.
+
+    Declare it on the router: `InferringRouter(prefix="/v1", route_class=TimedRoute)`.
+    When Server-Timing is disabled the only cost is one context variable lookup per request.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        endpoint = self.dependant.call
+        if asyncio.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def timed_endpoint(*args, **kwargs):
+                timing = server_timing_context.get()
+                if timing is None:
+                    return await endpoint(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await endpoint(*args, **kwargs)
+                finally:
+                    timing.endpoint_end = time.perf_counter()
+                    timing.add("router", timing.endpoint_end - start)
+
+            self.dependant.call = timed_endpoint
+
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            response = await handler(request)
+            timing = server_timing_context.get()
+            if timing is not None and timing.endpoint_end is not None:
+                timing.add("serialize", time.perf_counter() - timing.endpoint_end)
+            return response
+
+        return timed_handler
@@ -6,37 +6,41 @@ from pydantic.functional_validators import AfterValidator
 from utils import validator
 from utils.value import OrderBy, UserRoles
 
+from .config import settings
 from .exceptions import CoreErrorCode
+from .filters import RESERVED_PARAMS
+from .sorting import parse_sort
 
 
 class CommonsDependencies:
     """
     Handles common dependencies extracted from the request.
 
-    This class is used to extract and store common dependencies such as the current user, user type,
-    and whether the request is from a public API, from the FastAPI request object.
+    This class is used to expose common dependencies such as the current user, user type,
+    and whether the request is from a public API. The values are read from the principal that the
+    `AccessControl` route dependency has already resolved and stored on `request.state`, so the bearer token is never parsed twice.
 
     If it is a public api, then user_id, user_type will have the value None and is_public_api will be True and vice versa.
 
     Args:
-        request (Request): The FastAPI request object containing the payload.
+        request (Request): The FastAPI request object.
 
     Attributes:
-        current_user (str, None): The ID of the current user extracted from the request payload.
-        user_type (str, None): The type of the current user (e.g., admin, customer) extracted from the request payload.
-        is_public_api (bool, None): Indicates whether the request is from a public API, extracted from the request payload.
+        current_user (str, None): The ID of the current user.
+        user_type (str, None): The type of the current user (e.g., admin, customer).
+        is_public_api (bool, None): Indicates whether the request is from a public API.
+        api_path (str): The path of the request.
     """
 
+    __slots__ = ("current_user", "user_type", "is_public_api", "api_path")
+
     def __init__(self, request: Request) -> None:
-        self.current_user = None
-        self.user_type = None
-        self.is_public_api = None
-        self.api_path = request.url.path
-        self.headers = dict(request.headers)
-        if hasattr(request.state, "payload"):
-            self.current_user = request.state.payload.get("user_id")
-            self.user_type = request.state.payload.get("user_type")
-            self.is_public_api = request.state.payload.get("is_public_api")
+        state = request.state
+        principal = getattr(state, "principal", None)
+        self.current_user = principal.user_id if principal else None
+        self.user_type = principal.user_type if principal else None
+        self.is_public_api = getattr(state, "is_public_api", None)
+        self.api_path = request.scope["path"]
 
     def is_admin(self) -> bool:
         """
@@ -61,17 +65,19 @@ class PaginationParams:
         page (int, optional): The page number for pagination, must be greater than 0. Defaults to 1.
         limit (int, optional): The number of records per page, must be greater than 0. Defaults to 20.
         fields (str, optional): A comma-separated list of fields to include in the response. Defaults to None.
-        sort_by (str, optional): The field by which to sort the results. Defaults to "created_at".
-        order_by (OrderBy, optional): The order in which to sort the results, either ascending or descending. Defaults to descending.
+        sort_by (str, optional): The comma-separated sort keys, e.g. `status,-created_at` (see `parse_sort`). Defaults to "created_at".
+        order_by (OrderBy, optional): The direction of the sort keys without `-`/`+` prefix. Defaults to descending.
 
     Attributes:
         query (dict): A dictionary of query parameters extracted from the request.
+        filters (dict): The query parameters other than the pagination ones, e.g. `status__in=to_do,done` (see `FilterCompiler`).
         search (str): The search string.
         page (int): The page number for pagination.
         limit (int): The number of records per page.
         fields (str): The fields to include in the response.
         sort_by (str): The field by which to sort the results.
         order_by (OrderBy): The order in which to sort the results.
+        sort (list[tuple[str, int]]): The parsed sort keys, validated against the sortable fields of the service later.
     """
 
     def __init__(
@@ -81,16 +87,18 @@ class PaginationParams:
         page: int = Query(default=1, gt=0),
         limit: int = Query(default=20, gt=0),
         fields: str = None,
-        sort_by: str = Query("created_at", description="Anything you want"),
+        sort_by: str = Query("created_at", description="Comma-separated fields, prefix with - for descending, e.g. status,-created_at"),
         order_by: OrderBy = Query(OrderBy.DECREASE, description="desc: Descending | asc: Ascending"),
     ):
         self.query = dict(request.query_params)
+        self.filters = {key: value for key, value in self.query.items() if key not in RESERVED_PARAMS}
         self.search = search
         self.page = page
         self.limit = limit
         self.fields = fields
         self.sort_by = sort_by
         self.order_by = order_by.value
+        self.sort = parse_sort(sort_by=sort_by, order_by=self.order_by, max_keys=settings.sort_max_keys)
 
 
 def check_object_id(value: str) -> str:
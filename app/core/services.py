@@ -1,20 +1,40 @@
-from datetime import datetime
-from typing import Generic, List, Type, TypeVar, Union
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Generic, List, Optional, Type, TypeVar, Union
 
+from bson import ObjectId
 from config import settings as root_settings
 from db.base import BaseCRUD
-from pydantic import BaseModel
+from monitoring.metrics import record_cache_access
+from monitoring.timing import timed
+from pydantic import BaseModel, Field, create_model
 from pydantic._internal._model_construction import ModelMetaclass
 from utils import value
 
 from . import internal_models
+from .cache import QueryCache, normalize
 from .config import settings
+from .counting import CountCache, OwnerCounters
+from .events import change_bus
 from .exceptions import CoreErrorCode
+from .filters import FilterCompiler
+from .invalidation import invalidation_bus
 from .schemas import CommonsDependencies
+from .sorting import SortRegistry, parse_sort
+from .sync import SYNC_SORT, build_since_query, encode_sync_token
 
 TModel = TypeVar("TModel", bound=BaseModel)
 
 
+# The field set by every `BaseServices.update_many` call to a marker of the call
+BULK_WRITE_FIELD = "bulk_write_id"
+
+
+def truncate_to_milliseconds(value: datetime) -> datetime:
+    """Truncates a date to the precision MongoDB stores, so the versions returned to clients are the stored ones."""
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
 # This class is used to define the structure of the response when retrieving all records. Why I put class here?
 # Because it is a generic class that can be used to define the structure of the response for any model.
 class GetAllModel(BaseModel):
@@ -22,6 +42,11 @@ class GetAllModel(BaseModel):
     total_pages: int
     records_per_page: int
     results: List[BaseModel]
+    total_items_exact: bool = True
+
+    def dump_projection(self) -> dict:
+        """Dumps a page read with `fields_limit`: each record only has the selected fields (and its id)."""
+        return {**self.model_dump(exclude={"results"}), "results": [item.model_dump(exclude_unset=True) for item in self.results]}
 
 
 class BaseServices(Generic[TModel]):
@@ -35,14 +60,41 @@ class BaseServices(Generic[TModel]):
     Args:
         service_name (str): The name of the service.
         crud (BaseCRUD, optional): An instance of a CRUD class derived from `BaseCRUD`. Defaults to None.
+        model (Type[TModel], optional): The model of the records. Defaults to None.
+        non_filterable_fields (list[str], optional): Model fields that clients can never filter on (e.g. password). Defaults to None.
+        sortable_fields (list[str], optional): Fields that clients can sort on. Defaults to the filterable fields of the model.
+        indexes (list[list[tuple[str, int]]], optional): The indexes of the collection, created by `ensure_indexes` and used to check
+            that a sort does not need an in-memory sort. Defaults to None.
+        cache_list_results (bool, optional): Cache the results of `get_all` until a write through the service or the TTL. Defaults to False.
+        cache_counts (bool, optional): Reuse the totals of `get_all` for a few seconds; such totals are flagged as estimated. Defaults to False.
+        count_by_owner (bool, optional): Maintain counters of the active records of each owner, used for the total of
+            the unfiltered list of an owner and periodically reconciled with a count. Defaults to False.
+        publish_changes (bool, optional): Publish the writes of the service to `change_bus`, for the change streams. Defaults to False.
 
     Attributes:
         crud (BaseCRUD): The CRUD instance used for database operations.
         service_name (str): The name of the service.
+        filter_compiler (FilterCompiler | None): Compiles the query string filters of `get_all`, derived from the model.
+        sort_registry (SortRegistry): Validates the sorts of `get_all`.
+        list_cache (QueryCache | None): The cache of `get_all`, None unless the service opts in.
+        count_cache (CountCache | None): The cache of the totals of `get_all`, None unless the service opts in.
+        owner_counters (OwnerCounters | None): The per-owner counters, None unless the service opts in.
 
     """
 
-    def __init__(self, service_name: str, crud: BaseCRUD = None, model: Type[TModel] = None) -> None:
+    def __init__(
+        self,
+        service_name: str,
+        crud: BaseCRUD = None,
+        model: Type[TModel] = None,
+        non_filterable_fields: list[str] = None,
+        sortable_fields: list[str] = None,
+        indexes: list[list[tuple[str, int]]] = None,
+        cache_list_results: bool = False,
+        cache_counts: bool = False,
+        count_by_owner: bool = False,
+        publish_changes: bool = False,
+    ) -> None:
         self.service_name = service_name
         self.ownership_field = settings.ownership_field
         if crud and root_settings.is_production() and isinstance(crud, BaseCRUD) is False:
@@ -51,6 +103,29 @@ class BaseServices(Generic[TModel]):
             raise ValueError(f"The 'model' attribute must be a Pydantic Model for {self.service_name} service.")
         self.crud = crud
         self.model = model
+        self.filter_compiler = FilterCompiler(model=model, exclude=non_filterable_fields) if model else None
+        self.non_filterable_fields = non_filterable_fields or []
+        self.projection_model = None
+        if sortable_fields is None:
+            sortable_fields = list(self.filter_compiler.fields) if self.filter_compiler else []
+        self.indexes = indexes or []
+        self.sort_registry = SortRegistry(service_name=service_name, sortable_fields=sortable_fields, indexes=self.indexes, require_index=settings.sort_require_index)
+        self.list_cache = None
+        if cache_list_results and settings.list_cache_enabled:
+            self.list_cache = QueryCache(name=f"{service_name}_list", max_entries=settings.list_cache_max_entries, ttl=settings.list_cache_ttl)
+            if crud is not None:
+                invalidation_bus.register(collection=crud.collection_name, handler=self.list_cache.invalidate)
+        self.count_cache = None
+        if cache_counts and settings.count_cache_enabled:
+            self.count_cache = CountCache(name=f"{service_name}_count", max_entries=settings.count_cache_max_entries, ttl=settings.count_cache_ttl)
+            if crud is not None:
+                invalidation_bus.register(collection=crud.collection_name, handler=self.count_cache.invalidate)
+        self.publish_changes = publish_changes
+        self.owner_counters = (
+            OwnerCounters(crud=crud, collection=settings.counters_collection, reconcile_seconds=settings.counters_reconcile_seconds)
+            if count_by_owner and crud and self.ownership_field
+            else None
+        )
 
     def ensure_crud_provided(self) -> None:
         if self.crud is None:
@@ -115,12 +190,99 @@ class BaseServices(Generic[TModel]):
             query[self.ownership_field] = current_user_id
         return query
 
-    async def _validate_model(self, data: list | dict) -> list[TModel] | TModel:
+    async def ensure_indexes(self) -> None:
+        """Creates the declared indexes of the collection (a no-op for the indexes that already exist)."""
+        self.ensure_crud_provided()
+        for keys in self.indexes:
+            await self.crud.create_index(keys=keys)
+
+    def invalidate_cache(self, owner: str | None = None, _id: str = None) -> None:
+        """
+        Invalidates the cached reads affected by a write, in this worker and, through `invalidation_bus`, in the others.
+
+        Args:
+            owner (str | None, optional): The owner of the written record. Defaults to None, which invalidates the reads of every owner.
+            _id (str, optional): The ID of the written record. Defaults to None.
+        """
+        caches = [cache for cache in (self.list_cache, self.count_cache) if cache is not None]
+        for cache in caches:
+            cache.invalidate(owner=str(owner) if owner else None)
+        if caches:
+            invalidation_bus.publish(collection=self.crud.collection_name, _id=_id, owner=owner, version=self.get_cache_version())
+
+    def get_cache_version(self) -> int:
+        cache = self.list_cache or self.count_cache.cache
+        return cache.versions.collection
+
+    def publish_change(self, record: TModel, action: str = None) -> None:
+        if self.publish_changes and record is not None and self.crud is not None:
+            change_bus.publish(collection=self.crud.collection_name, record=record, owner=self.get_owner(record), action=action)
+
+    async def update_owner_count(self, owner: str | None, amount: int) -> None:
+        if self.owner_counters is not None and owner:
+            await self.owner_counters.increment(owner=str(owner), amount=amount)
+
+    def get_owner(self, data: BaseModel | dict | None) -> str | None:
+        if data is None or not self.ownership_field:
+            return None
+        if isinstance(data, dict):
+            return data.get(self.ownership_field)
+        return getattr(data, self.ownership_field, None)
+
+    def has_field(self, field: str) -> bool:
+        return self.model is not None and field in self.model.model_fields
+
+    def set_updated_at(self, data: dict) -> dict:
+        """
+        Stamps a document written by the service with its version, when the model has an `updated_at` field.
+
+        Dates are truncated to the millisecond, as MongoDB stores them, so the records built from the document match the stored ones.
+        """
+        for field in ("created_at", "updated_at"):
+            if isinstance(data.get(field), datetime):
+                data[field] = truncate_to_milliseconds(data[field])
+        if self.has_field("updated_at") and not data.get("updated_at"):
+            # A new record gets its creation time, so a change feed can tell creations from updates
+            data["updated_at"] = data.get("created_at") or truncate_to_milliseconds(self.get_current_datetime())
+        return data
+
+    def build_filters(self, filters: dict) -> dict:
+        """
+        Compiles query string filters into a MongoDB filter.
+
+        Args:
+            filters (dict): The query string filters, e.g. `{"status__in": "to_do,done", "created_at__gte": "2026-01-01"}`.
+
+        Returns:
+            dict: The MongoDB filter, with values coerced to the types of the model.
+
+        Raises:
+            CoreErrorCode.InvalidFilter: If a field is not filterable, an operator is not supported or a value is not valid.
+        """
+        if self.filter_compiler is None:
+            raise CoreErrorCode.InvalidFilter(field=", ".join(filters), detail=f"The {self.service_name} service does not support filters.")
+        return self.filter_compiler.compile(params=filters)
+
+    def get_projection_model(self) -> Type[BaseModel]:
+        """
+        Returns a variant of the model whose fields are all optional, to validate the records read with `fields_limit`.
+
+        The non-filterable fields (e.g. password) are left out, so a projection can never return them.
+        """
+        if self.projection_model is None:
+            fields = {name: (Optional[field.annotation], Field(default=None, alias=field.alias)) for name, field in self.model.model_fields.items() if name not in self.non_filterable_fields}
+            self.projection_model = create_model(f"{self.model.__name__}Projection", **fields)
+        return self.projection_model
+
+    @timed("validate")
+    async def _validate_model(self, data: list | dict, projection: bool = False) -> list[TModel] | TModel:
         """
         Validates the provided data against the model.
 
         Args:
             data (list | dict): The data to validate.
+            projection (bool, optional): Whether the data was read with `fields_limit`, which only validates the selected fields
+                                         (see `get_projection_model`). Defaults to False.
 
         Returns:
             list | TModel: The validated data.
@@ -129,9 +291,10 @@ class BaseServices(Generic[TModel]):
             ValueError: If the data is not valid according to the model.
 
         """
+        model = self.get_projection_model() if projection else self.model
         if isinstance(data, list):
-            return [self.model.model_validate(item) for item in data]
-        return self.model.model_validate(data)
+            return [model.model_validate(item) for item in data]
+        return model.model_validate(data)
 
     async def get_by_id(self, _id: str, fields_limit: list | str = None, ignore_error: bool = False, include_deleted: bool = False, commons: CommonsDependencies = None) -> TModel:
         """
@@ -164,17 +327,18 @@ class BaseServices(Generic[TModel]):
         item = await self.crud.get_by_id(_id=_id, fields_limit=fields_limit, query=query)
         if not item and not ignore_error:
             raise CoreErrorCode.NotFound(service_name=self.service_name, item=_id)
-        return self.model.model_validate(item)
+        return await self._validate_model(data=item, projection=bool(fields_limit))
 
     async def get_all(
         self,
         query: dict = None,
+        filters: dict = None,
         search: str = None,
         search_in: list = None,
         page: int = 1,
         limit: int = 20,
         fields_limit: list | str = None,
-        sort_by: str = "created_at",
+        sort_by: str | list = "created_at",
         order_by: str = "desc",
         include_deleted: bool = False,
         commons: CommonsDependencies = None,
@@ -183,24 +347,30 @@ class BaseServices(Generic[TModel]):
         Retrieves all records based on the provided query parameters.
 
         Args:
-            query (dict, optional): A dictionary containing filter conditions. Defaults to None.
+            query (dict, optional): A MongoDB filter built by the application. Defaults to None.
+            filters (dict, optional): Filters from the query string (e.g. `{"status__in": "to_do,done"}`), compiled by `filter_compiler`. Defaults to None.
             search (str, optional): A search string to apply across specified fields. Defaults to None.
             search_in (list, optional): A list of fields to search within. Defaults to None.
             page (int, optional): The page number for pagination. Defaults to 1.
             limit (int, optional): The number of records to retrieve per page. Defaults to 20.
             fields_limit (list | str, optional): Fields to include in the response. Defaults to None.
-            sort_by (str, optional): The field to sort the results by. Defaults to "created_at".
-            order_by (str, optional): The sort order, either "asc" or "desc". Defaults to "desc".
+            sort_by (str | list, optional): The sort keys, e.g. "status,-created_at", or an already parsed list of (field, direction). Defaults to "created_at".
+            order_by (str, optional): The direction of the keys without prefix, either "asc" or "desc". Defaults to "desc".
             include_deleted (bool, optional): Whether to include soft-deleted records. Defaults to False.
             commons (CommonsDependencies, optional): Common dependencies for the request. Defaults to None.
 
         Returns:
             GetAllModel: A model containing the total number of items, total pages, and the results.
 
+        Raises:
+            CoreErrorCode.InvalidSort: If a sort field is not sortable, or no index supports the sort while `sort_require_index` is set.
+
         """
         self.ensure_crud_provided()
         if not query:
             query = {}
+        if filters:
+            query.update(self.build_filters(filters=filters))
         if not include_deleted:
             query.update({"deleted_at": None})
 
@@ -209,9 +379,108 @@ class BaseServices(Generic[TModel]):
         if ownership_query:
             query.update(ownership_query)
 
-        results = await self.crud.get_all(query=query, search=search, search_in=search_in, page=page, limit=limit, fields_limit=fields_limit, sort_by=sort_by, order_by=order_by)
-        results["results"] = await self._validate_model(data=results["results"])
-        return GetAllModel(total_items=results["total_items"], total_pages=results["total_pages"], records_per_page=results["records_per_page"], results=results["results"])
+        sort = parse_sort(sort_by=sort_by, order_by=order_by) if isinstance(sort_by, str) else sort_by
+        sort = self.sort_registry.resolve(sort=sort, query=query)
+
+        cache_key = None
+        if self.list_cache is not None:
+            # The versions are read before the query, so a write during the query makes its result unreachable
+            owner = ownership_query.get(self.ownership_field) if ownership_query else None
+            fields = fields_limit.split(",") if isinstance(fields_limit, str) else fields_limit
+            shape = (query, search, search_in, page, limit, fields, sort)
+            cache_key = (self.list_cache.versions.get(owner=owner), owner, normalize(shape))
+            cached = self.list_cache.get(cache_key)
+            record_cache_access(cache=self.list_cache.name, hit=cached is not None)
+            if cached is not None:
+                return cached
+
+        total_items_exact = True
+
+        async def count(final_query: dict) -> int:
+            nonlocal total_items_exact
+            owner = ownership_query.get(self.ownership_field) if ownership_query else None
+            if self.owner_counters is not None and owner and query == {"deleted_at": None, self.ownership_field: owner} and not search:
+                total, exact = await self.owner_counters.get(owner=str(owner), query=final_query)
+                total_items_exact = total_items_exact and exact
+                return total
+            if self.count_cache is None:
+                return await self.crud.count_documents(query=final_query)
+            count_key = self.count_cache.get_key(query=final_query, owner=owner)
+            total = self.count_cache.get(count_key)
+            if total is not None:
+                total_items_exact = False
+                return total
+            total = await self.crud.count_documents(query=final_query)
+            self.count_cache.set(count_key, total=total)
+            return total
+
+        # The query is built from typed values only, so it must not go through the string sanitizing of BaseCRUD
+        results = await self.crud.get_all(
+            query=query,
+            search=search,
+            search_in=search_in,
+            page=page,
+            limit=limit,
+            fields_limit=fields_limit,
+            sort_by=sort,
+            sanitize=False,
+            allow_disk_use=settings.sort_allow_disk_use,
+            count=count,
+        )
+        results["results"] = await self._validate_model(data=results["results"], projection=bool(fields_limit))
+        response = GetAllModel(
+            total_items=results["total_items"],
+            total_pages=results["total_pages"],
+            records_per_page=results["records_per_page"],
+            results=results["results"],
+            total_items_exact=total_items_exact,
+        )
+        if cache_key is not None:
+            self.list_cache.set(cache_key, response)
+        return response
+
+    async def get_changes(self, since: str = None, limit: int = 100, fields_limit: list | str = None, settle_seconds: float = None, commons: CommonsDependencies = None) -> dict:
+        """
+        Retrieves the records created, updated or soft-deleted after a sync token, in the order of their writes.
+
+        The records are read with a range scan on (<ownership field>, updated_at, _id), so the cost is proportional to the
+        number of changes. Without token, the active records are returned from the start (an initial sync).
+
+        Args:
+            since (str, optional): The `next_token` of the previous call. Defaults to None.
+            limit (int, optional): The maximum number of records. Defaults to 100.
+            fields_limit (list | str, optional): Fields to include in the records. Defaults to None.
+            settle_seconds (float, optional): Hold back the writes more recent than this delay. Defaults to `sync_settle_seconds`.
+            commons (CommonsDependencies, optional): Common dependencies for the request. Defaults to None.
+
+        Returns:
+            dict: The records (`results`, soft-deleted ones included), the token to resume from (`next_token`)
+                  and whether more changes are already available (`has_more`).
+
+        Raises:
+            CoreErrorCode.InvalidSyncToken: If the token is malformed.
+        """
+        self.ensure_crud_provided()
+        conditions = []
+        ownership_query = self.build_ownership_query(commons=commons)
+        if ownership_query:
+            conditions.append(ownership_query)
+        if since:
+            conditions.append(build_since_query(token=since))
+        else:
+            conditions.append({"deleted_at": None})
+        if settle_seconds is None:
+            settle_seconds = settings.sync_settle_seconds
+        if settle_seconds:
+            settled_at = self.get_current_datetime() - timedelta(seconds=settle_seconds)
+            conditions.append({"$or": [{"updated_at": {"$lte": settled_at}}, {"updated_at": None}]})
+
+        limit = min(limit, settings.sync_max_limit)
+        items = await self.crud.get_range(query={"$and": conditions}, sort_by=SYNC_SORT, limit=limit + 1, fields_limit=fields_limit)
+        has_more = len(items) > limit
+        items = items[:limit]
+        next_token = encode_sync_token(updated_at=items[-1].get("updated_at"), _id=items[-1]["_id"]) if items else since
+        return {"results": await self._validate_model(data=items, projection=bool(fields_limit)), "next_token": next_token, "has_more": has_more}
 
     async def get_by_field(
         self, data: str, field_name: str, fields_limit: list | str = None, ignore_error: bool = False, include_deleted: bool = False, commons: CommonsDependencies = None
@@ -249,7 +518,7 @@ class BaseServices(Generic[TModel]):
             if not ignore_error:
                 raise CoreErrorCode.NotFound(service_name=self.service_name, item=data)
             return None
-        return await self._validate_model(data=items)
+        return await self._validate_model(data=items, projection=bool(fields_limit))
 
     async def _check_modified(self, old_data: TModel, new_data: TModel, ignore_error: bool) -> bool:
         """
@@ -318,9 +587,12 @@ class BaseServices(Generic[TModel]):
         """
         self.ensure_crud_provided()
         # Validate and process the data using the provided model.
-        data_save = data.model_dump(exclude_none=True)
+        data_save = self.set_updated_at(data.model_dump(exclude_none=True))
         item = await self.crud.save(data=data_save)
+        self.invalidate_cache(owner=self.get_owner(data), _id=item)
+        await self.update_owner_count(owner=self.get_owner(data), amount=1)
         result = await self.get_by_id(_id=item)
+        self.publish_change(record=result)
         return result
 
     async def save_many(self, data: list[TModel]) -> list[TModel]:
@@ -331,17 +603,21 @@ class BaseServices(Generic[TModel]):
             data (list[TModel]): A list of dictionaries, each representing a record to be saved.
 
         Returns:
-            list[TModel]: A list of saved records, each retrieved by its ID.
+            list[TModel]: The saved records, in the order of `data`.
 
         """
         self.ensure_crud_provided()
         # Validate and process each record using the provided model.
-        data_save = [item.model_dump(exclude_none=True) for item in data]
+        data_save = [self.set_updated_at(item.model_dump(exclude_none=True)) for item in data]
         items = await self.crud.save_many(data=data_save)
-        results = []
-        for item_id in items:
-            item = await self.get_by_id(_id=item_id)
-            results.append(item)
+        owners = Counter(self.get_owner(item) for item in data)
+        for owner, amount in owners.items():
+            self.invalidate_cache(owner=owner)
+            await self.update_owner_count(owner=owner, amount=amount)
+        # The inserted documents are the records: no need to read them back one by one
+        results = await self._validate_model(data=[{**document, "_id": item_id} for document, item_id in zip(data_save, items)])
+        for item in results:
+            self.publish_change(record=item)
         return results
 
     async def save_unique(self, data: TModel, unique_field: Union[str, list[str]], ignore_error: bool = False) -> Union[bool, dict]:
@@ -361,7 +637,7 @@ class BaseServices(Generic[TModel]):
         """
         self.ensure_crud_provided()
 
-        data_dict = data.model_dump(exclude_none=True)
+        data_dict = self.set_updated_at(data.model_dump(exclude_none=True))
         item = await self.crud.save_unique(data=data_dict, unique_field=unique_field)
 
         if not item:
@@ -373,7 +649,11 @@ class BaseServices(Generic[TModel]):
                 unique_value = getattr(data, unique_field)
             raise CoreErrorCode.Conflict(service_name=self.service_name, item=unique_value)
 
-        return await self.get_by_id(_id=item)
+        self.invalidate_cache(owner=self.get_owner(data), _id=item)
+        await self.update_owner_count(owner=self.get_owner(data), amount=1)
+        result = await self.get_by_id(_id=item)
+        self.publish_change(record=result)
+        return result
 
     async def update_by_id(
         self,
@@ -415,10 +695,98 @@ class BaseServices(Generic[TModel]):
         if unique_field:
             await self._check_unique(data=data, unique_field=unique_field, ignore_error=ignore_error)
         data_dict = data.model_dump(exclude_none=True)
+        if self.has_field("updated_at"):
+            data_dict.setdefault("updated_at", self.get_current_datetime())
         await self.crud.update_by_id(_id=_id, data=data_dict)
+        self.invalidate_cache(owner=self.get_owner(item), _id=_id)
         result = await self.get_by_id(_id=_id, ignore_error=ignore_error, include_deleted=True)
+        self.publish_change(record=result)
         return result
 
+    def build_bulk_query(self, ids: list[str] = None, filters: dict = None, commons: CommonsDependencies = None) -> dict:
+        """
+        Builds the filter of the active records selected by a bulk operation, within the ownership of the current user.
+
+        Args:
+            ids (list[str], optional): The IDs of the records.
+            filters (dict, optional): Query string filters (see `build_filters`), e.g. `{"status": "to_do"}`.
+            commons (CommonsDependencies, optional): Common dependencies for the request. Defaults to None.
+
+        Raises:
+            CoreErrorCode.InvalidBulkSelection: If neither or both of `ids` and `filters` are given.
+            CoreErrorCode.InvalidFilter: If a filter is not valid.
+        """
+        if bool(ids) == bool(filters):
+            raise CoreErrorCode.InvalidBulkSelection()
+        conditions = [{"deleted_at": None}]
+        ownership_query = self.build_ownership_query(commons=commons)
+        if ownership_query:
+            conditions.append(ownership_query)
+        if ids:
+            conditions.append({"_id": {"$in": [ObjectId(_id) for _id in ids]}})
+        else:
+            conditions.append(self.build_filters(filters=filters))
+        return {"$and": conditions}
+
+    async def update_many(self, data: BaseModel, ids: list[str] = None, filters: dict = None, commons: CommonsDependencies = None) -> list[TModel]:
+        """
+        Updates the active records selected by ids or filters with a single `update_many`.
+
+        The selection is read once, without the content of the records, to bound its size; then the records are updated with
+        a marker of the call in `BULK_WRITE_FIELD`, and the records holding the marker are read back once. A record edited in
+        between is still returned; a record also selected by a later `update_many` belongs to that call.
+
+        Args:
+            data (BaseModel): The data to set in the records.
+            ids (list[str], optional): The IDs of the records.
+            filters (dict, optional): Query string filters (see `build_filters`).
+            commons (CommonsDependencies, optional): Common dependencies for the request, which restrict the selection to the
+                records of the current user. Defaults to None.
+
+        Returns:
+            list[TModel]: The updated records; the selected records that were not found, not owned or concurrently deleted are absent.
+
+        Raises:
+            CoreErrorCode.InvalidBulkSelection: If neither or both of `ids` and `filters` are given.
+            CoreErrorCode.TooManyItems: If more than `bulk_max_items` records are selected.
+        """
+        self.ensure_crud_provided()
+        query = self.build_bulk_query(ids=ids, filters=filters, commons=commons)
+        limit = settings.bulk_max_items
+        selected = await self.crud.get_range(query=query, sort_by=[("_id", 1)], limit=limit + 1, fields_limit=["_id"])
+        if len(selected) > limit:
+            raise CoreErrorCode.TooManyItems(max_items=limit)
+        if not selected:
+            return []
+        data_dict = data.model_dump(exclude_none=True)
+        if self.has_field("updated_at"):
+            data_dict["updated_at"] = truncate_to_milliseconds(data_dict.get("updated_at") or self.get_current_datetime())
+        # A marker of this call identifies the records it modified, even if they are edited again before the read back
+        data_dict[BULK_WRITE_FIELD] = str(ObjectId())
+        selected_ids = [ObjectId(item["_id"]) for item in selected]
+        await self.crud.update_many(query={"_id": {"$in": selected_ids}, "deleted_at": None}, data=data_dict)
+        query = {"_id": {"$in": selected_ids}, BULK_WRITE_FIELD: data_dict[BULK_WRITE_FIELD]}
+        items = await self.crud.get_range(query=query, sort_by=[("_id", 1)], limit=0)
+        results = await self._validate_model(data=items)
+        for owner in {self.get_owner(item) for item in results}:
+            self.invalidate_cache(owner=owner)
+        for item in results:
+            self.publish_change(record=item)
+        return results
+
+    async def soft_delete_many(self, ids: list[str] = None, filters: dict = None, commons: CommonsDependencies = None) -> list[TModel]:
+        """
+        Soft deletes the active records selected by ids or filters with a single `update_many` (see `update_many`).
+
+        Returns:
+            list[TModel]: The deleted records.
+        """
+        data = internal_models.SoftDelete(deleted_by=self.get_current_user(commons=commons))
+        results = await self.update_many(data=data, ids=ids, filters=filters, commons=commons)
+        for owner, amount in Counter(self.get_owner(item) for item in results).items():
+            await self.update_owner_count(owner=owner, amount=-amount)
+        return results
+
     async def hard_delete_by_id(self, _id: str, ignore_error: bool = False, include_deleted: bool = False, commons: CommonsDependencies = None) -> bool:
         """
         Permanently deletes a record by its ID.
@@ -437,10 +805,18 @@ class BaseServices(Generic[TModel]):
 
         """
         self.ensure_crud_provided()
-        await self.get_by_id(_id=_id, ignore_error=ignore_error, include_deleted=include_deleted, commons=commons)
+        item = await self.get_by_id(_id=_id, ignore_error=ignore_error, include_deleted=include_deleted, commons=commons)
         result = await self.crud.delete_by_id(_id=_id)
         if not result:
             raise CoreErrorCode.NotFound(service_name=self.service_name, item=_id)
+        self.invalidate_cache(owner=self.get_owner(item), _id=_id)
+        self.publish_change(record=item, action="deleted")
+        if include_deleted:
+            # The record may already have been soft-deleted, the counter of its owner is rebuilt on its next read
+            if self.owner_counters is not None and self.get_owner(item):
+                await self.owner_counters.reset(owner=str(self.get_owner(item)))
+        else:
+            await self.update_owner_count(owner=self.get_owner(item), amount=-1)
         return result
 
     async def soft_delete_by_id(self, _id: str, ignore_error: bool = False, commons: CommonsDependencies = None) -> dict:
@@ -456,7 +832,20 @@ class BaseServices(Generic[TModel]):
             dict: The updated record with the soft delete information.
         """
         self.ensure_crud_provided()
+        item = await self.get_by_id(_id=_id, ignore_error=ignore_error, commons=commons)
+        if not item and ignore_error:
+            return None
         deleted_by = self.get_current_user(commons=commons)
-        data = internal_models.SoftDelete(deleted_by=deleted_by)
-        result = await self.update_by_id(_id=_id, data=data, ignore_error=ignore_error, commons=commons)
+        data_dict = internal_models.SoftDelete(deleted_by=deleted_by).model_dump(exclude_none=True)
+        if self.has_field("updated_at"):
+            data_dict.setdefault("updated_at", self.get_current_datetime())
+        # Conditioned on the record being active: of two concurrent deletes, only one modifies it and decrements the counter
+        if not await self.crud.update_by_id(_id=_id, data=data_dict, query={"deleted_at": None}):
+            if ignore_error:
+                return None
+            raise CoreErrorCode.NotFound(service_name=self.service_name, item=_id)
+        self.invalidate_cache(owner=self.get_owner(item), _id=_id)
+        result = await self.get_by_id(_id=_id, ignore_error=ignore_error, include_deleted=True)
+        self.publish_change(record=result)
+        await self.update_owner_count(owner=self.get_owner(item), amount=-1)
         return result
@@ -0,0 +1,125 @@
+import re
+
+from .exceptions import CoreErrorCode
+
+SORT_FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+TIE_BREAKER = "_id"
+
+SortSpec = list[tuple[str, int]]
+
+
+def parse_sort(sort_by: str, order_by: str = "desc", max_keys: int = 3) -> SortSpec:
+    """
+    Parses a sort expression such as `status,-created_at` into a MongoDB sort specification.
+
+    A key prefixed with `-` sorts descending, with `+` ascending; a key without prefix follows `order_by`,
+    so the former `sort_by=created_at&order_by=desc` keeps its meaning.
+
+    Args:
+        sort_by (str): The comma-separated sort keys.
+        order_by (str, optional): The direction of the keys without prefix, "asc" or "desc". Defaults to "desc".
+        max_keys (int, optional): The maximum number of keys. Defaults to 3.
+
+    Returns:
+        SortSpec: A list of (field, direction) pairs, direction being 1 or -1.
+
+    Raises:
+        CoreErrorCode.InvalidSort: If a key is malformed or repeated, or if there are too many keys.
+    """
+    default_direction = -1 if order_by == "desc" else 1
+    keys = [key.strip() for key in sort_by.split(",") if key.strip()] if sort_by else []
+    if len(keys) > max_keys:
+        raise CoreErrorCode.InvalidSort(sort_by=sort_by, detail=f"At most {max_keys} sort keys are allowed.")
+    sort = []
+    for key in keys:
+        direction = default_direction
+        if key[0] in "+-":
+            direction = -1 if key[0] == "-" else 1
+            key = key[1:]
+        if not SORT_FIELD_PATTERN.match(key):
+            raise CoreErrorCode.InvalidSort(sort_by=sort_by, detail=f"The sort key {key} is not a valid field name.")
+        # The model exposes _id as id
+        field = TIE_BREAKER if key == "id" else key
+        if any(field == existing for existing, _ in sort):
+            raise CoreErrorCode.InvalidSort(sort_by=sort_by, detail=f"The sort key {key} is repeated.")
+        sort.append((field, direction))
+    return sort
+
+
+def get_equality_fields(query: dict | None) -> set[str]:
+    """Returns the fields a query pins to a single value (they can be skipped at the start of an index)."""
+    fields = set()
+    for key, condition in (query or {}).items():
+        if key.startswith("$"):
+            continue
+        if not isinstance(condition, dict) or list(condition) == ["$eq"]:
+            fields.add(key)
+    return fields
+
+
+def index_supports_sort(index: SortSpec, sort: SortSpec, equality_fields: set[str]) -> bool:
+    """
+    Checks whether walking an index returns the documents in the sort order, so MongoDB does not need a blocking in-memory sort.
+
+    It holds when the sort keys follow the leading index keys that the query pins by equality, with all the directions
+    of the index or all of them reversed (the index is then walked backwards).
+    """
+    sort_fields = {field for field, _ in sort}
+    start = 0
+    while start < len(index) and index[start][0] in equality_fields and index[start][0] not in sort_fields:
+        start += 1
+    candidate = index[start : start + len(sort)]
+    if [field for field, _ in candidate] != [field for field, _ in sort]:
+        return False
+    same_direction = all(index_direction == direction for (_, index_direction), (_, direction) in zip(candidate, sort))
+    reversed_direction = all(index_direction == -direction for (_, index_direction), (_, direction) in zip(candidate, sort))
+    return same_direction or reversed_direction
+
+
+class SortRegistry:
+    """
+    The sortable fields and the indexes of a service.
+
+    Args:
+        service_name (str): The name of the service, used in error messages.
+        sortable_fields (list[str]): The fields clients may sort on.
+        indexes (list[SortSpec], optional): The indexes of the collection, as lists of (field, direction). Defaults to None.
+        require_index (bool, optional): Reject sorts that no index supports instead of letting MongoDB sort in memory. Defaults to False.
+    """
+
+    def __init__(self, service_name: str, sortable_fields: list[str], indexes: list[SortSpec] = None, require_index: bool = False) -> None:
+        self.service_name = service_name
+        self.sortable_fields = {TIE_BREAKER if field == "id" else field for field in sortable_fields} | {TIE_BREAKER}
+        self.indexes = indexes or []
+        self.require_index = require_index
+
+    def resolve(self, sort: SortSpec, query: dict = None) -> SortSpec:
+        """
+        Validates a sort and appends the `_id` tie-breaker, which makes the order (and so the pages) deterministic.
+
+        Args:
+            sort (SortSpec): The parsed sort.
+            query (dict, optional): The filter of the query, whose equality fields may be skipped in an index. Defaults to None.
+
+        Returns:
+            SortSpec: The sort to send to the database.
+
+        Raises:
+            CoreErrorCode.InvalidSort: If a field is not sortable, or if no index supports the sort while `require_index` is set.
+        """
+        for field, _ in sort:
+            if field not in self.sortable_fields:
+                allowed = ", ".join(sorted("id" if item == TIE_BREAKER else item for item in self.sortable_fields))
+                raise CoreErrorCode.InvalidSort(sort_by=field, detail=f"The {self.service_name} can be sorted by: {allowed}.")
+        if sort and all(field != TIE_BREAKER for field, _ in sort):
+            sort = [*sort, (TIE_BREAKER, sort[-1][1])]
+        if self.require_index and sort and not self.is_indexed(sort=sort, query=query):
+            keys = ",".join(("-" if direction < 0 else "") + field for field, direction in sort)
+            raise CoreErrorCode.InvalidSort(sort_by=keys, detail="No index supports this sort on a large collection.")
+        return sort
+
+    def is_indexed(self, sort: SortSpec, query: dict = None) -> bool:
+        if sort == [(TIE_BREAKER, 1)] or sort == [(TIE_BREAKER, -1)]:
+            return True
+        equality_fields = get_equality_fields(query=query)
+        return any(index_supports_sort(index=index, sort=sort, equality_fields=equality_fields) for index in self.indexes)
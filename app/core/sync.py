@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from bson import ObjectId
+
+from .exceptions import CoreErrorCode
+
+# The order of a change feed, served by an index on (<owner>, updated_at, _id)
+SYNC_SORT = [("updated_at", 1), ("_id", 1)]
+
+
+def get_change_action(record: Any) -> str:
+    """
+    Tells how a record changed last: "deleted" when it is soft-deleted, "created" when it was never updated, else "updated".
+    """
+    if getattr(record, "deleted_at", None):
+        return "deleted"
+    updated_at = getattr(record, "updated_at", None)
+    return "created" if updated_at is None or updated_at == getattr(record, "created_at", None) else "updated"
+
+
+def encode_sync_token(updated_at: datetime | None, _id: str) -> str:
+    """
+    Encodes the position of the last change returned to a client.
+
+    Args:
+        updated_at (datetime | None): The version of the last record, None for records written before `updated_at` was maintained.
+        _id (str): The ID of the last record, which orders the records updated at the same time.
+
+    Returns:
+        str: An opaque, URL safe token.
+    """
+    payload = json.dumps({"t": updated_at.isoformat() if updated_at else None, "i": str(_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> tuple[datetime | None, ObjectId]:
+    """
+    Decodes a token of `encode_sync_token`.
+
+    Raises:
+        CoreErrorCode.InvalidSyncToken: If the token is malformed.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        updated_at = datetime.fromisoformat(payload["t"]) if payload["t"] else None
+        return updated_at, ObjectId(payload["i"])
+    except Exception:
+        raise CoreErrorCode.InvalidSyncToken(token=token)
+
+
+def build_since_query(token: str) -> dict:
+    """
+    Builds the filter of the records written after the position of a token, i.e. after it in the (updated_at, _id) order.
+
+    Records without `updated_at` sort first, as MongoDB orders null before dates.
+    """
+    updated_at, last_id = decode_sync_token(token=token)
+    if updated_at is None:
+        return {"$or": [{"updated_at": None, "_id": {"$gt": last_id}}, {"updated_at": {"$ne": None}}]}
+    return {"$or": [{"updated_at": {"$gt": updated_at}}, {"updated_at": updated_at, "_id": {"$gt": last_id}}]}
@@ -0,0 +1,78 @@
+from typing import Any, AsyncIterator, Protocol
+
+
+class CollectionBackend(Protocol):
+    """
+    The operations `BaseCRUD` performs on a collection.
+
+    Filters, projections and update documents use the MongoDB syntax. Every method accepts the `comment` attached
+    to the operation (the request id); backends that have no use for it ignore it.
+
+    Implementations:
+        - `MongoCollection` (db/backends/mongo.py): a Motor collection.
+        - `MemoryCollection` (db/backends/memory.py): documents kept in a dictionary, for tests and benchmarks.
+    """
+
+    name: str
+
+    async def insert_one(self, document: dict, comment: str = None) -> Any:
+        """Inserts a document and returns its `_id`."""
+
+    async def insert_many(self, documents: list[dict], ordered: bool = True, comment: str = None) -> list:
+        """Inserts documents and returns their `_id`s."""
+
+    async def find_one(self, filter: dict, projection: dict = None, comment: str = None) -> dict | None:
+        ...
+
+    async def find(
+        self, filter: dict, projection: dict = None, sort: list[tuple[str, int]] = None, skip: int = 0, limit: int = 0, allow_disk_use: bool = None, comment: str = None
+    ) -> list[dict]:
+        ...
+
+    async def count_documents(self, filter: dict, comment: str = None) -> int:
+        ...
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, comment: str = None) -> int:
+        """Applies an update document (`$set`, `$unset`, ...) to the first matching document and returns the number of modified documents."""
+
+    async def update_many(self, filter: dict, update: dict, comment: str = None) -> int:
+        """Applies an update document to every matching document and returns the number of modified documents."""
+
+    async def delete_one(self, filter: dict, comment: str = None) -> int:
+        """Deletes the first matching document and returns the number of deleted documents."""
+
+    async def delete_many(self, filter: dict, comment: str = None) -> int:
+        """Deletes every matching document and returns the number of deleted documents."""
+
+    async def aggregate(self, pipeline: list[dict], comment: str = None) -> list[dict]:
+        ...
+
+    async def create_index(self, keys: list[tuple[str, int]], **options) -> str:
+        """Creates an index if it does not exist and returns its name. Options follow MongoDB (`unique`, `expireAfterSeconds`, ...)."""
+
+    def tail(self, filter: dict = None, comment: str = None) -> AsyncIterator[dict]:
+        """
+        Yields the documents of a capped collection that match a filter, in insertion order, then waits for new ones
+        (a tailable await cursor). The iteration ends when the cursor dies, e.g. on an empty collection.
+        """
+
+    async def drop(self) -> None:
+        ...
+
+
+class StorageBackend(Protocol):
+    """
+    A database: the factory of the collections used by `BaseCRUD`.
+    """
+
+    def get_collection(self, name: str) -> CollectionBackend:
+        ...
+
+    async def create_capped_collection(self, name: str, size: int, max_documents: int) -> CollectionBackend:
+        """Creates a capped collection of at most `size` bytes and `max_documents` documents, or returns it if it exists."""
+
+    async def ping(self) -> None:
+        """Raises if the storage is unreachable."""
+
+    async def drop(self) -> None:
+        """Drops every collection of the database."""
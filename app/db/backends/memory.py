@@ -0,0 +1,443 @@
+import asyncio
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+# Marks a field absent from a document (None is a value, stored as null)
+MISSING = object()
+
+
+def copy_value(value: Any) -> Any:
+    """Copies the containers of a document so that callers never share state with the stored documents."""
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
+def get_path(document: dict, path: str) -> Any:
+    """Returns the value at a dotted path, or MISSING."""
+    value = document
+    for key in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(key, MISSING)
+        elif isinstance(value, list) and key.isdigit():
+            index = int(key)
+            value = value[index] if index < len(value) else MISSING
+        else:
+            return MISSING
+        if value is MISSING:
+            return MISSING
+    return value
+
+
+def set_path(document: dict, path: str, value: Any) -> None:
+    *parents, last = path.split(".")
+    for key in parents:
+        document = document.setdefault(key, {})
+    document[last] = value
+
+
+def unset_path(document: dict, path: str) -> None:
+    *parents, last = path.split(".")
+    for key in parents:
+        document = document.get(key)
+        if not isinstance(document, dict):
+            return
+    document.pop(last, None)
+
+
+# The order in which MongoDB compares values of different BSON types
+def type_rank(value: Any) -> int:
+    if value is MISSING or value is None:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, bytes):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+
+def sort_key(value: Any) -> tuple:
+    rank = type_rank(value)
+    if rank == 1:
+        return (rank, 0)
+    if rank in (4, 5):
+        return (rank, repr(value))
+    return (rank, value)
+
+
+def compare(value: Any, other: Any) -> int | None:
+    """Compares two values of the same BSON type, or returns None when the types differ (no match, like MongoDB)."""
+    if type_rank(value) != type_rank(other) or type_rank(value) == 1:
+        return None
+    try:
+        return (value > other) - (value < other)
+    except TypeError:
+        return None
+
+
+@lru_cache(maxsize=256)
+def compile_regex(pattern: str, options: str = "") -> re.Pattern:
+    flags = 0
+    for option in options:
+        flags |= {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "x": re.VERBOSE}.get(option, 0)
+    return re.compile(pattern, flags)
+
+
+def candidates(value: Any) -> list:
+    # A condition on an array field matches when the array itself or one of its elements matches
+    if isinstance(value, list):
+        return [value, *value]
+    return [value]
+
+
+def equals(value: Any, expected: Any) -> bool:
+    if expected is None:
+        return value is MISSING or value is None
+    if isinstance(expected, re.Pattern):
+        return any(isinstance(item, str) and expected.search(item) is not None for item in candidates(value))
+    return any(item is not MISSING and type_rank(item) == type_rank(expected) and item == expected for item in candidates(value))
+
+
+def match_operators(value: Any, conditions: dict) -> bool:
+    for operator, expected in conditions.items():
+        if operator == "$eq":
+            matched = equals(value, expected)
+        elif operator == "$ne":
+            matched = not equals(value, expected)
+        elif operator in ("$gt", "$gte", "$lt", "$lte"):
+            results = [compare(item, expected) for item in candidates(value)]
+            matched = any(result is not None and {"$gt": result > 0, "$gte": result >= 0, "$lt": result < 0, "$lte": result <= 0}[operator] for result in results)
+        elif operator == "$in":
+            matched = any(equals(value, item) for item in expected)
+        elif operator == "$nin":
+            matched = not any(equals(value, item) for item in expected)
+        elif operator == "$exists":
+            matched = (value is not MISSING) == bool(expected)
+        elif operator == "$regex":
+            pattern = expected if isinstance(expected, re.Pattern) else compile_regex(expected, conditions.get("$options", ""))
+            matched = any(isinstance(item, str) and pattern.search(item) is not None for item in candidates(value))
+        elif operator == "$options":
+            continue
+        elif operator == "$not":
+            matched = not match_operators(value, expected if isinstance(expected, dict) else {"$regex": expected})
+        elif operator == "$size":
+            matched = isinstance(value, list) and len(value) == expected
+        elif operator == "$all":
+            matched = all(equals(value, item) for item in expected)
+        elif operator == "$elemMatch":
+            matched = isinstance(value, list) and any(isinstance(item, dict) and matches(item, expected) for item in value)
+        else:
+            raise OperationFailure(f"unknown operator: {operator}")
+        if not matched:
+            return False
+    return True
+
+
+def is_operator_document(condition: Any) -> bool:
+    return isinstance(condition, dict) and bool(condition) and all(key.startswith("$") for key in condition)
+
+
+def matches(document: dict, filter: dict | None) -> bool:
+    """Evaluates a MongoDB filter against a document."""
+    if not filter:
+        return True
+    for key, condition in filter.items():
+        if key == "$or":
+            if not any(matches(document, item) for item in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(document, item) for item in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(document, item) for item in condition):
+                return False
+        elif key == "$comment":
+            continue
+        elif key.startswith("$"):
+            raise OperationFailure(f"unknown top level operator: {key}")
+        else:
+            value = get_path(document, key)
+            if is_operator_document(condition):
+                if not match_operators(value, condition):
+                    return False
+            elif not equals(value, condition):
+                return False
+    return True
+
+
+def project(document: dict, projection: dict | None) -> dict:
+    """Applies an inclusion (`{"field": 1}`) or exclusion (`{"field": 0}`) projection."""
+    if not projection:
+        return copy_value(document)
+    include_id = bool(projection.get("_id", 1))
+    fields = {key: value for key, value in projection.items() if key != "_id"}
+    if all(fields.values()) and (fields or include_id):
+        result = {"_id": document["_id"]} if include_id and "_id" in document else {}
+        for path in fields:
+            value = get_path(document, path)
+            if value is not MISSING:
+                set_path(result, path, copy_value(value))
+        return result
+    result = copy_value(document)
+    for path in fields:
+        unset_path(result, path)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def sort_documents(documents: list[dict], sort: list[tuple[str, int]]) -> list[dict]:
+    # Stable sorts from the last key to the first give the multi-key order
+    for field, direction in reversed(sort):
+        documents.sort(key=lambda document: sort_key(get_path(document, field)), reverse=direction < 0)
+    return documents
+
+
+def apply_update(document: dict, update: dict) -> None:
+    for operator, fields in update.items():
+        if operator == "$set":
+            for path, value in fields.items():
+                set_path(document, path, copy_value(value))
+        elif operator == "$unset":
+            for path in fields:
+                unset_path(document, path)
+        elif operator == "$inc":
+            for path, value in fields.items():
+                current = get_path(document, path)
+                set_path(document, path, (0 if current is MISSING else current) + value)
+        elif operator == "$max":
+            for path, value in fields.items():
+                current = get_path(document, path)
+                if current is MISSING or compare(value, current) == 1:
+                    set_path(document, path, value)
+        elif operator == "$setOnInsert":
+            continue
+        else:
+            raise OperationFailure(f"Unknown modifier: {operator}")
+
+
+class MemoryCollection:
+    """
+    A `CollectionBackend` keeping the documents in a dictionary indexed by `_id`, in insertion order.
+
+    Every operation completes without awaiting, so it is atomic with respect to the other coroutines.
+    Filters support equality, `$eq`, `$ne`, `$gt(e)`, `$lt(e)`, `$in`, `$nin`, `$exists`, `$regex`/`$options`, `$not`,
+    `$size`, `$all`, `$elemMatch`, `$or`, `$and` and `$nor`; updates support `$set`, `$unset`, `$inc`, `$max` and `$setOnInsert`.
+    Reads scan the whole collection, which is fast enough for test and benchmark volumes. Indexes are recorded and
+    only enforced for `unique` (on inserts); other options such as `expireAfterSeconds` are ignored.
+
+    Args:
+        name (str): The name of the collection.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.documents: dict[Any, dict] = {}
+        self.indexes: dict[str, dict] = {}
+        # Set for capped collections: the oldest documents are removed beyond this number
+        self.max_documents: int | None = None
+        self.inserted = 0
+        self.waiters: list[asyncio.Future] = []
+
+    def _check_unique(self, document: dict) -> None:
+        for name, index in self.indexes.items():
+            if not index.get("unique"):
+                continue
+            key = [get_path(document, field) for field, _ in index["key"]]
+            if any(key == [get_path(other, field) for field, _ in index["key"]] for other in self.documents.values()):
+                raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {name} dup key: {key!r}")
+
+    def _insert(self, document: dict) -> Any:
+        document = copy_value(document)
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        if document["_id"] in self.documents:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} dup key: {{ _id: {document['_id']!r} }}")
+        self._check_unique(document)
+        self.documents[document["_id"]] = document
+        self.inserted += 1
+        if self.max_documents is not None and len(self.documents) > self.max_documents:
+            del self.documents[next(iter(self.documents))]
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self.waiters.clear()
+        return document["_id"]
+
+    def _matching(self, filter: dict | None) -> list[dict]:
+        # An equality on _id is a dictionary lookup instead of a scan
+        if filter and "_id" in filter and not is_operator_document(filter["_id"]):
+            document = self.documents.get(filter["_id"])
+            return [document] if document is not None and matches(document, filter) else []
+        return [document for document in self.documents.values() if matches(document, filter)]
+
+    def _update(self, document: dict, update: dict) -> bool:
+        if not is_operator_document(update):
+            raise ValueError("update only works with $ operators")
+        before = copy_value(document)
+        apply_update(document, update)
+        return document != before
+
+    async def insert_one(self, document: dict, comment: str = None) -> Any:
+        inserted_id = self._insert(document)
+        # Like pymongo, the caller's document receives the generated _id
+        document.setdefault("_id", inserted_id)
+        return inserted_id
+
+    async def insert_many(self, documents: list[dict], ordered: bool = True, comment: str = None) -> list:
+        # Like MongoDB, an ordered insert stops at the first duplicate and an unordered one inserts every other document,
+        # then both report the failed documents in a BulkWriteError
+        inserted_ids, write_errors = [], []
+        for index, document in enumerate(documents):
+            try:
+                inserted_ids.append(await self.insert_one(document))
+            except DuplicateKeyError as error:
+                write_errors.append({"index": index, "code": 11000, "errmsg": str(error), "op": document})
+                if ordered:
+                    break
+        if write_errors:
+            raise BulkWriteError(
+                {"writeErrors": write_errors, "writeConcernErrors": [], "nInserted": len(inserted_ids), "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []}
+            )
+        return inserted_ids
+
+    async def find_one(self, filter: dict, projection: dict = None, comment: str = None) -> dict | None:
+        documents = self._matching(filter)
+        return project(documents[0], projection) if documents else None
+
+    async def find(
+        self, filter: dict, projection: dict = None, sort: list[tuple[str, int]] = None, skip: int = 0, limit: int = 0, allow_disk_use: bool = None, comment: str = None
+    ) -> list[dict]:
+        documents = self._matching(filter)
+        if sort:
+            documents = sort_documents(documents, sort)
+        if skip:
+            documents = documents[skip:]
+        if limit:
+            documents = documents[:limit]
+        return [project(document, projection) for document in documents]
+
+    async def count_documents(self, filter: dict, comment: str = None) -> int:
+        return len(self._matching(filter))
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, comment: str = None) -> int:
+        documents = self._matching(filter)
+        if documents:
+            return int(self._update(documents[0], update))
+        if upsert:
+            # The equality conditions of the filter seed the new document
+            document = {key: copy_value(value) for key, value in (filter or {}).items() if not key.startswith("$") and not is_operator_document(value)}
+            apply_update(document, update)
+            for path, value in update.get("$setOnInsert", {}).items():
+                set_path(document, path, copy_value(value))
+            self._insert(document)
+        return 0
+
+    async def update_many(self, filter: dict, update: dict, comment: str = None) -> int:
+        return sum(self._update(document, update) for document in self._matching(filter))
+
+    async def delete_one(self, filter: dict, comment: str = None) -> int:
+        documents = self._matching(filter)
+        if not documents:
+            return 0
+        del self.documents[documents[0]["_id"]]
+        return 1
+
+    async def delete_many(self, filter: dict, comment: str = None) -> int:
+        documents = self._matching(filter)
+        for document in documents:
+            del self.documents[document["_id"]]
+        return len(documents)
+
+    async def aggregate(self, pipeline: list[dict], comment: str = None) -> list[dict]:
+        """Supports the `$match`, `$sort`, `$skip`, `$limit`, `$project` and `$count` stages."""
+        documents = [copy_value(document) for document in self.documents.values()]
+        for stage in pipeline:
+            (name, argument), *_ = stage.items()
+            if name == "$match":
+                documents = [document for document in documents if matches(document, argument)]
+            elif name == "$sort":
+                documents = sort_documents(documents, list(argument.items()))
+            elif name == "$skip":
+                documents = documents[argument:]
+            elif name == "$limit":
+                documents = documents[:argument]
+            elif name == "$project":
+                documents = [project(document, argument) for document in documents]
+            elif name == "$count":
+                documents = [{argument: len(documents)}] if documents else []
+            else:
+                raise OperationFailure(f"Unsupported stage in the memory backend: {name}")
+        return documents
+
+    async def create_index(self, keys: list[tuple[str, int]], **options) -> str:
+        name = options.pop("name", None) or "_".join(f"{field}_{direction}" for field, direction in keys)
+        self.indexes.setdefault(name, {"key": list(keys), **options})
+        return name
+
+    async def tail(self, filter: dict = None, comment: str = None) -> AsyncIterator[dict]:
+        """Follows the collection in insertion order, like a tailable cursor on a capped collection."""
+        seen = self.inserted - len(self.documents)
+        while True:
+            new = self.inserted - seen
+            if new > len(self.documents):
+                raise OperationFailure("CappedPositionLost: the position of the tailable cursor was overwritten")
+            documents = list(self.documents.values())[len(self.documents) - new :]
+            seen = self.inserted
+            for document in documents:
+                if matches(document, filter):
+                    yield copy_value(document)
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            await waiter
+
+    async def drop(self) -> None:
+        self.documents.clear()
+        self.indexes.clear()
+
+
+class MemoryStorage:
+    """
+    A `StorageBackend` keeping every collection in the memory of the process.
+
+    The data is private to the process and lost when it exits: use it for tests, benchmarks and local experiments.
+    """
+
+    def __init__(self) -> None:
+        self.collections: dict[str, MemoryCollection] = {}
+
+    def get_collection(self, name: str) -> MemoryCollection:
+        if name not in self.collections:
+            self.collections[name] = MemoryCollection(name=name)
+        return self.collections[name]
+
+    async def create_capped_collection(self, name: str, size: int, max_documents: int) -> MemoryCollection:
+        collection = self.get_collection(name)
+        collection.max_documents = max_documents
+        return collection
+
+    async def ping(self) -> None:
+        return None
+
+    async def drop(self) -> None:
+        for collection in self.collections.values():
+            await collection.drop()
@@ -0,0 +1,109 @@
+from typing import Any, AsyncIterator
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+
+class MongoCollection:
+    """
+    A `CollectionBackend` backed by a Motor collection.
+
+    Args:
+        collection (AsyncIOMotorCollection): The Motor collection.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection) -> None:
+        self.collection = collection
+        self.name = collection.name
+
+    async def insert_one(self, document: dict, comment: str = None) -> Any:
+        result = await self.collection.insert_one(document=document, comment=comment)
+        return result.inserted_id
+
+    async def insert_many(self, documents: list[dict], ordered: bool = True, comment: str = None) -> list:
+        result = await self.collection.insert_many(documents=documents, ordered=ordered, comment=comment)
+        return result.inserted_ids
+
+    async def find_one(self, filter: dict, projection: dict = None, comment: str = None) -> dict | None:
+        return await self.collection.find_one(filter=filter, projection=projection, comment=comment)
+
+    async def find(
+        self, filter: dict, projection: dict = None, sort: list[tuple[str, int]] = None, skip: int = 0, limit: int = 0, allow_disk_use: bool = None, comment: str = None
+    ) -> list[dict]:
+        cursor = self.collection.find(filter=filter, projection=projection, allow_disk_use=allow_disk_use, comment=comment)
+        if sort:
+            cursor = cursor.sort(sort)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        return await cursor.to_list(length=None)
+
+    async def count_documents(self, filter: dict, comment: str = None) -> int:
+        return await self.collection.count_documents(filter=filter, comment=comment)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, comment: str = None) -> int:
+        result = await self.collection.update_one(filter=filter, update=update, upsert=upsert, comment=comment)
+        return result.modified_count
+
+    async def update_many(self, filter: dict, update: dict, comment: str = None) -> int:
+        result = await self.collection.update_many(filter=filter, update=update, comment=comment)
+        return result.modified_count
+
+    async def delete_one(self, filter: dict, comment: str = None) -> int:
+        result = await self.collection.delete_one(filter=filter, comment=comment)
+        return result.deleted_count
+
+    async def delete_many(self, filter: dict, comment: str = None) -> int:
+        result = await self.collection.delete_many(filter=filter, comment=comment)
+        return result.deleted_count
+
+    async def aggregate(self, pipeline: list[dict], comment: str = None) -> list[dict]:
+        return await self.collection.aggregate(pipeline=pipeline, comment=comment).to_list(length=None)
+
+    async def create_index(self, keys: list[tuple[str, int]], **options) -> str:
+        return await self.collection.create_index(keys, **options)
+
+    async def tail(self, filter: dict = None, comment: str = None) -> AsyncIterator[dict]:
+        cursor = self.collection.find(filter=filter or {}, cursor_type=CursorType.TAILABLE_AWAIT, comment=comment)
+        # The iteration stops every time the server returns an empty batch; the cursor stays open until it dies
+        while cursor.alive:
+            async for document in cursor:
+                yield document
+
+    async def drop(self) -> None:
+        await self.collection.drop()
+
+
+class MongoStorage:
+    """
+    A `StorageBackend` backed by a Motor database.
+
+    Args:
+        database (AsyncIOMotorDatabase): The Motor database.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase) -> None:
+        self.database = database
+        self.collections: dict[str, MongoCollection] = {}
+
+    def get_collection(self, name: str) -> MongoCollection:
+        if name not in self.collections:
+            self.collections[name] = MongoCollection(collection=self.database[name])
+        return self.collections[name]
+
+    async def create_capped_collection(self, name: str, size: int, max_documents: int) -> MongoCollection:
+        try:
+            await self.database.create_collection(name, capped=True, size=size, max=max_documents)
+        except CollectionInvalid:
+            # Created by another worker
+            pass
+        return self.get_collection(name)
+
+    async def ping(self) -> None:
+        await self.database.client.admin.command("ping")
+
+    async def drop(self) -> None:
+        await self.database.client.drop_database(self.database.name)
+        self.collections.clear()
@@ -1,24 +1,62 @@
 import math
 import re
+from typing import Awaitable, Callable
 
 from bson import ObjectId
+from monitoring.timing import timed
+from utils import context
 
+from .backends.base import CollectionBackend, StorageBackend
 from .engine import Engine
 
 
 class BaseCRUD:
+    """
+    The data access layer of a collection.
+
+    It delegates the storage operations to a `CollectionBackend` obtained from the engine: a Motor collection,
+    or an in-memory collection when `database_backend=memory`.
+    """
+
     def __init__(self, database_engine: Engine, collection: str = None) -> None:
-        self.database = database_engine.get_database()
+        self.storage: StorageBackend = database_engine.get_storage()
         if collection:
-            self.collection = self.database[collection]
+            self.collection: CollectionBackend = self.storage.get_collection(collection)
             self.collection_name = collection
 
     async def set_collection(self, collection: str):
-        self.collection = self.database[collection]
+        self.collection = self.storage.get_collection(collection)
         self.collection_name = collection
 
+    def use_storage(self, storage: StorageBackend) -> None:
+        """Moves the CRUD to another storage (e.g. another database), keeping its collection name."""
+        self.storage = storage
+        self.collection = storage.get_collection(self.collection_name)
+
+    def get_comment(self) -> str | None:
+        """
+        Returns the comment attached to every database operation: the id of the current request.
+
+        It makes the operations of a request visible in the MongoDB profiler, slow query log and `currentOp`.
+        """
+        return context.get_request_id()
+
+    async def create_index(self, keys: list[tuple[str, int]], **options) -> str:
+        """
+        Creates an index on the collection if it does not exist.
+
+        Args:
+            keys (list[tuple[str, int]]): The indexed fields and their directions, e.g. [("created_by", 1), ("created_at", -1)].
+            **options: Index options such as `unique=True` or `expireAfterSeconds=3600`.
+
+        Returns:
+            str: The name of the index.
+        """
+        return await self.collection.create_index(keys=keys, **options)
+
+    @timed("db")
     async def count_documents(self, query: dict = None) -> int:
-        return await self.collection.count_documents(filter=query)
+        return await self.collection.count_documents(filter=query, comment=self.get_comment())
 
     async def convert_object_id_to_string(self, document: dict):
         if document.get("_id") is None:
@@ -95,6 +133,7 @@ class BaseCRUD:
             return re.sub(pattern, r"\\\1", value)
         return value
 
+    @timed("db")
     async def save(self, data: dict) -> str:
         """
         Inserts a single document into the collection.
@@ -105,9 +144,10 @@ class BaseCRUD:
         Returns:
             str: The ID of the inserted document as a string.
         """
-        document = await self.collection.insert_one(document=data)
-        return str(document.inserted_id)
+        inserted_id = await self.collection.insert_one(document=data, comment=self.get_comment())
+        return str(inserted_id)
 
+    @timed("db")
     async def save_many(self, data: list) -> list | None:
         """
         Inserts multiple documents into the collection.
@@ -118,14 +158,15 @@ class BaseCRUD:
         Returns:
             bool: True if the insertion was successful, False otherwise.
         """
-        documents = await self.collection.insert_many(documents=data)
-        if not documents:
+        inserted_ids = await self.collection.insert_many(documents=data, comment=self.get_comment())
+        if not inserted_ids:
             return None
         results = []
-        for document_id in documents.inserted_ids:
+        for document_id in inserted_ids:
             results.append(str(document_id))
         return results
 
+    @timed("db")
     async def save_unique(self, data: dict, unique_field: list | str) -> str | bool:
         """
         Saves a document into the collection if it does not already exist based on unique fields.
@@ -149,7 +190,7 @@ class BaseCRUD:
                     query[key] = data[key]
             is_exist = await self.count_documents(query=query)
         elif isinstance(unique_field, str):
-            is_exist = await self.collection.find_one(filter={unique_field: data[unique_field]})
+            is_exist = await self.collection.find_one(filter={unique_field: data[unique_field]}, comment=self.get_comment())
         else:
             raise ValueError("The type of unique_field must be list or str")
         if is_exist:
@@ -158,6 +199,7 @@ class BaseCRUD:
         result = await self.save(data=data)
         return result
 
+    @timed("db")
     async def aggregate_by_pipeline(self, pipeline: list) -> list:
         """
         Executes an aggregation pipeline on the collection.
@@ -168,12 +210,9 @@ class BaseCRUD:
         Returns:
             list: A list of documents resulting from the aggregation.
         """
-        documents = self.collection.aggregate(pipeline=pipeline)
-        results = []
-        async for document in documents:
-            results.append(document)
-        return results
+        return await self.collection.aggregate(pipeline=pipeline, comment=self.get_comment())
 
+    @timed("db")
     async def update_by_id(self, _id: str, data: dict, query: dict = None) -> bool:
         """
         Updates a document in the collection based on its ID and an optional query.
@@ -190,14 +229,29 @@ class BaseCRUD:
         if not query:
             query = {}
         query.update({"_id": ObjectId(_id)})
-        result = await self.collection.update_one(filter=query, update={"$set": data}, upsert=False)
+        modified_count = await self.collection.update_one(filter=query, update={"$set": data}, upsert=False, comment=self.get_comment())
 
-        # The return statement `return update_result.modified_count > 0` checks if the number of documents
+        # The return statement `return modified_count > 0` checks if the number of documents
         # modified by the update operation is greater than zero. If at least one document was modified,
         # it returns True, indicating a successful update. If no documents were modified (either because
         # the document did not exist or the data provided did not change any fields), it returns False.
-        return result.modified_count > 0
+        return modified_count > 0
 
+    @timed("db")
+    async def update_many(self, query: dict, data: dict) -> int:
+        """
+        Updates every document matching a query in a single operation.
+
+        Args:
+            query (dict): The filter, used as is.
+            data (dict): The data to set in the documents.
+
+        Returns:
+            int: The number of modified documents.
+        """
+        return await self.collection.update_many(filter=query, update={"$set": data}, comment=self.get_comment())
+
+    @timed("db")
     async def delete_by_id(self, _id: str, query: dict = None) -> bool:
         """
         Deletes a document from the collection based on its ID and an optional query.
@@ -212,9 +266,10 @@ class BaseCRUD:
         if not query:
             query = {}
         query.update({"_id": ObjectId(_id)})
-        result = await self.collection.delete_one(filter=query)
-        return result.deleted_count > 0
+        deleted_count = await self.collection.delete_one(filter=query, comment=self.get_comment())
+        return deleted_count > 0
 
+    @timed("db")
     async def delete_field_by_id(self, _id: str, field_name: str | list) -> bool:
         """
         Deletes specified fields from a document in the collection based on the document's ID.
@@ -230,9 +285,10 @@ class BaseCRUD:
             field_name = [field_name]
         query = {"_id": ObjectId(_id)}
         data = {field: 1 for field in field_name}
-        result = await self.collection.update_one(filter=query, update={"$unset": data})
-        return result.modified_count > 0
+        modified_count = await self.collection.update_one(filter=query, update={"$unset": data}, comment=self.get_comment())
+        return modified_count > 0
 
+    @timed("db")
     async def get_by_id(self, _id, fields_limit: list = None, query: dict = None) -> dict | None:
         """
         Retrieves a document from the collection based on its ID, with optional field limitations and additional query.
@@ -251,12 +307,13 @@ class BaseCRUD:
             query = {}
         query.update({"_id": ObjectId(_id)})
         query = self.replace_special_chars(value=query)
-        result = await self.collection.find_one(filter=query, projection=fields_limit)
+        result = await self.collection.find_one(filter=query, projection=fields_limit, comment=self.get_comment())
         if not result:
             return None
         result = await self.convert_object_id_to_string(document=result)
         return result
 
+    @timed("db")
     async def get_by_field(self, data: str, field_name: str, fields_limit: list = None, query: dict = None) -> list | None:
         """
         Retrieves a document from the collection based on a specific field value, with optional field limitations and additional query.
@@ -276,15 +333,45 @@ class BaseCRUD:
             query = {}
         query.update({field_name: data})
         query = self.replace_special_chars(value=query)
-        documents = self.collection.find(filter=query, projection=fields_limit)
+        documents = await self.collection.find(filter=query, projection=fields_limit, comment=self.get_comment())
         results = []
-        async for document in documents:
+        for document in documents:
             document = await self.convert_object_id_to_string(document=document)
             results.append(document)
         return results if results else None
 
+    @timed("db")
+    async def get_range(self, query: dict, sort_by: list[tuple[str, int]], limit: int, fields_limit: list | str = None) -> list[dict]:
+        """
+        Retrieves the first documents of a query in an order, without counting them (e.g. a cursor based scan).
+
+        Args:
+            query (dict): The filter, used as is.
+            sort_by (list[tuple[str, int]]): The sort, which should be served by an index.
+            limit (int): The maximum number of documents.
+            fields_limit (list | str, optional): Fields to include in the documents. Defaults to None.
+
+        Returns:
+            list[dict]: The documents, with their ids as strings.
+        """
+        fields_limit = await self.build_field_projection(fields_limit=fields_limit)
+        documents = await self.collection.find(filter=query, projection=fields_limit, sort=sort_by, limit=limit, comment=self.get_comment())
+        return [await self.convert_object_id_to_string(document=document) for document in documents]
+
+    @timed("db")
     async def get_all(
-        self, query: dict = None, search: str = None, search_in: list = None, page: int = None, limit: int = None, fields_limit: list = None, sort_by: str = None, order_by: str = None
+        self,
+        query: dict = None,
+        search: str = None,
+        search_in: list = None,
+        page: int = None,
+        limit: int = None,
+        fields_limit: list = None,
+        sort_by: str | list = None,
+        order_by: str = None,
+        sanitize: bool = True,
+        allow_disk_use: bool = None,
+        count: Callable[[dict], Awaitable[int]] = None,
     ) -> dict:
         """
         Retrieves all documents from the collection based on various query, pagination, sorting, and field limitations.
@@ -297,8 +384,13 @@ class BaseCRUD:
             limit (int, optional): The number of documents per page.
             fields_limit (str, optional): A comma-separated string of field names to include in the results.
                                           If None, all fields are included.
-            sort_by (str, optional): The field name to sort the results by.
+            sort_by (str | list, optional): The field name to sort the results by, or a list of (field, direction) pairs.
             order_by (str, optional): The order to sort the results, either "asc" for ascending or "desc" for descending.
+            sanitize (bool, optional): Escape regex characters and convert "true"/"false" strings in the query values.
+                                       Disable it for queries built from typed values. Defaults to True.
+            allow_disk_use (bool, optional): Let MongoDB write temporary files for sorts exceeding its memory limit. Defaults to the server setting.
+            count (Callable[[dict], Awaitable[int]], optional): Computes the total number of items from the final filter (e.g. from a cache).
+                                                               Defaults to `count_documents`.
 
         Returns:
             dict | None: A dictionary containing the results, total number of items, total pages, and records per page.
@@ -306,16 +398,20 @@ class BaseCRUD:
         # Converts a comma-separated string `fields_limit` into a dictionary where each field is a key with a value of 1.
         # If `fields_limit` is empty or None, an empty dictionary is returned.
         fields_limit = await self.build_field_projection(fields_limit=fields_limit)
-        order_by = -1 if order_by == "desc" else 1
-        sorting = [(sort_by, order_by)] if sort_by else None
+        if isinstance(sort_by, list):
+            sorting = sort_by or None
+        else:
+            order_by = -1 if order_by == "desc" else 1
+            sorting = [(sort_by, order_by)] if sort_by else None
         skip = (page - 1) * limit if page and limit else 0
 
         # Remove common pagination and sorting parameters from the query dictionary
         common_params = {"search", "page", "limit", "fields", "sort_by", "order_by"}
         query = {k: v for k, v in (query or {}).items() if k not in common_params}
-        query = self.replace_special_chars(value=query)
-        # Convert string representations of booleans to actual Boolean values in the query dictionary
-        query = self.convert_bools(value=query)
+        if sanitize:
+            query = self.replace_special_chars(value=query)
+            # Convert string representations of booleans to actual Boolean values in the query dictionary
+            query = self.convert_bools(value=query)
 
         # Support search functionality within the query
         # If the 'search' key exists in the query dictionary, this block initializes or retrieves the '$or' list in the query,
@@ -327,22 +423,19 @@ class BaseCRUD:
             query["$or"] = []
             query["$or"].extend({search_key: {"$regex": f".*{search}.*", "$options": "i"}} for search_key in search_in)
 
-        documents = self.collection.find(filter=query, projection=fields_limit)
-        if sorting:
-            documents = documents.sort(sorting)
-        if skip:
-            documents = documents.skip(skip)
-        if limit:
-            documents = documents.limit(limit)
+        documents = await self.collection.find(filter=query, projection=fields_limit, sort=sorting, skip=skip, limit=limit or 0, allow_disk_use=allow_disk_use, comment=self.get_comment())
 
         result = {}
         result["records_per_page"] = 0
         results = []
-        async for document in documents:
+        for document in documents:
             document = await self.convert_object_id_to_string(document=document)
             results.append(document)
             result["records_per_page"] += 1
-        total_records = await self.collection.count_documents(query)
+        if count is None:
+            total_records = await self.collection.count_documents(filter=query, comment=self.get_comment())
+        else:
+            total_records = await count(query)
         total_pages = math.ceil(total_records / limit) if limit else 1
         result["total_items"] = total_records
         result["total_pages"] = total_pages
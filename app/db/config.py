@@ -1,8 +1,14 @@
+from typing import Literal
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     app_database_name: str
     database_url: str
+    # "memory" keeps the data in the process (tests, benchmarks, local experiments): nothing is persisted
+    database_backend: Literal["mongodb", "memory"] = Field(default="mongodb")
+
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
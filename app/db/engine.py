@@ -1,25 +1,74 @@
+import time
+
 from loguru import logger
+from monitoring.mongo import command_listener, pool_listener
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from .backends.base import StorageBackend
+from .backends.memory import MemoryStorage
+from .backends.mongo import MongoStorage
 from .config import settings
 
 
 class Engine(object):
-    def __init__(self, database_url, database_name) -> None:
-        self.database_driver = AsyncIOMotorClient(database_url)
+    def __init__(self, database_url, database_name, event_listeners: list = None, backend: str = "mongodb") -> None:
+        self.database_name = database_name
+        self.backend = backend
+        self.storages: dict[str, StorageBackend] = {}
+        if backend == "memory":
+            self.database_driver = None
+            self.driver = None
+            return
+        # The listeners receive the command and connection pool events of the driver (used for metrics).
+        self.database_driver = AsyncIOMotorClient(database_url, event_listeners=event_listeners or [])
         self.driver = self.database_driver[database_name]
 
     def get_database(self):
         return self.driver
 
-    def __new__(cls, database_url, database_name: str):
+    def get_storage(self, database_name: str = None) -> StorageBackend:
+        """
+        Returns the storage backend of a database, the default database if no name is given.
+
+        Args:
+            database_name (str, optional): The name of the database. Defaults to the database of the engine.
+
+        Returns:
+            StorageBackend: A Motor backed storage, or an in-memory storage when the engine uses the "memory" backend.
+        """
+        database_name = database_name or self.database_name
+        if database_name not in self.storages:
+            if self.backend == "memory":
+                self.storages[database_name] = MemoryStorage()
+            else:
+                self.storages[database_name] = MongoStorage(database=self.database_driver[database_name])
+        return self.storages[database_name]
+
+    def __new__(cls, database_url, database_name: str, event_listeners: list = None, backend: str = "mongodb"):
         if not hasattr(cls, "instance"):
             cls.instance = super(Engine, cls).__new__(cls)
         return cls.instance
 
+    async def ping(self) -> float:
+        """
+        Sends a `ping` command to the database.
+
+        Returns:
+            float: The round-trip latency in seconds.
+        """
+        start = time.perf_counter()
+        await self.get_storage().ping()
+        return time.perf_counter() - start
+
+    def get_max_pool_size(self) -> int | None:
+        if self.database_driver is None:
+            return None
+        return self.database_driver.options.pool_options.max_pool_size
+
     async def close_connection(self):
         logger.info("Closing database connection")
-        self.database_driver.close
+        if self.database_driver is not None:
+            self.database_driver.close()
 
 
-app_engine = Engine(database_url=settings.database_url, database_name=settings.app_database_name)
+app_engine = Engine(database_url=settings.database_url, database_name=settings.app_database_name, event_listeners=[command_listener, pool_listener], backend=settings.database_backend)
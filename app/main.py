@@ -1,7 +1,12 @@
 import sys
 from contextlib import asynccontextmanager
 
+from auth.config import settings as auth_settings
+from auth.user_table import user_table
 from config import settings
+from core.config import settings as core_settings
+from core.idempotency import idempotency_store
+from core.invalidation import invalidation_bus
 from db.engine import app_engine
 from exceptions import CustomException
 from fastapi import FastAPI, Request, Response
@@ -10,16 +15,41 @@ from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from loguru import logger
+from middlewares.v1.health import LivenessMiddleware
 from middlewares.v1.log import LogMiddleware
+from middlewares.v1.metrics import MetricsMiddleware
+from middlewares.v1.profiling import ProfilingMiddleware
+from middlewares.v1.timing import ServerTimingMiddleware
+from modules.v1.tasks.services import task_services
+from monitoring import metrics
+from monitoring.access_log import access_logger
+from monitoring.config import settings as monitoring_settings
+from monitoring.watchdog import loop_watchdog
 from routers import api_routers
 from users.services import user_services
+from utils import context
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await user_services.ensure_indexes()
+    await task_services.ensure_indexes()
+    await idempotency_store.ensure_indexes()
+    if core_settings.invalidation_bus_enabled:
+        await invalidation_bus.start(storage=app_engine.get_storage())
     # Create default admin user
     await user_services.create_admin()
+    if auth_settings.user_table_enabled:
+        await user_table.start(loader=user_services.get_access_entries)
+    access_logger.start()
+    if monitoring_settings.watchdog_enabled:
+        loop_watchdog.start()
     yield
+    await user_table.stop()
+    await invalidation_bus.stop()
+    await loop_watchdog.stop()
+    access_logger.stop()
+    metrics.mark_process_dead()
     await app_engine.close_connection()
 
 
@@ -41,6 +71,11 @@ app = FastAPI(
 
 
 # Middlewares
+if monitoring_settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+if monitoring_settings.server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(LogMiddleware)
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +84,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so liveness probes skip every other middleware
+app.add_middleware(LivenessMiddleware)
 
 
 # Routers
@@ -56,16 +93,20 @@ app.include_router(api_routers)
 
 # Logger
 logger.remove()
+# Attach the id of the current request to every record, so the log lines of one request can be correlated.
+logger.configure(patcher=lambda record: record["extra"].setdefault("request_id", context.get_request_id() or "-"))
 logger.add(
     sys.stdout,
     colorize=True,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | {level} | <cyan>{name}</cyan>:<cyan>{function}</cyan> | <level>{message}</level>",
+    format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | {level} | {extra[request_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan> | <level>{message}</level>",
 )
 logger.add(
     settings.logs_path,
     colorize=False,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | {level} | <cyan>{name}</cyan>:<cyan>{function}</cyan> | <level>{message}</level>",
+    format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | {level} | {extra[request_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan> | <level>{message}</level>",
     rotation="100 MB",
+    # Write from a background thread so disk I/O never happens on the request path
+    enqueue=True,
 )
 
 
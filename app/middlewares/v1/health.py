@@ -0,0 +1,26 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+LIVENESS_PATH = "/v1/health/live"
+LIVENESS_BODY = b'{"status":"ok"}'
+
+
+class LivenessMiddleware:
+    """
+    Answers the liveness probe before any other middleware, dependency or router runs.
+
+    The probe only tells that the process is serving requests, so it must stay as cheap as possible.
+    The database and the other dependencies are checked by the readiness route `/v1/health/ready`.
+
+    Args:
+        app (ASGIApp): The ASGI application to wrap.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] != LIVENESS_PATH:
+            await self.app(scope, receive, send)
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(LIVENESS_BODY)).encode())]})
+        await send({"type": "http.response.body", "body": LIVENESS_BODY})
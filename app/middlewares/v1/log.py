@@ -1,28 +1,94 @@
+import re
 import sys
 import time
 import traceback
 
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
-from utils import value
+from monitoring.access_log import access_logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils import context, value
 
 from .exceptions import MiddlewareErrorCode
 
+# Incoming request ids are propagated only if they are reasonably short and made of safe characters.
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
 
-class LogMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
 
-    async def dispatch(self, request, call_next):
-        start_time = time.time()
+class LogMiddleware:
+    """
+    A pure ASGI middleware that assigns a request id, measures the processing time and catches unexpected errors.
+
+    Unlike `BaseHTTPMiddleware`, it does not wrap the request in an extra task and memory stream, so streaming
+    responses pass through untouched. The request id is taken from the `X-REQUEST-ID` header when the client sends a valid one,
+    otherwise a new one is generated. It is stored in `utils.context.request_id_context` before the application runs,
+    so every log record and database operation of the request can be correlated with it. Once the request is finished,
+    a structured record is handed to the non-blocking `access_logger`.
+
+    Args:
+        app (ASGIApp): The ASGI application to wrap.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def get_request_id(self, scope: Scope) -> str:
+        for key, header_value in scope["headers"]:
+            if key == b"x-request-id":
+                request_id = header_value.decode("latin-1")
+                if REQUEST_ID_PATTERN.match(request_id):
+                    return request_id
+                break
+        return value.get_uuid()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self.get_request_id(scope=scope)
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = context.request_id_context.set(request_id)
+        start_time = time.perf_counter()
+        response_started = False
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, status
+            if message["type"] == "http.response.start":
+                response_started = True
+                status = message["status"]
+                process_time = time.perf_counter() - start_time
+                headers = MutableHeaders(scope=message)
+                headers.append("X-PROCESS-TIME", f"{process_time:.4f}s")
+                headers.append("X-REQUEST-ID", request_id)
+            await send(message)
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception:
             exc_list = traceback.format_exception(*sys.exc_info())
             exc = "".join(exc_list)
             logger.debug(exc)
-            response = MiddlewareErrorCode.SomeThingWentWrong()
-        process_time = time.time() - start_time
-        response.headers["X-PROCESS-TIME"] = f"{process_time:.4f}s"
-        response.headers["X-REQUEST-ID"] = value.get_uuid()
-        return response
+            # Once the response has started, its status and headers are already sent and can not be replaced.
+            if not response_started:
+                response = MiddlewareErrorCode.SomeThingWentWrong()
+                await response(scope, receive, send_wrapper)
+        finally:
+            context.request_id_context.reset(token)
+            self.log_access(scope=scope, request_id=request_id, status=status, duration_ms=(time.perf_counter() - start_time) * 1000)
+
+    def log_access(self, scope: Scope, request_id: str, status: int, duration_ms: float) -> None:
+        route = scope.get("route")
+        client = scope.get("client")
+        principal = scope["state"].get("principal")
+        access_logger.log(
+            request_id=request_id,
+            method=scope["method"],
+            path=scope["path"],
+            route=getattr(route, "path", None),
+            status=status,
+            duration_ms=duration_ms,
+            client=client[0] if client else None,
+            user_id=principal.user_id if principal else None,
+        )
@@ -0,0 +1,44 @@
+import time
+
+from monitoring import metrics
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class MetricsMiddleware:
+    """
+    A pure ASGI middleware that records the in-flight requests and the latency of every request.
+
+    Latencies are labelled with the route template (e.g. `/v1/tasks/{_id}`) rather than the raw path,
+    so the number of series stays bounded.
+
+    Args:
+        app (ASGIApp): The ASGI application to wrap.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_flight = metrics.REQUESTS_IN_FLIGHT.labels(method=method)
+        in_flight.inc()
+        start_time = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            metrics.REQUEST_LATENCY.labels(method=method, route=route_path, status=status).observe(time.perf_counter() - start_time)
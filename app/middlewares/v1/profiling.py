@@ -0,0 +1,74 @@
+from urllib.parse import parse_qsl, urlencode
+
+from auth.dependencies import resolve_principal
+from config import settings as root_settings
+from loguru import logger
+from monitoring.profiling import request_profiler
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAMETER = "_profile"
+TRUTHY_VALUES = {"1", "true", "yes"}
+
+
+class ProfilingMiddleware:
+    """
+    A pure ASGI middleware that profiles a single request on demand.
+
+    A request is profiled when it carries the `X-PROFILE: 1` header or the `_profile=1` query parameter, and either the
+    environment is dev/test or the caller is an admin. The profile is stored under the request id and can be read from
+    `/v1/diagnostics/profiles/{request_id}`; the id is returned in the `X-PROFILE-ID` response header.
+
+    Requests without the flag only pay for a scan of their headers and query string.
+
+    Args:
+        app (ASGIApp): The ASGI application to wrap.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def is_requested(self, scope: Scope) -> bool:
+        header_requested = None
+        for key, value in scope["headers"]:
+            if key == PROFILE_HEADER:
+                header_requested = value.decode("latin-1").lower() in TRUTHY_VALUES
+                break
+        query_string = scope.get("query_string", b"")
+        if PROFILE_QUERY_PARAMETER.encode() not in query_string:
+            return bool(header_requested)
+        params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+        query_requested = any(key == PROFILE_QUERY_PARAMETER and value.lower() in TRUTHY_VALUES for key, value in params)
+        # The flag must not reach the routers, where it would be taken for a filter, even when the header decides
+        scope["query_string"] = urlencode([(key, value) for key, value in params if key != PROFILE_QUERY_PARAMETER]).encode("latin-1")
+        return query_requested if header_requested is None else header_requested
+
+    async def is_allowed(self, scope: Scope) -> bool:
+        if root_settings.is_development() or root_settings.is_testing():
+            return True
+        principal = await resolve_principal(request=Request(scope))
+        return principal is not None and principal.is_admin()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.is_requested(scope=scope) or not await self.is_allowed(scope=scope):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = scope.setdefault("state", {}).get("request_id")
+        if not request_id or not request_profiler.start():
+            logger.info("A request is already being profiled, skipping profiling")
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-PROFILE-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile = request_profiler.stop(request_id=request_id, method=scope["method"], path=scope["path"])
+            logger.debug(f"Profiled {profile.method} {profile.path} in {profile.duration_ms:.2f}ms")
@@ -0,0 +1,39 @@
+from loguru import logger
+from monitoring.timing import ServerTiming, server_timing_context
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ServerTimingMiddleware:
+    """
+    A pure ASGI middleware that collects the spans of each request and emits them as a `Server-Timing` header.
+
+    The middleware is only installed when `server_timing_enabled` is set; otherwise no collector exists and
+    every span of the application is a no-op.
+
+    Args:
+        app (ASGIApp): The ASGI application to wrap.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = ServerTiming()
+        token = server_timing_context.set(timing)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                header_value = timing.header_value()
+                MutableHeaders(scope=message).append("Server-Timing", header_value)
+                logger.debug(f"Server-Timing {scope['method']} {scope['path']}: {header_value}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            server_timing_context.reset(token)
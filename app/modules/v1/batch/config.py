@@ -0,0 +1,12 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    # Sub-requests of one `POST /v1/batch`: how many are accepted, how many run at the same time, and how long each may take
+    batch_max_requests: int = Field(default=50)
+    batch_concurrency: int = Field(default=8)
+    batch_timeout_seconds: float = Field(default=10.0)
+
+
+settings = Settings()
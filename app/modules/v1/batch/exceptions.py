@@ -0,0 +1,10 @@
+from core.exceptions import CoreErrorCode
+from exceptions import CustomException
+
+
+class BatchErrorCode(CoreErrorCode):
+    @staticmethod
+    def TooManyRequests(max_requests: int):
+        return CustomException(
+            type="batch/info/too-many-requests", status=400, title="Too many requests.", detail=f"A batch may contain at most {max_requests} requests. Please split the batch and try again."
+        )
@@ -0,0 +1,36 @@
+from typing import List
+
+from auth.dependencies import AccessControl
+from core.routing import TimedRoute
+from core.schemas import CommonsDependencies
+from fastapi import Depends, Request
+from fastapi_restful.cbv import cbv
+from fastapi_restful.inferring_router import InferringRouter
+
+from . import schemas
+from .config import settings
+from .exceptions import BatchErrorCode
+from .services import batch_services
+
+router = InferringRouter(
+    prefix="/v1",
+    tags=["v1/batch"],
+    route_class=TimedRoute,
+)
+
+
+@cbv(router)
+class RoutersCBV:
+    commons: CommonsDependencies = Depends(CommonsDependencies)  # type: ignore
+
+    @router.post("/batch", status_code=200, responses={200: {"model": List[schemas.BatchResponse], "description": "Execute batch success"}}, dependencies=[Depends(AccessControl())])
+    async def execute(self, request: Request, data: List[schemas.BatchRequest]):
+        """
+        Executes several API requests in one call, e.g. the requests of a page load, and returns their responses in the same order.
+
+        The requests run concurrently with the credentials of the batch; each one has its own status and may fail independently.
+        Streaming routes (e.g. `/v1/tasks/events`) are not supported and time out.
+        """
+        if len(data) > settings.batch_max_requests:
+            raise BatchErrorCode.TooManyRequests(max_requests=settings.batch_max_requests)
+        return await batch_services.execute(request=request, items=data)
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class BatchRequest(BaseModel):
+    id: Optional[str] = Field(default=None, description="Echoed in the response, to correlate the responses with the requests.")
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(description="The path of an API route with its query string, e.g. `/v1/tasks?limit=5`.")
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Optional[Any] = None
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, path: str) -> str:
+        if not path.startswith("/v1/") or path.split("?")[0].rstrip("/") == "/v1/batch":
+            raise ValueError("The path must be an API route under /v1 other than /v1/batch")
+        return path
+
+
+class BatchResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+from fastapi import Request
+from loguru import logger
+from starlette.middleware.exceptions import ExceptionMiddleware
+
+from . import schemas
+from .config import settings
+
+# Hop-by-hop and body headers of the batch, which do not apply to its sub-requests
+EXCLUDED_HEADERS = {"content-length", "content-type", "transfer-encoding", "connection", "idempotency-key"}
+
+
+class BatchServices:
+    """
+    Runs the sub-requests of a batch in-process, through the routers of the application.
+
+    Each sub-request is dispatched to the router of the application with its own ASGI scope, so it goes through the same
+    validation, access control, routes and exception handlers as a standalone request, without a new HTTP round trip nor the
+    middlewares. The sub-requests inherit the headers and the request-scoped state of the batch, in particular the principal
+    resolved when the batch was authorized, so the bearer token is verified once for the whole batch.
+
+    Args:
+        concurrency (int): The maximum number of sub-requests of a batch running at the same time.
+        timeout (float): The maximum duration of a sub-request in seconds, after which it is answered with a 504.
+    """
+
+    def __init__(self, concurrency: int, timeout: float) -> None:
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def build_scope(self, request: Request, item: schemas.BatchRequest, body: bytes) -> dict:
+        path, _, query_string = item.path.partition("?")
+        headers = {key.lower(): value for key, value in request.headers.items() if key.lower() not in EXCLUDED_HEADERS}
+        headers.update({key.lower(): value for key, value in item.headers.items()})
+        if body:
+            headers["content-type"] = "application/json"
+            headers["content-length"] = str(len(body))
+        scope = {key: value for key, value in request.scope.items() if key not in ("route", "endpoint", "path_params")}
+        scope.update(
+            method=item.method,
+            path=path,
+            raw_path=path.encode(),
+            query_string=query_string.encode(),
+            headers=[(key.encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()],
+            # A copy per sub-request: the principal is shared, the flags set by each route are not
+            state=dict(request.scope.get("state", {})),
+        )
+        return scope
+
+    async def dispatch(self, request: Request, item: schemas.BatchRequest) -> schemas.BatchResponse:
+        body = json.dumps(item.body).encode() if item.body is not None else b""
+        scope = self.build_scope(request=request, item=item, body=body)
+        response = {"status": 500, "headers": {}, "body": bytearray()}
+        received = False
+
+        async def receive() -> dict:
+            nonlocal received
+            if received:
+                # The sub-request has no connection to lose
+                await asyncio.Event().wait()
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {key.decode("latin-1"): value.decode("latin-1") for key, value in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+
+        # The exception handlers of the application, including the 404 and 405 of the router itself
+        app = ExceptionMiddleware(request.app.router, handlers=request.app.exception_handlers)
+        try:
+            await asyncio.wait_for(app(scope, receive, send), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return schemas.BatchResponse(id=item.id, status=504, headers={}, body=None)
+        except Exception:
+            logger.exception(f"Batch sub-request {item.method} {item.path} failed")
+            return schemas.BatchResponse(id=item.id, status=500, headers={}, body=None)
+        return schemas.BatchResponse(id=item.id, status=response["status"], headers=response["headers"], body=self.decode_body(response=response))
+
+    def decode_body(self, response: dict) -> object:
+        content = bytes(response["body"])
+        if not content:
+            return None
+        if response["headers"].get("content-type", "").startswith("application/json"):
+            return json.loads(content)
+        return content.decode(errors="replace")
+
+    async def execute(self, request: Request, items: list[schemas.BatchRequest]) -> list[schemas.BatchResponse]:
+        """
+        Runs the sub-requests of a batch concurrently, at most `concurrency` at a time.
+
+        Args:
+            request (Request): The batch request, already authorized.
+            items (list[schemas.BatchRequest]): The sub-requests.
+
+        Returns:
+            list[schemas.BatchResponse]: The responses, in the order of the sub-requests.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(item: schemas.BatchRequest) -> schemas.BatchResponse:
+            async with semaphore:
+                return await self.dispatch(request=request, item=item)
+
+        return await asyncio.gather(*[run(item) for item in items])
+
+
+batch_services = BatchServices(concurrency=settings.batch_concurrency, timeout=settings.batch_timeout_seconds)
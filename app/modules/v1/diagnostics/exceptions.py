@@ -0,0 +1,16 @@
+from core.exceptions import CoreErrorCode
+from exceptions import CustomException
+
+
+class DiagnosticsErrorCode(CoreErrorCode):
+    @staticmethod
+    def ProfileNotFound(request_id: str):
+        return CustomException(type="diagnostics/warning/profile-not-found", status=404, title="Profile not found.", detail=f"No profile has been stored for the request {request_id}.")
+
+    @staticmethod
+    def SnapshotNotFound(snapshot_id: str):
+        return CustomException(type="diagnostics/warning/snapshot-not-found", status=404, title="Snapshot not found.", detail=f"No memory snapshot has been stored with the id {snapshot_id}.")
+
+    @staticmethod
+    def TracingNotStarted():
+        return CustomException(type="diagnostics/info/tracing-not-started", status=400, title="Tracing not started.", detail="Memory tracing must be started before taking a snapshot.")
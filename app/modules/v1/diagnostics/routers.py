@@ -0,0 +1,111 @@
+from typing import Dict, List
+
+from auth.dependencies import AccessControl
+from core.routing import TimedRoute
+from core.schemas import CommonsDependencies
+from fastapi import Depends, Query
+from fastapi.responses import PlainTextResponse
+from fastapi_restful.cbv import cbv
+from fastapi_restful.inferring_router import InferringRouter
+from monitoring import memory
+from monitoring.memory import memory_tracer
+from monitoring.profiling import request_profiler
+from monitoring.watchdog import loop_watchdog
+
+from . import schemas
+from .exceptions import DiagnosticsErrorCode
+
+router = InferringRouter(
+    prefix="/v1/diagnostics",
+    tags=["v1/diagnostics"],
+    route_class=TimedRoute,
+    dependencies=[Depends(AccessControl(admin=True))],
+)
+
+
+@cbv(router)
+class RoutersCBV:
+    """
+    Admin-only diagnostics of the current worker process.
+
+    Profiles are recorded by `ProfilingMiddleware` when a request carries the `X-PROFILE: 1` header or the `_profile=1` query parameter.
+    Memory tracing and snapshots are per worker process: with several workers, successive calls may reach different workers.
+    """
+
+    commons: CommonsDependencies = Depends(CommonsDependencies)  # type: ignore
+
+    @router.get("/profiles", status_code=200, responses={200: {"model": List[schemas.ProfileSummary], "description": "Get profiles success"}})
+    async def get_profiles(self):
+        return [schemas.ProfileSummary.model_validate(profile.summary()) for profile in request_profiler.get_all()]
+
+    @router.get("/profiles/{request_id}", status_code=200, responses={200: {"model": schemas.ProfileResponse, "description": "Get profile success"}})
+    async def get_profile(self, request_id: str):
+        profile = request_profiler.get(request_id=request_id)
+        if not profile:
+            raise DiagnosticsErrorCode.ProfileNotFound(request_id=request_id)
+        return schemas.ProfileResponse.model_validate(profile.to_dict())
+
+    @router.get("/profiles/{request_id}/folded", status_code=200, response_class=PlainTextResponse)
+    async def get_profile_folded_stacks(self, request_id: str):
+        """Returns the wall-clock samples as folded stacks, ready for flamegraph.pl or speedscope."""
+        profile = request_profiler.get(request_id=request_id)
+        if not profile:
+            raise DiagnosticsErrorCode.ProfileNotFound(request_id=request_id)
+        return PlainTextResponse(profile.folded_stacks)
+
+    @router.get("/event-loop", status_code=200, responses={200: {"model": schemas.EventLoopResponse, "description": "Get event loop lag success"}})
+    async def get_event_loop(self):
+        return schemas.EventLoopResponse.model_validate(loop_watchdog.stats())
+
+    @router.get("/memory", status_code=200, responses={200: {"model": schemas.MemoryResponse, "description": "Get memory usage success"}})
+    async def get_memory(self):
+        return schemas.MemoryResponse.model_validate(memory.get_process_memory())
+
+    @router.get("/memory/objects", status_code=200, responses={200: {"model": Dict[str, int], "description": "Get model instance counts success"}})
+    async def get_model_instances(self):
+        return memory.count_model_instances()
+
+    @router.get("/memory/tracing", status_code=200, responses={200: {"model": schemas.TracingResponse, "description": "Get tracing status success"}})
+    async def get_tracing(self):
+        return schemas.TracingResponse.model_validate(memory_tracer.status())
+
+    @router.post("/memory/tracing/start", status_code=200, responses={200: {"model": schemas.TracingResponse, "description": "Start tracing success"}})
+    async def start_tracing(self, data: schemas.StartTracingRequest):
+        memory_tracer.start(frames=data.frames)
+        return schemas.TracingResponse.model_validate(memory_tracer.status())
+
+    @router.post("/memory/tracing/stop", status_code=200, responses={200: {"model": schemas.TracingResponse, "description": "Stop tracing success"}})
+    async def stop_tracing(self):
+        memory_tracer.stop()
+        return schemas.TracingResponse.model_validate(memory_tracer.status())
+
+    @router.post("/memory/snapshots", status_code=201, responses={201: {"model": schemas.SnapshotSummary, "description": "Take snapshot success"}})
+    async def take_snapshot(self):
+        if not memory_tracer.is_tracing():
+            raise DiagnosticsErrorCode.TracingNotStarted()
+        snapshot_id = memory_tracer.take_snapshot()
+        created_at, _ = memory_tracer.snapshots[snapshot_id]
+        return schemas.SnapshotSummary(snapshot_id=snapshot_id, created_at=created_at)
+
+    @router.get("/memory/snapshots/{snapshot_id}", status_code=200, responses={200: {"model": schemas.SnapshotResponse, "description": "Get snapshot success"}})
+    async def get_snapshot(self, snapshot_id: str, group_by: schemas.GroupBy = "lineno", limit: int = Query(default=50, gt=0, le=1000)):
+        snapshot = memory_tracer.get_snapshot(snapshot_id=snapshot_id)
+        if not snapshot:
+            raise DiagnosticsErrorCode.SnapshotNotFound(snapshot_id=snapshot_id)
+        statistics = memory_tracer.top(snapshot=snapshot, group_by=group_by, limit=limit)
+        return schemas.SnapshotResponse(snapshot_id=snapshot_id, group_by=group_by, statistics=statistics)
+
+    @router.get(
+        "/memory/snapshots/{old_snapshot_id}/diff/{new_snapshot_id}",
+        status_code=200,
+        responses={200: {"model": schemas.SnapshotDiffResponse, "description": "Compare snapshots success"}},
+    )
+    async def compare_snapshots(self, old_snapshot_id: str, new_snapshot_id: str, group_by: schemas.GroupBy = "lineno", limit: int = Query(default=50, gt=0, le=1000)):
+        old_snapshot = memory_tracer.get_snapshot(snapshot_id=old_snapshot_id)
+        if not old_snapshot:
+            raise DiagnosticsErrorCode.SnapshotNotFound(snapshot_id=old_snapshot_id)
+        new_snapshot = memory_tracer.get_snapshot(snapshot_id=new_snapshot_id)
+        if not new_snapshot:
+            raise DiagnosticsErrorCode.SnapshotNotFound(snapshot_id=new_snapshot_id)
+        statistics = memory_tracer.compare(old=old_snapshot, new=new_snapshot, group_by=group_by, limit=limit)
+        return schemas.SnapshotDiffResponse(old_snapshot_id=old_snapshot_id, new_snapshot_id=new_snapshot_id, group_by=group_by, statistics=statistics)
@@ -0,0 +1,92 @@
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfileSummary(BaseModel):
+    request_id: str
+    method: str
+    path: str
+    created_at: float
+    duration_ms: float
+
+
+class ProfileFunction(BaseModel):
+    function: str
+    calls: int
+    primitive_calls: int
+    total_time_ms: float
+    cumulative_time_ms: float
+    callers: List[str]
+
+
+class ProfileResponse(ProfileSummary):
+    functions: List[ProfileFunction]
+    folded_stacks: str
+
+
+class EventLoopResponse(BaseModel):
+    running: bool
+    samples: int
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+    blocked_count: int
+
+
+class StartTracingRequest(BaseModel):
+    frames: int = Field(default=1, gt=0, le=100)
+
+
+class SnapshotSummary(BaseModel):
+    snapshot_id: str
+    created_at: float
+
+
+class TracingResponse(BaseModel):
+    tracing: bool
+    frames: int
+    traced_memory: int
+    traced_memory_peak: int
+    snapshots: List[SnapshotSummary]
+
+
+class AllocationStat(BaseModel):
+    location: str
+    size: int
+    count: int
+
+
+class AllocationDiff(AllocationStat):
+    size_diff: int
+    count_diff: int
+
+
+class SnapshotResponse(BaseModel):
+    snapshot_id: str
+    group_by: str
+    statistics: List[AllocationStat]
+
+
+class SnapshotDiffResponse(BaseModel):
+    old_snapshot_id: str
+    new_snapshot_id: str
+    group_by: str
+    statistics: List[AllocationDiff]
+
+
+class GarbageCollector(BaseModel):
+    counts: List[int]
+    thresholds: List[int]
+    generations: List[Dict[str, int]]
+    tracked_objects: int
+
+
+class MemoryResponse(BaseModel):
+    rss: Optional[int] = None
+    rss_peak: Optional[int] = None
+    gc: GarbageCollector
+
+
+GroupBy = Literal["lineno", "filename", "traceback"]
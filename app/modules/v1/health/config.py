@@ -0,0 +1,11 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    # Readiness results are shared by all probes during this interval, so probes can not amplify the load on the database.
+    readiness_cache_seconds: float = Field(default=2.0)
+    readiness_timeout: float = Field(default=1.0)
+
+
+settings = Settings()
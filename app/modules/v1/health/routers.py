@@ -1,20 +1,35 @@
-from auth.decoractor import access_control
+from auth.dependencies import AccessControl
+from core.routing import TimedRoute
 from core.schemas import CommonsDependencies
 from fastapi import Depends
+from fastapi.responses import JSONResponse
 from fastapi_restful.cbv import cbv
 from fastapi_restful.inferring_router import InferringRouter
 
+from .services import health_services
+
 router = InferringRouter(
     prefix="/v1/health",
     tags=["v1/health"],
+    route_class=TimedRoute,
 )
 
 
 @cbv(router)
 class RoutersCBV:
+    """
+    Health checks of the application.
+
+    The liveness probe `/v1/health/live` is answered by `LivenessMiddleware` before reaching the routers.
+    """
+
     commons: CommonsDependencies = Depends(CommonsDependencies)  # type: ignore
 
-    @router.get("/ping")
-    @access_control(public=True)
+    @router.get("/ping", dependencies=[Depends(AccessControl(public=True))])
     async def health_check(self):
         return {"ping": "pong!"}
+
+    @router.get("/ready", dependencies=[Depends(AccessControl(public=True))])
+    async def readiness_check(self):
+        result = await health_services.check_readiness()
+        return JSONResponse(status_code=200 if result["ready"] else 503, content=result)
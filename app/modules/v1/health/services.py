@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+from db.engine import Engine, app_engine
+from loguru import logger
+from monitoring import metrics
+from monitoring.mongo import PoolMetricsListener, pool_listener
+from monitoring.watchdog import LoopWatchdog, loop_watchdog
+
+from .config import settings
+
+
+class HealthServices:
+    """
+    Checks whether the application is ready to serve traffic.
+
+    The result of a check is cached for `cache_seconds` and concurrent probes wait for the check in progress
+    instead of starting their own, so the database receives at most one ping per interval.
+
+    Args:
+        engine (Engine): The database engine to ping.
+        pool (PoolMetricsListener): The listener tracking the connection pool occupancy.
+        watchdog (LoopWatchdog): The event loop watchdog.
+        cache_seconds (float): The number of seconds a result is reused.
+        timeout (float): The maximum number of seconds to wait for the database.
+    """
+
+    def __init__(self, engine: Engine, pool: PoolMetricsListener, watchdog: LoopWatchdog, cache_seconds: float, timeout: float) -> None:
+        self.engine = engine
+        self.pool = pool
+        self.watchdog = watchdog
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self._result: dict | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds
+
+    async def check_readiness(self) -> dict:
+        if self._is_fresh():
+            return self._result
+        async with self._lock:
+            if not self._is_fresh():
+                self._result = await self._check()
+                self._checked_at = time.monotonic()
+        return self._result
+
+    async def _check_database(self) -> dict:
+        try:
+            latency = await asyncio.wait_for(self.engine.ping(), timeout=self.timeout)
+            return {"status": "ok", "latency_ms": round(latency * 1000, 3)}
+        except Exception as exc:
+            logger.warning(f"Readiness check of the database failed: {exc!r}")
+            return {"status": "unavailable", "latency_ms": None}
+
+    async def _check(self) -> dict:
+        database = await self._check_database()
+        max_pool_size = self.engine.get_max_pool_size()
+        return {
+            "ready": database["status"] == "ok",
+            "checked_at": time.time(),
+            "database": database,
+            "connection_pool": {
+                "checked_out": self.pool.checked_out,
+                "open": self.pool.total_connections,
+                "max_size": max_pool_size,
+                "occupancy": round(self.pool.checked_out / max_pool_size, 3) if max_pool_size else None,
+            },
+            "event_loop": self.watchdog.stats(),
+            "cache_hit_ratios": metrics.get_cache_hit_ratios(),
+        }
+
+
+health_services = HealthServices(engine=app_engine, pool=pool_listener, watchdog=loop_watchdog, cache_seconds=settings.readiness_cache_seconds, timeout=settings.readiness_timeout)
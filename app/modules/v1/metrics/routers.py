@@ -0,0 +1,23 @@
+from auth.dependencies import AccessControl
+from core.routing import TimedRoute
+from core.schemas import CommonsDependencies
+from fastapi import Depends, Response
+from fastapi_restful.cbv import cbv
+from fastapi_restful.inferring_router import InferringRouter
+from monitoring import metrics
+
+router = InferringRouter(
+    prefix="/v1",
+    tags=["v1/metrics"],
+    route_class=TimedRoute,
+)
+
+
+@cbv(router)
+class RoutersCBV:
+    commons: CommonsDependencies = Depends(CommonsDependencies)  # type: ignore
+
+    @router.get("/metrics", status_code=200, response_class=Response, dependencies=[Depends(AccessControl(admin=True))])
+    async def get_metrics(self):
+        content, media_type = metrics.render()
+        return Response(content=content, media_type=media_type)
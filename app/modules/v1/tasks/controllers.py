@@ -1,5 +1,11 @@
+from typing import AsyncIterator, Awaitable, Callable
+
+from core.config import settings
 from core.controllers import BaseControllers
+from core.events import change_bus
+from core.exceptions import CoreErrorCode
 from core.schemas import CommonsDependencies
+from core.sync import get_change_action
 
 from . import schemas
 from .models import Tasks
@@ -13,6 +19,58 @@ class TaskControllers(BaseControllers[TaskServices]):
     async def create(self, data: schemas.CreateRequest, commons: CommonsDependencies) -> Tasks:
         return await self.service.create(data=data, commons=commons)
 
+    async def create_many(self, data: schemas.BulkCreateRequest, commons: CommonsDependencies) -> schemas.BulkResponse:
+        if len(data.tasks) > settings.bulk_max_items:
+            raise CoreErrorCode.TooManyItems(max_items=settings.bulk_max_items)
+        tasks = await self.service.create_many(data=data.tasks, commons=commons)
+        return schemas.BulkResponse(results=[self.build_bulk_result(task=task, status=201) for task in tasks])
+
+    async def edit_status_many(self, data: schemas.BulkEditRequest, commons: CommonsDependencies) -> schemas.BulkResponse:
+        tasks = await self.service.edit_status_many(status=data.status, ids=data.ids, filters=data.filters, commons=commons)
+        return self.build_bulk_response(tasks=tasks, status=200, ids=data.ids)
+
+    async def soft_delete_many(self, data: schemas.BulkSelection, commons: CommonsDependencies) -> schemas.BulkResponse:
+        tasks = await self.service.soft_delete_many(ids=data.ids, filters=data.filters, commons=commons)
+        return self.build_bulk_response(tasks=tasks, status=204, ids=data.ids, include_task=False)
+
+    def build_bulk_result(self, task: Tasks, status: int, include_task: bool = True) -> schemas.BulkResult:
+        return schemas.BulkResult(id=task.id, status=status, task=schemas.Response.model_validate(obj=task, from_attributes=True) if include_task else None)
+
+    def build_bulk_response(self, tasks: list[Tasks], status: int, ids: list[str] = None, include_task: bool = True) -> schemas.BulkResponse:
+        """Builds the result of every selected task; with a list of ids, the ids that were not found (or not owned) get a 404."""
+        if not ids:
+            return schemas.BulkResponse(results=[self.build_bulk_result(task=task, status=status, include_task=include_task) for task in tasks])
+        tasks_by_id = {task.id: task for task in tasks}
+        results = []
+        for _id in dict.fromkeys(ids):
+            task = tasks_by_id.get(_id)
+            results.append(self.build_bulk_result(task=task, status=status, include_task=include_task) if task else schemas.BulkResult(id=_id, status=404))
+        return schemas.BulkResponse(results=results)
+
+    async def get_changes(self, since: str = None, limit: int = 100, commons: CommonsDependencies = None) -> schemas.ChangesResponse:
+        results = await self.service.get_changes(since=since, limit=limit, commons=commons)
+        changes = []
+        for task in results["results"]:
+            action = get_change_action(task)
+            if action == "deleted":
+                changes.append(schemas.Change(id=task.id, action=action, updated_at=task.updated_at))
+                continue
+            changes.append(schemas.Change(id=task.id, action=action, updated_at=task.updated_at, task=schemas.Response.model_validate(obj=task, from_attributes=True)))
+        return schemas.ChangesResponse(changes=changes, next_token=results["next_token"], has_more=results["has_more"])
+
+    def stream_changes(self, last_event_id: str = None, is_disconnected: Callable[[], Awaitable[bool]] = None, commons: CommonsDependencies = None) -> AsyncIterator[str]:
+        async def replay(token: str) -> dict:
+            return await self.service.get_changes(since=token, limit=settings.sync_max_limit, settle_seconds=0, commons=commons)
+
+        return change_bus.stream(
+            collection=self.service.crud.collection_name,
+            owner=None if commons.is_admin() else commons.current_user,
+            serialize=lambda task: schemas.Response.model_validate(obj=task, from_attributes=True),
+            last_event_id=last_event_id,
+            replay=replay,
+            is_disconnected=is_disconnected,
+        )
+
     async def edit(self, _id: str, data: schemas.EditRequest, commons: CommonsDependencies) -> Tasks:
         await self.get_by_id(_id=_id, commons=commons)
         return await self.service.edit(_id=_id, data=data, commons=commons)
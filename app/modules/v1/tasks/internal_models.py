@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from . import schemas
 
@@ -8,3 +8,9 @@ from . import schemas
 class EditWithAudit(schemas.EditRequest):
     updated_at: datetime = Field(default_factory=datetime.now)
     updated_by: str
+
+
+class EditStatusWithAudit(BaseModel):
+    status: str
+    updated_at: datetime = Field(default_factory=datetime.now)
+    updated_by: str
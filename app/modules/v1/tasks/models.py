@@ -12,3 +12,6 @@ class Tasks(BaseModel):
     status: Literal["to_do", "in_progress", "done"]
     created_at: datetime = Field(default_factory=datetime.now)
     created_by: ObjectIdStr
+    updated_at: Optional[datetime] = None
+    updated_by: Optional[ObjectIdStr] = None
+    deleted_at: Optional[datetime] = None
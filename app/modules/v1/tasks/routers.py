@@ -1,6 +1,11 @@
-from auth.decoractor import access_control
+from auth.dependencies import AccessControl
+from core.etag import document_etag, page_etag, response_cache
+from core.idempotency import idempotency_store
+from core.routing import TimedRoute
 from core.schemas import CommonsDependencies, ObjectIdStr, PaginationParams
-from fastapi import Depends
+from core.sync import decode_sync_token
+from fastapi import Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi_restful.cbv import cbv
 from fastapi_restful.inferring_router import InferringRouter
 
@@ -10,6 +15,7 @@ from .controllers import task_controllers
 router = InferringRouter(
     prefix="/v1",
     tags=["v1/tasks"],
+    route_class=TimedRoute,
 )
 
 
@@ -17,46 +23,95 @@ router = InferringRouter(
 class RoutersCBV:
     commons: CommonsDependencies = Depends(CommonsDependencies)  # type: ignore
 
-    @router.get("/tasks", status_code=200, responses={200: {"model": schemas.ListResponse, "description": "Get tasks success"}})
-    @access_control(public=False)
-    async def get_all(self, pagination: PaginationParams = Depends()):
+    @router.get("/tasks", status_code=200, responses={200: {"model": schemas.ListResponse, "description": "Get tasks success"}}, dependencies=[Depends(AccessControl())])
+    async def get_all(self, request: Request, pagination: PaginationParams = Depends()):
         search_in = ["summary"]
         results = await task_controllers.get_all(
-            query=pagination.query,
+            filters=pagination.filters,
             search=pagination.search,
             search_in=search_in,
             page=pagination.page,
             limit=pagination.limit,
             fields_limit=pagination.fields,
-            sort_by=pagination.sort_by,
+            sort_by=pagination.sort,
             order_by=pagination.order_by,
             commons=self.commons,
         )
+        etag = page_etag(page=results, representation=f"tasks:list:{pagination.fields}")
         if pagination.fields:
-            return results
-        return schemas.ListResponse.model_validate(obj=results, from_attributes=True)
+            return response_cache.respond(request=request, etag=etag, serialize=results.dump_projection)
+        return response_cache.respond(request=request, etag=etag, serialize=lambda: schemas.ListResponse.model_validate(obj=results, from_attributes=True))
 
-    @router.get("/tasks/{_id}", status_code=200, responses={200: {"model": schemas.Response, "description": "Get task success"}})
-    @access_control(public=False)
-    async def get_detail(self, _id: ObjectIdStr, fields: str = None):
+    @router.get("/tasks/changes", status_code=200, responses={200: {"model": schemas.ChangesResponse, "description": "Get task changes success"}}, dependencies=[Depends(AccessControl())])
+    async def get_changes(self, since: str = None, limit: int = Query(default=100, gt=0)):
+        """
+        Returns the tasks created, updated or deleted since `since`, the `next_token` of the previous call.
+
+        Without `since`, every active task is returned (an initial sync). Keep calling with the new `next_token` while `has_more` is true.
+        """
+        return await task_controllers.get_changes(since=since, limit=limit, commons=self.commons)
+
+    @router.get("/tasks/events", status_code=200, responses={200: {"content": {"text/event-stream": {}}, "description": "Stream of task changes"}}, dependencies=[Depends(AccessControl())])
+    async def stream_changes(self, request: Request, last_event_id: str = None):
+        """
+        Streams the task changes of the current user as Server-Sent Events (`created`, `updated` and `deleted` events).
+
+        On reconnection, the missed changes are replayed from the `Last-Event-ID` header (or the `last_event_id` query parameter).
+        """
+        last_event_id = request.headers.get("last-event-id") or last_event_id
+        # Validate the id before the response starts, an invalid one is a 400 and not a broken stream
+        if last_event_id:
+            decode_sync_token(token=last_event_id)
+        events = task_controllers.stream_changes(last_event_id=last_event_id, is_disconnected=request.is_disconnected, commons=self.commons)
+        return StreamingResponse(events, media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @router.post("/tasks/bulk", status_code=201, responses={201: {"model": schemas.BulkResponse, "description": "Create tasks success"}}, dependencies=[Depends(AccessControl())])
+    async def create_many(self, data: schemas.BulkCreateRequest):
+        """Creates several tasks with a single insert."""
+        return await task_controllers.create_many(data=data, commons=self.commons)
+
+    @router.patch("/tasks/bulk", status_code=200, responses={200: {"model": schemas.BulkResponse, "description": "Update tasks success"}}, dependencies=[Depends(AccessControl())])
+    async def edit_status_many(self, data: schemas.BulkEditRequest):
+        """
+        Sets the status of the tasks selected by `ids` or by `filters` (the filters of the list endpoint) with a single update.
+
+        Each task gets its own result; with `ids`, the tasks that were not found get a 404.
+        """
+        return await task_controllers.edit_status_many(data=data, commons=self.commons)
+
+    @router.delete("/tasks/bulk", status_code=200, responses={200: {"model": schemas.BulkResponse, "description": "Delete tasks success"}}, dependencies=[Depends(AccessControl())])
+    async def delete_many(self, data: schemas.BulkSelection):
+        """Deletes the tasks selected by `ids` or by `filters` with a single update."""
+        return await task_controllers.soft_delete_many(data=data, commons=self.commons)
+
+    @router.get("/tasks/{_id}", status_code=200, responses={200: {"model": schemas.Response, "description": "Get task success"}}, dependencies=[Depends(AccessControl())])
+    async def get_detail(self, request: Request, _id: ObjectIdStr, fields: str = None):
         result = await task_controllers.get_by_id(_id=_id, fields_limit=fields, commons=self.commons)
+        etag = document_etag(item=result, representation=f"tasks:detail:{fields}")
         if fields:
-            return result
-        return schemas.Response.model_validate(obj=result, from_attributes=True)
-
-    @router.post("/tasks", status_code=201, responses={201: {"model": schemas.Response, "description": "Register task success"}})
-    @access_control(public=False)
-    async def create(self, data: schemas.CreateRequest):
-        result = await task_controllers.create(data=data, commons=self.commons)
-        return schemas.Response.model_validate(obj=result, from_attributes=True)
-
-    @router.put("/tasks/{_id}", status_code=200, responses={200: {"model": schemas.Response, "description": "Update task success"}})
-    @access_control(public=False)
-    async def edit(self, _id: ObjectIdStr, data: schemas.EditRequest):
-        result = await task_controllers.edit(_id=_id, data=data, commons=self.commons)
-        return schemas.Response.model_validate(obj=result, from_attributes=True)
-
-    @router.delete("/tasks/{_id}", status_code=204)
-    @access_control(public=False)
+            return response_cache.respond(request=request, etag=etag, serialize=lambda: result.model_dump(exclude_unset=True))
+        return response_cache.respond(request=request, etag=etag, serialize=lambda: schemas.Response.model_validate(obj=result, from_attributes=True))
+
+    @router.post("/tasks", status_code=201, responses={201: {"model": schemas.Response, "description": "Register task success"}}, dependencies=[Depends(AccessControl())])
+    async def create(self, request: Request, data: schemas.CreateRequest):
+        """
+        Creates a task. Send an `Idempotency-Key` header to retry safely: the retries of the request return the first response.
+        """
+
+        async def execute():
+            result = await task_controllers.create(data=data, commons=self.commons)
+            return schemas.Response.model_validate(obj=result, from_attributes=True)
+
+        return await idempotency_store.respond(request=request, execute=execute, status_code=201)
+
+    @router.put("/tasks/{_id}", status_code=200, responses={200: {"model": schemas.Response, "description": "Update task success"}}, dependencies=[Depends(AccessControl())])
+    async def edit(self, request: Request, _id: ObjectIdStr, data: schemas.EditRequest):
+        async def execute():
+            result = await task_controllers.edit(_id=_id, data=data, commons=self.commons)
+            return schemas.Response.model_validate(obj=result, from_attributes=True)
+
+        return await idempotency_store.respond(request=request, execute=execute)
+
+    @router.delete("/tasks/{_id}", status_code=204, dependencies=[Depends(AccessControl())])
     async def delete(self, _id: ObjectIdStr):
         await task_controllers.soft_delete_by_id(_id=_id, commons=self.commons)
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from core.schemas import ObjectIdStr
+from pydantic import BaseModel, Field
 
 
 class CreateRequest(BaseModel):
@@ -16,6 +17,7 @@ class Response(BaseModel):
     status: str
     created_at: datetime
     created_by: str
+    updated_at: Optional[datetime] = None
 
 
 class ListResponse(BaseModel):
@@ -23,9 +25,46 @@ class ListResponse(BaseModel):
     total_pages: int
     records_per_page: int
     results: List[Response]
+    total_items_exact: bool = True
+
+
+class Change(BaseModel):
+    id: str
+    action: Literal["created", "updated", "deleted"]
+    updated_at: Optional[datetime] = None
+    task: Optional[Response] = None
+
+
+class ChangesResponse(BaseModel):
+    changes: List[Change]
+    next_token: Optional[str] = None
+    has_more: bool
 
 
 class EditRequest(BaseModel):
     summary: Optional[str] = None
     description: Optional[str] = None
     status: Optional[Literal["to_do", "in_progress", "done"]] = None
+
+
+class BulkCreateRequest(BaseModel):
+    tasks: List[CreateRequest] = Field(min_length=1)
+
+
+class BulkSelection(BaseModel):
+    ids: Optional[List[ObjectIdStr]] = Field(default=None, description="The IDs of the tasks.")
+    filters: Optional[Dict[str, str]] = Field(default=None, description='Filters of the list endpoint instead of ids, e.g. `{"status": "to_do"}`.')
+
+
+class BulkEditRequest(BulkSelection):
+    status: Literal["to_do", "in_progress", "done"]
+
+
+class BulkResult(BaseModel):
+    id: str
+    status: int
+    task: Optional[Response] = None
+
+
+class BulkResponse(BaseModel):
+    results: List[BulkResult]
@@ -9,14 +9,38 @@ from .models import Tasks
 
 class TaskServices(BaseServices[Tasks]):
     def __init__(self, crud: BaseCRUD = None):
-        super().__init__(service_name="tasks", crud=crud, model=Tasks)
+        super().__init__(
+            service_name="tasks",
+            crud=crud,
+            model=Tasks,
+            sortable_fields=["id", "summary", "status", "created_at"],
+            indexes=[
+                [("created_by", 1), ("created_at", -1), ("_id", -1)],
+                [("created_by", 1), ("status", 1), ("created_at", -1), ("_id", -1)],
+                [("created_at", -1), ("_id", -1)],
+                [("created_by", 1), ("updated_at", 1), ("_id", 1)],
+                [("updated_at", 1), ("_id", 1)],
+            ],
+            cache_list_results=True,
+            cache_counts=True,
+            count_by_owner=True,
+            publish_changes=True,
+        )
 
     async def create(self, data: schemas.CreateRequest, commons: CommonsDependencies) -> Tasks:
         task = Tasks(summary=data.summary, description=data.description, status="to_do", created_by=commons.current_user)
         return await self.save(data=task)
 
+    async def create_many(self, data: list[schemas.CreateRequest], commons: CommonsDependencies) -> list[Tasks]:
+        tasks = [Tasks(summary=item.summary, description=item.description, status="to_do", created_by=commons.current_user) for item in data]
+        return await self.save_many(data=tasks)
+
+    async def edit_status_many(self, status: str, ids: list[str] = None, filters: dict = None, commons: CommonsDependencies = None) -> list[Tasks]:
+        data = internal_models.EditStatusWithAudit(status=status, updated_by=commons.current_user)
+        return await self.update_many(data=data, ids=ids, filters=filters, commons=commons)
+
     async def edit(self, _id: str, data: schemas.EditRequest, commons: CommonsDependencies) -> Tasks:
-        data = internal_models.EditWithAudit(summary=data.summary, description=data.description, updated_by=commons.current_user)
+        data = internal_models.EditWithAudit(summary=data.summary, description=data.description, status=data.status, updated_by=commons.current_user)
         return await self.update_by_id(_id=_id, data=data)
 
 
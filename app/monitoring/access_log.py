@@ -0,0 +1,225 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+from loguru import logger
+
+from . import metrics
+from .config import settings
+
+
+class AccessLogSampler:
+    """
+    Decides which access log records are kept.
+
+    Requests that failed (status >= 400) or were slower than `slow_request_ms` are always kept,
+    the other requests are kept with a probability of `sample_rate`.
+
+    Args:
+        sample_rate (float): The ratio of successful, fast requests to keep, between 0 and 1.
+        slow_request_ms (float): The duration from which a request is considered slow.
+    """
+
+    __slots__ = ("sample_rate", "slow_request_ms")
+
+    def __init__(self, sample_rate: float, slow_request_ms: float) -> None:
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+
+    def should_keep(self, status: int, duration_ms: float) -> bool:
+        if status >= 400 or duration_ms >= self.slow_request_ms:
+            return True
+        if self.sample_rate >= 1:
+            return True
+        return random.random() < self.sample_rate
+
+
+class AccessLogWriter:
+    """
+    A non-blocking, queue-backed sink that writes JSON lines to a file in batches from a background thread.
+
+    `emit` never blocks the caller: when the queue is full the record is dropped and counted,
+    so a slow disk degrades the access log instead of the request latency.
+
+    Args:
+        path (str): The path of the log file.
+        queue_size (int): The maximum number of records waiting to be written.
+        batch_size (int): The maximum number of records written at once.
+        flush_interval (float): The maximum number of seconds a record waits before being written.
+        rotation_bytes (int): The size from which the log file is rotated.
+
+    Attributes:
+        enqueued (int): The number of records accepted by `emit`.
+        dropped (int): The number of records dropped because the queue was full.
+        written (int): The number of records written to the file.
+        failed (int): The number of records lost because the file could not be written.
+    """
+
+    def __init__(self, path: str, queue_size: int, batch_size: int, flush_interval: float, rotation_bytes: int) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rotation_bytes = rotation_bytes
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._file = None
+
+    def emit(self, record: dict) -> bool:
+        """
+        Queues a record without blocking.
+
+        Returns:
+            bool: True if the record was queued, False if it was dropped because the queue is full.
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            metrics.ACCESS_LOG_DISCARDED.labels(reason="dropped").inc()
+            return False
+        self.enqueued += 1
+        return True
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="access-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stops the writer thread after the queued records have been written."""
+        if not self._thread:
+            return
+        self._stopping.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> dict:
+        return {"enqueued": self.enqueued, "dropped": self.dropped, "written": self.written, "failed": self.failed, "queued": self.queue.qsize()}
+
+    def _next_batch(self) -> list:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch=batch)
+        # Drain what is left in the queue before exiting
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                break
+            self._write(batch=batch)
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        elif self._file.tell() >= self.rotation_bytes:
+            self._file.close()
+            os.replace(self.path, f"{self.path}.{time.strftime('%Y-%m-%d_%H-%M-%S')}")
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _write(self, batch: list) -> None:
+        try:
+            file = self._open()
+            file.write("".join(json.dumps(record, default=str, separators=(",", ":")) + "\n" for record in batch))
+            file.flush()
+            self.written += len(batch)
+        except Exception as exc:
+            self.failed += len(batch)
+            logger.warning(f"Could not write {len(batch)} access log records: {exc}")
+
+
+class AccessLogger:
+    """
+    Builds structured access log records and hands the sampled ones to an `AccessLogWriter`.
+
+    Args:
+        writer (AccessLogWriter): The sink receiving the records.
+        sampler (AccessLogSampler): Decides which records are kept.
+        enabled (bool, optional): Whether access logging is enabled. Defaults to True.
+
+    Attributes:
+        sampled_out (int): The number of records discarded by the sampler.
+    """
+
+    def __init__(self, writer: AccessLogWriter, sampler: AccessLogSampler, enabled: bool = True) -> None:
+        self.writer = writer
+        self.sampler = sampler
+        self.enabled = enabled
+        self.sampled_out = 0
+
+    def log(self, request_id: str, method: str, path: str, route: str | None, status: int, duration_ms: float, client: str | None = None, user_id: str | None = None) -> None:
+        if not self.enabled:
+            return
+        if not self.sampler.should_keep(status=status, duration_ms=duration_ms):
+            self.sampled_out += 1
+            metrics.ACCESS_LOG_DISCARDED.labels(reason="sampled_out").inc()
+            return
+        record = {
+            "time": time.time(),
+            "request_id": request_id,
+            "method": method,
+            "path": path,
+            "route": route,
+            "status": status,
+            "duration_ms": round(duration_ms, 3),
+            "client": client,
+            "user_id": user_id,
+        }
+        self.writer.emit(record=record)
+
+    def start(self) -> None:
+        if self.enabled:
+            self.writer.start()
+
+    def stop(self) -> None:
+        self.writer.stop()
+
+    def stats(self) -> dict:
+        stats = self.writer.stats()
+        stats["sampled_out"] = self.sampled_out
+        return stats
+
+
+access_logger = AccessLogger(
+    writer=AccessLogWriter(
+        path=settings.access_log_path,
+        queue_size=settings.access_log_queue_size,
+        batch_size=settings.access_log_batch_size,
+        flush_interval=settings.access_log_flush_interval,
+        rotation_bytes=settings.access_log_rotation_mb * 1024 * 1024,
+    ),
+    sampler=AccessLogSampler(sample_rate=settings.access_log_sample_rate, slow_request_ms=settings.access_log_slow_request_ms),
+    enabled=settings.access_log_enabled,
+)
@@ -0,0 +1,37 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    # Structured access log
+    access_log_enabled: bool = Field(default=True)
+    access_log_path: str = Field(default="/opt/projects/app/logs/access.jsonl")
+    access_log_queue_size: int = Field(default=10000)
+    access_log_batch_size: int = Field(default=500)
+    access_log_flush_interval: float = Field(default=1.0)
+    access_log_rotation_mb: int = Field(default=100)
+    # Ratio of successful, fast requests that are logged. Errors and slow requests are always logged.
+    access_log_sample_rate: float = Field(default=1.0, ge=0, le=1)
+    access_log_slow_request_ms: float = Field(default=500)
+
+    # Server-Timing header with the auth, router, validate, db and serialize spans of each request
+    server_timing_enabled: bool = Field(default=False)
+
+    # On-demand profiling of single requests (`X-PROFILE: 1` header or `_profile=1` query parameter).
+    # Allowed for everyone in dev/test environments and for admins elsewhere.
+    profiling_enabled: bool = Field(default=True)
+    profiling_max_profiles: int = Field(default=20)
+    profiling_sample_interval: float = Field(default=0.002)
+    profiling_top_functions: int = Field(default=50)
+
+    # Event loop watchdog
+    watchdog_enabled: bool = Field(default=True)
+    watchdog_interval: float = Field(default=0.1)
+    watchdog_block_threshold: float = Field(default=0.25)
+    watchdog_window: int = Field(default=3000)
+
+    # Memory diagnostics
+    memory_max_snapshots: int = Field(default=10)
+
+
+settings = Settings()
@@ -0,0 +1,130 @@
+import gc
+import resource
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+
+from pydantic import BaseModel
+from utils import value
+
+from .config import settings
+
+# Allocations made by tracemalloc itself and by the import machinery are noise for the application.
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryTracer:
+    """
+    Controls `tracemalloc` and keeps the last snapshots of the current process in memory.
+
+    Args:
+        max_snapshots (int): The number of snapshots kept in memory.
+    """
+
+    def __init__(self, max_snapshots: int) -> None:
+        self.max_snapshots = max_snapshots
+        self.snapshots: OrderedDict[str, tuple[float, tracemalloc.Snapshot]] = OrderedDict()
+
+    def is_tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """Stops tracing. The snapshots already taken are kept."""
+        tracemalloc.stop()
+
+    def status(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_memory": current,
+            "traced_memory_peak": peak,
+            "snapshots": [{"snapshot_id": snapshot_id, "created_at": created_at} for snapshot_id, (created_at, _) in self.snapshots.items()],
+        }
+
+    def take_snapshot(self) -> str:
+        """
+        Takes a snapshot of the traced allocations.
+
+        Returns:
+            str: The id of the snapshot.
+
+        Raises:
+            RuntimeError: If tracing has not been started.
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        snapshot_id = value.get_uuid()
+        self.snapshots[snapshot_id] = (time.time(), snapshot)
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+        return snapshot_id
+
+    def get_snapshot(self, snapshot_id: str) -> tracemalloc.Snapshot | None:
+        item = self.snapshots.get(snapshot_id)
+        return item[1] if item else None
+
+    def top(self, snapshot: tracemalloc.Snapshot, group_by: str, limit: int) -> list[dict]:
+        """Returns the locations allocating the most memory in a snapshot, grouped by `filename` or `lineno`."""
+        return [{"location": self._location(stat.traceback), "size": stat.size, "count": stat.count} for stat in snapshot.statistics(group_by)[:limit]]
+
+    def compare(self, old: tracemalloc.Snapshot, new: tracemalloc.Snapshot, group_by: str, limit: int) -> list[dict]:
+        """Returns the locations whose allocations grew (or shrank) the most between two snapshots."""
+        return [
+            {"location": self._location(stat.traceback), "size": stat.size, "size_diff": stat.size_diff, "count": stat.count, "count_diff": stat.count_diff}
+            for stat in new.compare_to(old, group_by)[:limit]
+        ]
+
+    def _location(self, traceback: tracemalloc.Traceback) -> str:
+        frame = traceback[0]
+        return f"{frame.filename}:{frame.lineno}"
+
+
+def count_model_instances() -> dict[str, int]:
+    """
+    Counts the live instances of every Pydantic model (e.g. `Tasks`, `Users`, response schemas).
+
+    It walks every object tracked by the garbage collector, so it costs tens of milliseconds on a large heap.
+
+    Returns:
+        dict[str, int]: The number of instances per model, most frequent first.
+    """
+    # type() instead of isinstance(): isinstance() reads __class__, which lazy proxies may override with side effects (e.g. imports)
+    model_types = (type(obj) for obj in gc.get_objects())
+    counts = Counter(f"{model.__module__}.{model.__qualname__}" for model in model_types if issubclass(model, BaseModel))
+    return dict(counts.most_common())
+
+
+def get_process_memory() -> dict:
+    """
+    Returns:
+        dict: The resident set size (current and peak) of the process in bytes, and the garbage collector statistics.
+    """
+    rss = None
+    rss_peak = None
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    rss_peak = int(line.split()[1]) * 1024
+    except OSError:
+        # Not on Linux: ru_maxrss is the peak RSS (kilobytes on Linux, bytes on macOS)
+        rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "rss": rss,
+        "rss_peak": rss_peak,
+        "gc": {"counts": gc.get_count(), "thresholds": gc.get_threshold(), "generations": gc.get_stats(), "tracked_objects": len(gc.get_objects())},
+    }
+
+
+memory_tracer = MemoryTracer(max_snapshots=settings.memory_max_snapshots)
@@ -0,0 +1,92 @@
+import os
+from collections import defaultdict
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# When several uvicorn workers serve the application, set the `PROMETHEUS_MULTIPROC_DIR` environment variable to an empty,
+# writable directory shared by the workers (and wipe it before the server starts). Each worker then writes its samples
+# to memory-mapped files in that directory and `/v1/metrics` aggregates the files of all workers.
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# -------------------------------- HTTP metrics ------------------------------- #
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Latency of HTTP requests.", ["method", "route", "status"])
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Number of HTTP requests being processed.", ["method"], multiprocess_mode="livesum")
+
+# ------------------------------ Database metrics ----------------------------- #
+DB_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds", "Latency of MongoDB commands.", ["command"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+DB_COMMAND_FAILURES = Counter("mongodb_command_failures", "Number of failed MongoDB commands.", ["command"])
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time spent waiting for a connection from the pool.", buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+)
+DB_POOL_CHECKOUT_FAILURES = Counter("mongodb_pool_checkout_failures", "Number of failed connection checkouts.", ["reason"])
+DB_POOL_CHECKED_OUT = Gauge("mongodb_pool_connections_checked_out", "Number of connections checked out of the pool.", multiprocess_mode="livesum")
+
+# -------------------------------- Cache metrics ------------------------------ #
+CACHE_REQUESTS = Counter("cache_requests", "Number of cache lookups.", ["cache", "result"])
+CACHE_INVALIDATION_EVENTS = Counter("cache_invalidation_events", "Number of cross-worker cache invalidation events.", ["result"])
+CACHE_INVALIDATION_BUS_HEALTHY = Gauge("cache_invalidation_bus_healthy", "Whether the worker follows the invalidations of the other workers.", multiprocess_mode="min")
+
+# ------------------------------ Change stream metrics ------------------------ #
+EVENT_SUBSCRIBERS = Gauge("change_stream_subscribers", "Number of open change streams.", multiprocess_mode="livesum")
+EVENT_SUBSCRIBERS_EVICTED = Counter("change_stream_evicted_subscribers", "Number of change streams closed because the client was too slow.", ["collection"])
+
+# ---------------------------- Event loop metrics ----------------------------- #
+EVENT_LOOP_LAG = Histogram("event_loop_lag_seconds", "Delay of the event loop heartbeat.", buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+EVENT_LOOP_BLOCKED = Counter("event_loop_blocked", "Number of times the event loop was blocked longer than the threshold.")
+
+# ---------------------------- Access log metrics ----------------------------- #
+ACCESS_LOG_DISCARDED = Counter("access_log_discarded_records", "Number of access log records that were not written.", ["reason"])
+
+# Hits and misses of the caches of this process, used to report the hit ratios without parsing the exposition.
+_cache_accesses: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    """
+    Records a cache lookup.
+
+    Args:
+        cache (str): The name of the cache.
+        hit (bool): Whether the lookup was a hit.
+    """
+    _cache_accesses[cache][0 if hit else 1] += 1
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def get_cache_hit_ratios() -> dict[str, float]:
+    """
+    Returns:
+        dict[str, float]: The hit ratio of each cache of this process since it started.
+    """
+    return {cache: hits / (hits + misses) for cache, (hits, misses) in _cache_accesses.items() if hits + misses}
+
+
+def render() -> tuple[bytes, str]:
+    """
+    Renders the metrics in the Prometheus text exposition format.
+
+    Returns:
+        tuple[bytes, str]: The exposition and its content type.
+    """
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Removes the live gauges of this worker from the multiprocess directory when it shuts down."""
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(os.getpid())
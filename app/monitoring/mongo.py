@@ -0,0 +1,74 @@
+from pymongo import monitoring
+
+from . import metrics
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Records the latency and failures of every MongoDB command sent by the driver."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        metrics.DB_COMMAND_LATENCY.labels(command=event.command_name).observe(event.duration_micros / 1_000_000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        metrics.DB_COMMAND_LATENCY.labels(command=event.command_name).observe(event.duration_micros / 1_000_000)
+        metrics.DB_COMMAND_FAILURES.labels(command=event.command_name).inc()
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Records the connection pool checkout wait times and occupancy.
+
+    Attributes:
+        checked_out (int): The number of connections currently checked out by this process.
+        total_connections (int): The number of connections currently open by this process.
+    """
+
+    def __init__(self) -> None:
+        self.checked_out = 0
+        self.total_connections = 0
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        self.total_connections += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        self.total_connections -= 1
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        metrics.DB_POOL_CHECKOUT_FAILURES.labels(reason=str(event.reason)).inc()
+        if event.duration is not None:
+            metrics.DB_POOL_CHECKOUT_WAIT.observe(event.duration)
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        self.checked_out += 1
+        metrics.DB_POOL_CHECKED_OUT.inc()
+        if event.duration is not None:
+            metrics.DB_POOL_CHECKOUT_WAIT.observe(event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        self.checked_out -= 1
+        metrics.DB_POOL_CHECKED_OUT.dec()
+
+
+command_listener = CommandMetricsListener()
+pool_listener = PoolMetricsListener()
@@ -0,0 +1,170 @@
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from .config import settings
+
+
+class WallClockSampler:
+    """
+    Samples the stack of one thread at a fixed interval from a background thread.
+
+    Unlike cProfile, it also sees the time a thread spends blocked (I/O, locks, C extensions such as bcrypt).
+    The samples are aggregated as folded stacks (`root;caller;callee count`), the input format of flame graph tools.
+
+    Args:
+        thread_id (int): The identifier of the thread to sample.
+        interval (float): The number of seconds between two samples.
+        max_depth (int, optional): The maximum number of frames kept per stack. Defaults to 64.
+    """
+
+    def __init__(self, thread_id: int, interval: float, max_depth: int = 64) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="wall-clock-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class RequestProfile:
+    """
+    The profile of one request.
+
+    Attributes:
+        request_id (str): The id of the profiled request.
+        method (str): The HTTP method of the request.
+        path (str): The path of the request.
+        created_at (float): The timestamp of the request.
+        duration_ms (float): The duration of the request.
+        functions (list): The functions with the highest cumulative time, from cProfile.
+        folded_stacks (str): The wall-clock samples as folded stacks.
+    """
+
+    __slots__ = ("request_id", "method", "path", "created_at", "duration_ms", "functions", "folded_stacks")
+
+    def __init__(self, request_id: str, method: str, path: str, duration_ms: float, functions: list, folded_stacks: str) -> None:
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.created_at = time.time()
+        self.duration_ms = duration_ms
+        self.functions = functions
+        self.folded_stacks = folded_stacks
+
+    def summary(self) -> dict:
+        return {"request_id": self.request_id, "method": self.method, "path": self.path, "created_at": self.created_at, "duration_ms": self.duration_ms}
+
+    def to_dict(self) -> dict:
+        result = self.summary()
+        result["functions"] = self.functions
+        result["folded_stacks"] = self.folded_stacks
+        return result
+
+
+class RequestProfiler:
+    """
+    Profiles one request at a time with cProfile and a wall-clock sampler, and keeps the last profiles in memory.
+
+    cProfile profiles the whole event loop thread, so requests running concurrently with the profiled one
+    also appear in its profile. This is why profiling is meant for non-production environments and only one
+    request is profiled at a time.
+
+    Args:
+        max_profiles (int): The number of profiles kept in memory.
+        sample_interval (float): The interval of the wall-clock sampler in seconds.
+        top_functions (int): The number of functions kept from the cProfile statistics.
+    """
+
+    def __init__(self, max_profiles: int, sample_interval: float, top_functions: int) -> None:
+        self.max_profiles = max_profiles
+        self.sample_interval = sample_interval
+        self.top_functions = top_functions
+        self.profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+        self._lock = threading.Lock()
+        self._profiler: cProfile.Profile | None = None
+        self._sampler: WallClockSampler | None = None
+        self._start = 0.0
+
+    def start(self) -> bool:
+        """
+        Starts profiling the current thread.
+
+        Returns:
+            bool: True if profiling started, False if another request is already being profiled.
+        """
+        if not self._lock.acquire(blocking=False):
+            return False
+        self._sampler = WallClockSampler(thread_id=threading.get_ident(), interval=self.sample_interval)
+        self._profiler = cProfile.Profile()
+        self._start = time.perf_counter()
+        self._sampler.start()
+        self._profiler.enable()
+        return True
+
+    def stop(self, request_id: str, method: str, path: str) -> RequestProfile:
+        """Stops profiling and stores the profile under the request id."""
+        try:
+            self._profiler.disable()
+            self._sampler.stop()
+            duration_ms = (time.perf_counter() - self._start) * 1000
+            profile = RequestProfile(request_id=request_id, method=method, path=path, duration_ms=duration_ms, functions=self._top_functions(), folded_stacks=self._sampler.folded())
+        finally:
+            self._profiler = None
+            self._sampler = None
+            self._lock.release()
+        self.profiles[request_id] = profile
+        while len(self.profiles) > self.max_profiles:
+            self.profiles.popitem(last=False)
+        return profile
+
+    def _top_functions(self) -> list:
+        stats = pstats.Stats(self._profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[: self.top_functions]
+        functions = []
+        for (filename, line, name), (primitive_calls, calls, total_time, cumulative_time, callers) in rows:
+            functions.append(
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": calls,
+                    "primitive_calls": primitive_calls,
+                    "total_time_ms": round(total_time * 1000, 3),
+                    "cumulative_time_ms": round(cumulative_time * 1000, 3),
+                    "callers": [f"{caller[0]}:{caller[1]}({caller[2]})" for caller in callers],
+                }
+            )
+        return functions
+
+    def get(self, request_id: str) -> RequestProfile | None:
+        return self.profiles.get(request_id)
+
+    def get_all(self) -> list[RequestProfile]:
+        return list(reversed(self.profiles.values()))
+
+
+request_profiler = RequestProfiler(max_profiles=settings.profiling_max_profiles, sample_interval=settings.profiling_sample_interval, top_functions=settings.profiling_top_functions)
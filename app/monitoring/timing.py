@@ -0,0 +1,139 @@
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Callable
+
+
+class ServerTiming:
+    """
+    Accumulates the duration of named spans during one request.
+
+    Spans with the same name are summed. A span that is re-entered while it is already running in the same task
+    (e.g. `BaseCRUD.save_unique` calling `BaseCRUD.save`) is only counted once; spans running concurrently in other tasks
+    of the request (e.g. the gathered sub-requests of a batch) are all counted.
+
+    Attributes:
+        durations (dict): The accumulated seconds of each span.
+        counts (dict): The number of times each span ran.
+    """
+
+    __slots__ = ("durations", "counts", "start", "endpoint_end")
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.start = time.perf_counter()
+        self.endpoint_end: float | None = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def header_value(self) -> str:
+        """
+        Returns:
+            str: The value of the `Server-Timing` header, e.g. `auth;dur=0.41, db;dur=3.20;desc="2 calls", total;dur=5.02`.
+        """
+        entries = []
+        for name, seconds in self.durations.items():
+            entry = f"{name};dur={seconds * 1000:.2f}"
+            if self.counts[name] > 1:
+                entry += f';desc="{self.counts[name]} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+# The timing of the current request. It is None when Server-Timing is disabled, which makes every span a no-op.
+server_timing_context: ContextVar[ServerTiming | None] = ContextVar("server_timing", default=None)
+# The spans running in the current task: every task gets a copy of the context, so nesting is tracked per task
+active_spans_context: ContextVar[frozenset[str]] = ContextVar("active_spans", default=frozenset())
+
+
+class Span:
+    __slots__ = ("timing", "name", "start", "token")
+
+    def __init__(self, timing: ServerTiming, name: str) -> None:
+        self.timing = timing
+        self.name = name
+        self.start = None
+        self.token = None
+
+    def __enter__(self) -> "Span":
+        active = active_spans_context.get()
+        if self.name not in active:
+            self.token = active_spans_context.set(active | {self.name})
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.start is not None:
+            active_spans_context.reset(self.token)
+            self.timing.add(self.name, time.perf_counter() - self.start)
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.__exit__(*exc_info)
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    async def __aenter__(self) -> "NullSpan":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+def span(name: str) -> Span | NullSpan:
+    """
+    Measures a block of code as a named span of the current request.
+
+    Usage:
+        with span("db"):
+            ...
+
+    Args:
+        name (str): The name of the span, as it appears in the `Server-Timing` header.
+
+    Returns:
+        Span | NullSpan: A context manager (sync or async). When Server-Timing is disabled it is a shared no-op object.
+    """
+    timing = server_timing_context.get()
+    if timing is None:
+        return NULL_SPAN
+    return Span(timing=timing, name=name)
+
+
+def timed(name: str) -> Callable[..., Any]:
+    """
+    Decorates a coroutine function so each call is measured as a named span of the current request.
+
+    Args:
+        name (str): The name of the span.
+    """
+
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            timing = server_timing_context.get()
+            if timing is None:
+                return await function(*args, **kwargs)
+            with Span(timing=timing, name=name):
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
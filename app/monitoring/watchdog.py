@@ -0,0 +1,130 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from loguru import logger
+from utils.context import request_id_context
+
+from . import metrics
+from .config import settings
+
+
+class LoopWatchdog:
+    """
+    Measures the event loop lag continuously and reports callbacks that block the loop.
+
+    A heartbeat task sleeps for `interval` seconds and records how late it wakes up (the lag).
+    A watcher thread checks that the heartbeat keeps ticking; when the loop has not ticked for more than
+    `block_threshold` seconds, it captures the stack of the event loop thread together with the running task
+    and the id of the request it belongs to, and logs them once per stall.
+
+    Args:
+        interval (float): The number of seconds between two heartbeats.
+        block_threshold (float): The number of seconds without heartbeat after which the loop is considered blocked.
+        window (int): The number of lag samples kept to compute the percentiles.
+
+    Attributes:
+        blocked_count (int): The number of stalls detected since the watchdog started.
+    """
+
+    def __init__(self, interval: float, block_threshold: float, window: int) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.lags: deque[float] = deque(maxlen=window)
+        self.blocked_count = 0
+        self.last_tick = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._watcher: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        if self._heartbeat_task:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self._stopping.clear()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat(), name="loop-watchdog")
+        self._watcher = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watcher.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._watcher:
+            self._watcher.join()
+            self._watcher = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self.lags.append(lag)
+            self.last_tick = time.monotonic()
+            metrics.EVENT_LOOP_LAG.observe(lag)
+
+    def _watch(self) -> None:
+        reported_tick = None
+        while not self._stopping.wait(self.block_threshold / 2):
+            last_tick = self.last_tick
+            blocked_for = time.monotonic() - last_tick - self.interval
+            if blocked_for < self.block_threshold or reported_tick == last_tick:
+                continue
+            # Report each stall only once, when it crosses the threshold
+            reported_tick = last_tick
+            self.blocked_count += 1
+            metrics.EVENT_LOOP_BLOCKED.inc()
+            self._report(blocked_for=blocked_for)
+
+    def _report(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+        task = asyncio.current_task(self._loop)
+        task_name = task.get_name() if task else None
+        request_id = None
+        # Task.get_context() is available from Python 3.12
+        if task and hasattr(task, "get_context"):
+            request_id = task.get_context().get(request_id_context)
+        logger.bind(request_id=request_id or "-").warning(f"Event loop blocked for {blocked_for * 1000:.0f}ms by task {task_name} (request {request_id}):\n{stack}")
+
+    def percentile(self, percent: float) -> float | None:
+        if not self.lags:
+            return None
+        lags = sorted(self.lags)
+        index = min(int(len(lags) * percent / 100), len(lags) - 1)
+        return lags[index]
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The lag percentiles in milliseconds over the last samples, and the number of detected stalls.
+        """
+
+        def to_ms(seconds: float | None) -> float | None:
+            return round(seconds * 1000, 3) if seconds is not None else None
+
+        return {
+            "running": self._heartbeat_task is not None,
+            "samples": len(self.lags),
+            "p50_ms": to_ms(self.percentile(50)),
+            "p95_ms": to_ms(self.percentile(95)),
+            "p99_ms": to_ms(self.percentile(99)),
+            "max_ms": to_ms(max(self.lags) if self.lags else None),
+            "blocked_count": self.blocked_count,
+        }
+
+
+loop_watchdog = LoopWatchdog(interval=settings.watchdog_interval, block_threshold=settings.watchdog_block_threshold, window=settings.watchdog_window)
@@ -1,6 +1,9 @@
 from auth import routers as auth_routers
 from fastapi import APIRouter
+from modules.v1.batch import routers as batch_routers
+from modules.v1.diagnostics import routers as diagnostics_routers
 from modules.v1.health import routers as health_routers
+from modules.v1.metrics import routers as metrics_routers
 from modules.v1.tasks import routers as tasks_routers
 from users import routers as users_routers
 
@@ -9,9 +12,16 @@ api_routers = APIRouter()
 # Healthy check
 api_routers.include_router(health_routers.router)
 
+# Metrics and diagnostics
+api_routers.include_router(metrics_routers.router)
+api_routers.include_router(diagnostics_routers.router)
+
 # Users
 api_routers.include_router(users_routers.router)
 api_routers.include_router(auth_routers.router)
 
 # Modules
 api_routers.include_router(tasks_routers.router)
+
+# Batch
+api_routers.include_router(batch_routers.router)
@@ -1,6 +1,9 @@
-from auth.decoractor import access_control
+from auth.dependencies import AccessControl
+from core.etag import document_etag, page_etag, response_cache
+from core.idempotency import idempotency_store
+from core.routing import TimedRoute
 from core.schemas import CommonsDependencies, ObjectIdStr, PaginationParams
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi_restful.cbv import cbv
 from fastapi_restful.inferring_router import InferringRouter
 
@@ -10,6 +13,7 @@ from .controllers import user_controllers
 router = InferringRouter(
     prefix="/v1",
     tags=["v1/users"],
+    route_class=TimedRoute,
 )
 
 
@@ -27,52 +31,57 @@ class RoutersCBV:
 
     commons: CommonsDependencies = Depends(CommonsDependencies)  # type: ignore
 
-    @router.get("/users/me", status_code=200, responses={200: {"model": schemas.Response, "description": "Get users success"}})
-    @access_control(public=False)
-    async def get_me(self, fields: str = None):
+    @router.get("/users/me", status_code=200, responses={200: {"model": schemas.Response, "description": "Get users success"}}, dependencies=[Depends(AccessControl())])
+    async def get_me(self, request: Request, fields: str = None):
         result = await user_controllers.get_me(commons=self.commons, fields=fields)
-        return schemas.Response.model_validate(obj=result, from_attributes=True)
+        etag = document_etag(item=result, representation=f"users:me:{fields}")
+        if fields:
+            return response_cache.respond(request=request, etag=etag, serialize=lambda: result.model_dump(exclude_unset=True))
+        return response_cache.respond(request=request, etag=etag, serialize=lambda: schemas.Response.model_validate(obj=result, from_attributes=True))
+
+    @router.put("/users/me", status_code=200, responses={200: {"model": schemas.Response, "description": "Update user success"}}, dependencies=[Depends(AccessControl())])
+    async def edit_me(self, request: Request, data: schemas.EditRequest):
+        async def execute():
+            result = await user_controllers.edit_me(data=data, commons=self.commons)
+            return schemas.Response.model_validate(obj=result, from_attributes=True)
 
-    @router.put("/users/me", status_code=200, responses={200: {"model": schemas.Response, "description": "Update user success"}})
-    @access_control(public=False)
-    async def edit_me(self, data: schemas.EditRequest):
-        result = await user_controllers.edit_me(data=data, commons=self.commons)
-        return schemas.Response.model_validate(obj=result, from_attributes=True)
+        return await idempotency_store.respond(request=request, execute=execute)
 
-    @router.get("/users", status_code=200, responses={200: {"model": schemas.ListResponse, "description": "Get users success"}})
-    @access_control(admin=True, public=False)
-    async def get_all(self, pagination: PaginationParams = Depends()):
+    @router.get("/users", status_code=200, responses={200: {"model": schemas.ListResponse, "description": "Get users success"}}, dependencies=[Depends(AccessControl(admin=True))])
+    async def get_all(self, request: Request, pagination: PaginationParams = Depends()):
         search_in = ["fullname", "email"]
         results = await user_controllers.get_all(
-            query=pagination.query,
+            filters=pagination.filters,
             search=pagination.search,
             search_in=search_in,
             page=pagination.page,
             limit=pagination.limit,
             fields_limit=pagination.fields,
-            sort_by=pagination.sort_by,
+            sort_by=pagination.sort,
             order_by=pagination.order_by,
             commons=self.commons,
         )
+        etag = page_etag(page=results, representation=f"users:list:{pagination.fields}")
         if pagination.fields:
-            return results
-        return schemas.ListResponse.model_validate(obj=results, from_attributes=True)
+            return response_cache.respond(request=request, etag=etag, serialize=results.dump_projection)
+        return response_cache.respond(request=request, etag=etag, serialize=lambda: schemas.ListResponse.model_validate(obj=results, from_attributes=True))
 
-    @router.get("/users/{_id}", status_code=200, responses={200: {"model": schemas.Response, "description": "Get user success"}})
-    @access_control(admin=True, public=False)
-    async def get_detail(self, _id: ObjectIdStr, fields: str = None):
+    @router.get("/users/{_id}", status_code=200, responses={200: {"model": schemas.Response, "description": "Get user success"}}, dependencies=[Depends(AccessControl(admin=True))])
+    async def get_detail(self, request: Request, _id: ObjectIdStr, fields: str = None):
         result = await user_controllers.get_by_id(_id=_id, fields_limit=fields, commons=self.commons)
+        etag = document_etag(item=result, representation=f"users:detail:{fields}")
         if fields:
-            return result
-        return schemas.Response.model_validate(obj=result, from_attributes=True)
+            return response_cache.respond(request=request, etag=etag, serialize=lambda: result.model_dump(exclude_unset=True))
+        return response_cache.respond(request=request, etag=etag, serialize=lambda: schemas.Response.model_validate(obj=result, from_attributes=True))
+
+    @router.put("/users/{_id}", status_code=200, responses={200: {"model": schemas.Response, "description": "Update user success"}}, dependencies=[Depends(AccessControl(admin=True))])
+    async def edit(self, request: Request, _id: ObjectIdStr, data: schemas.EditRequest):
+        async def execute():
+            result = await user_controllers.edit(_id=_id, data=data, commons=self.commons)
+            return schemas.Response.model_validate(obj=result, from_attributes=True)
 
-    @router.put("/users/{_id}", status_code=200, responses={200: {"model": schemas.Response, "description": "Update user success"}})
-    @access_control(admin=True, public=False)
-    async def edit(self, _id: ObjectIdStr, data: schemas.EditRequest):
-        result = await user_controllers.edit(_id=_id, data=data, commons=self.commons)
-        return schemas.Response.model_validate(obj=result, from_attributes=True)
+        return await idempotency_store.respond(request=request, execute=execute)
 
-    @router.delete("/users/{_id}", status_code=204)
-    @access_control(admin=True, public=False)
+    @router.delete("/users/{_id}", status_code=204, dependencies=[Depends(AccessControl(admin=True))])
     async def delete(self, _id: ObjectIdStr):
         await user_controllers.soft_delete_by_id(_id=_id, commons=self.commons)
@@ -20,6 +20,7 @@ class ListResponse(BaseModel):
     total_pages: int
     records_per_page: int
     results: List[Response]
+    total_items_exact: bool = True
 
 
 class LoginResponse(Response):
@@ -1,5 +1,6 @@
 from auth import schemas as auth_schemas
 from auth.services import auth_services
+from auth.user_table import user_table
 from core.schemas import CommonsDependencies
 from core.services import BaseServices
 from db.base import BaseCRUD
@@ -14,7 +15,14 @@ from .models import Users
 
 class UserServices(BaseServices[Users]):
     def __init__(self, crud: BaseCRUD = None):
-        super().__init__(service_name="users", crud=crud, model=Users)
+        super().__init__(
+            service_name="users",
+            crud=crud,
+            model=Users,
+            non_filterable_fields=["password"],
+            sortable_fields=["id", "fullname", "email", "type", "created_at"],
+            indexes=[[("email", 1)], [("created_at", -1), ("_id", -1)]],
+        )
 
     async def get_by_email(self, email: str, ignore_error: bool = False) -> Users:
         results = await self.get_by_field(data=email, field_name="email", ignore_error=ignore_error)
@@ -31,6 +39,7 @@ class UserServices(BaseServices[Users]):
         # Update created_by after register to preserve query ownership logic
         data_update = internal_models.UpdateCreatedBy(created_by=user.id)
         user = await self.update_by_id(_id=user.id, data=data_update)
+        user_table.update(user_id=user.id, user_type=user.type)
         return user
 
     async def login(self, email: str, password: str) -> Users:
@@ -49,7 +58,20 @@ class UserServices(BaseServices[Users]):
 
     async def grant_admin(self, _id: str, commons: CommonsDependencies = None):
         data = internal_models.GrantAdmin(updated_by=commons.current_user if commons else None)
-        return await self.update_by_id(_id=_id, data=data)
+        user = await self.update_by_id(_id=_id, data=data)
+        user_table.update(user_id=user.id, user_type=user.type)
+        return user
+
+    async def soft_delete_by_id(self, _id: str, ignore_error: bool = False, commons: CommonsDependencies = None) -> dict:
+        result = await super().soft_delete_by_id(_id=_id, ignore_error=ignore_error, commons=commons)
+        if result:
+            user_table.update(user_id=result.id, user_type=result.type, deleted=True)
+        return result
+
+    async def get_access_entries(self) -> list[tuple[str, str, bool]]:
+        """Reads the role and status of every user, including the deleted ones, for the shared user table."""
+        documents = await self.crud.get_range(query={}, sort_by=[("_id", 1)], limit=0, fields_limit=["type", "deleted_at"])
+        return [(document["_id"], document.get("type"), document.get("deleted_at") is not None) for document in documents]
 
     async def create_admin(self):
         user = await self.get_by_field(data=settings.default_admin_email, field_name="email", ignore_error=True)
@@ -0,0 +1,13 @@
+from contextvars import ContextVar
+
+# The id of the request currently being processed. It is set by `LogMiddleware` at the entry of every request,
+# so any code running inside the request (loguru records, BaseCRUD operations, ...) can correlate itself to the request.
+request_id_context: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> str | None:
+    """
+    Returns:
+        str | None: The id of the current request, or None when called outside of a request.
+    """
+    return request_id_context.get()
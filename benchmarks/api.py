@@ -0,0 +1,219 @@
+"""
+Drives the real routers (auth, users, tasks) through `httpx.ASGITransport` against a seeded database.
+
+The benchmark seeds synthetic users and tasks (see `benchmarks.workload`) into a dedicated database (dropped at the end), then runs every scenario
+with the requested concurrency and prints throughput and latency percentiles per scenario as JSON.
+Nothing goes over the network except the database connection, so the numbers reflect the middlewares,
+routers, services, `BaseCRUD` and the database round-trips.
+
+It runs against the MongoDB at `database_url` (the `db-test` container, or a local `mongod`), or fully offline
+with the in-memory storage: `database_backend=memory python -m benchmarks.api`.
+
+Usage (from the `app` directory):
+    python -m benchmarks.api --users 200 --tasks-per-user 50 --requests 2000 --concurrency 50
+    python -m benchmarks.api --scenarios list,list_deep --output results.json
+
+Every request of a scenario is expected to succeed: when some return an error status, the scenarios are reported on stderr
+and the run exits with status 1 (the results are still printed), since their numbers do not measure the intended path.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+
+from auth.services import auth_services
+from bson import ObjectId
+from db.config import settings as db_settings
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+from main import app
+from modules.v1.tasks.services import task_crud
+from users.services import user_crud
+
+from . import workload
+from .workload import WORDS, Profile, SyntheticDataset, summarize, use_database
+
+PASSWORD = "benchmark-password"
+
+
+@dataclass
+class Dataset:
+    """The seeded users (with their access tokens) and the ids of their tasks."""
+
+    user_ids: list[str] = field(default_factory=list)
+    emails: list[str] = field(default_factory=list)
+    tokens: dict[str, str] = field(default_factory=dict)
+    task_ids: dict[str, list[str]] = field(default_factory=dict)
+    admin_token: str = None
+
+
+async def seed(profile: Profile) -> Dataset:
+    # bcrypt is deliberately slow: hash the shared password once instead of once per user
+    synthetic = SyntheticDataset(profile=profile, hashed_password=await auth_services.hash(value=PASSWORD))
+    await workload.seed(dataset=synthetic)
+    dataset = Dataset()
+    for index in range(profile.users):
+        user_id = synthetic.user_id(index)
+        dataset.user_ids.append(user_id)
+        dataset.emails.append(synthetic.email(index))
+        dataset.tokens[user_id] = await auth_services.create_access_token(user_id=user_id, user_type="user")
+        # Users without tasks only take part in the scenarios that do not need one
+        task_ids = synthetic.active_task_ids(index)
+        if task_ids:
+            dataset.task_ids[user_id] = task_ids
+    dataset.admin_token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="admin")
+    return dataset
+
+
+def build_scenarios(dataset: Dataset, deep_page: int) -> dict:
+    """
+    Returns the scenarios to run, each a function building a request `(method, url, json, token)` from a random generator.
+    """
+
+    def pick_user(rng: random.Random) -> str:
+        return rng.choice(dataset.user_ids)
+
+    owners = list(dataset.task_ids)
+
+    def pick_task(rng: random.Random) -> tuple[str, str]:
+        user_id = rng.choice(owners)
+        return user_id, rng.choice(dataset.task_ids[user_id])
+
+    def login(rng):
+        return "POST", "/v1/auth/login", {"email": rng.choice(dataset.emails), "password": PASSWORD}, None
+
+    def create(rng):
+        user_id = pick_user(rng=rng)
+        return "POST", "/v1/tasks", {"summary": " ".join(rng.choices(WORDS, k=4)), "description": " ".join(rng.choices(WORDS, k=20))}, dataset.tokens[user_id]
+
+    def get_detail(rng):
+        user_id, task_id = pick_task(rng=rng)
+        return "GET", f"/v1/tasks/{task_id}", None, dataset.tokens[user_id]
+
+    def get_me(rng):
+        return "GET", "/v1/users/me", None, dataset.tokens[pick_user(rng=rng)]
+
+    def list_tasks(rng):
+        return "GET", "/v1/tasks?page=1&limit=20", None, dataset.tokens[pick_user(rng=rng)]
+
+    def list_search(rng):
+        return "GET", f"/v1/tasks?search={rng.choice(WORDS)}&limit=20", None, dataset.tokens[pick_user(rng=rng)]
+
+    def list_sort(rng):
+        return "GET", "/v1/tasks?sort_by=summary&order_by=asc&limit=20", None, dataset.tokens[pick_user(rng=rng)]
+
+    def list_projection(rng):
+        return "GET", "/v1/tasks?fields=summary,status&limit=20", None, dataset.tokens[pick_user(rng=rng)]
+
+    def list_deep(rng):
+        # The admin sees every task, so deep pages skip over most of the collection
+        return "GET", f"/v1/tasks?page={rng.randint(max(1, deep_page // 2), deep_page)}&limit=20", None, dataset.admin_token
+
+    def edit(rng):
+        user_id, task_id = pick_task(rng=rng)
+        return "PUT", f"/v1/tasks/{task_id}", {"summary": " ".join(rng.choices(WORDS, k=4))}, dataset.tokens[user_id]
+
+    return {
+        "login": login,
+        "create": create,
+        "get_detail": get_detail,
+        "get_me": get_me,
+        "list": list_tasks,
+        "list_search": list_search,
+        "list_sort": list_sort,
+        "list_projection": list_projection,
+        "list_deep": list_deep,
+        "edit": edit,
+    }
+
+
+async def run(client: AsyncClient, build_request, rng: random.Random, total_requests: int, concurrency: int, warmup: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = {}
+
+    async def call():
+        method, url, body, token = build_request(rng)
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(call() for _ in range(warmup)))
+    latencies.clear()
+    errors.clear()
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    return summarize(latencies=latencies, errors=errors, elapsed=elapsed)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    if args.database == db_settings.app_database_name:
+        raise SystemExit("The benchmark database is dropped after the run, it must differ from app_database_name.")
+    logger.remove()
+    rng = random.Random(args.seed)
+    storage = use_database(name=args.database, cruds=[user_crud, task_crud])
+    await storage.drop()
+    try:
+        seed_start = time.perf_counter()
+        dataset = await seed(profile=Profile(users=args.users, tasks_per_user=args.tasks_per_user, seed=args.seed))
+        seed_seconds = time.perf_counter() - seed_start
+
+        deep_page = max(1, int(args.users * args.tasks_per_user // 20))
+        scenarios = build_scenarios(dataset=dataset, deep_page=deep_page)
+        selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}. Available: {', '.join(scenarios)}")
+
+        results = {}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+            for name in selected:
+                # Every login verifies a bcrypt hash, which is orders of magnitude slower than the other endpoints
+                total_requests = args.login_requests if name == "login" else args.requests
+                results[name] = await run(
+                    client=client, build_request=scenarios[name], rng=rng, total_requests=total_requests, concurrency=args.concurrency, warmup=min(args.warmup, total_requests)
+                )
+        return {
+            "config": {"users": args.users, "tasks_per_user": args.tasks_per_user, "concurrency": args.concurrency, "seed": args.seed, "seed_seconds": round(seed_seconds, 3)},
+            "results": results,
+        }
+    finally:
+        if not args.keep:
+            await storage.drop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks-per-user", type=float, default=50, help="Mean number of tasks per user (log-normal distribution).")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario.")
+    parser.add_argument("--login-requests", type=int, default=100, help="Requests for the login scenario.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=50, help="Requests sent before measuring each scenario.")
+    parser.add_argument("--scenarios", type=str, default=None, help="Comma-separated scenarios to run. Defaults to all.")
+    parser.add_argument("--database", type=str, default="benchmark", help="The database seeded (and dropped) by the benchmark.")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded database after the run.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=str, default=None, help="Also write the results to this file.")
+    args = parser.parse_args()
+    report = asyncio.run(main(args=args))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    failed = {name: result["errors"] for name, result in report["results"].items() if result["errors"]}
+    if failed:
+        for name, errors in failed.items():
+            print(f"ERROR: scenario {name!r} had failed requests (status: count) {errors}", file=sys.stderr)
+        raise SystemExit(1)
@@ -0,0 +1,190 @@
+"""
+Microbenchmarks of the hot helpers of the request path: the `BaseCRUD` query helpers, the validators and the model validation.
+
+Each case is calibrated to run for at least `--min-time` seconds per round; the median of the rounds is reported
+in microseconds per call. Baselines are stored in `benchmarks/baselines/micro.json`: save them on a quiet machine
+with `--save`, then compare a change against them with `--compare`, which exits with status 1 when a case is slower
+than its baseline by more than `--tolerance` and by more than `--min-delta-us` microseconds. The absolute floor keeps
+the sub-microsecond cases, where a few nanoseconds of noise exceed any relative tolerance, from reporting false regressions.
+
+Baselines are only comparable on the same machine and Python version; both are recorded with the baseline. Record the stored
+baseline in the test image (`bin/linux/benchmark.sh micro --save --rounds 60 --min-time 0.1`); the rounds and the duration
+of the rounds of the recording are stored with it.
+
+Usage (from the `app` directory):
+    python -m benchmarks.micro
+    python -m benchmarks.micro --save
+    python -m benchmarks.micro --compare --tolerance 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from db.base import BaseCRUD
+from db.engine import app_engine
+from modules.v1.tasks.models import Tasks
+from users.models import Users
+from utils import validator
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "micro.json")
+
+crud = BaseCRUD(database_engine=app_engine)
+
+QUERY = {
+    "status": "done",
+    "is_active": "true",
+    "is_archived": "false",
+    "created_by": "6650f0e1a1b2c3d4e5f60718",
+    "summary": "release (v2.1) [hotfix]*",
+    "tags": ["true", "urgent", "false"],
+    "owner": {"name": "John", "verified": "true"},
+}
+USER = {
+    "_id": "6650f0e1a1b2c3d4e5f60718",
+    "fullname": "John Doe",
+    "email": "john.doe@example.com",
+    "phone": "0987654321",
+    "password": b"$2b$12$abcdefghijklmnopqrstuuJ0ZyJ1fB1b7zZb7zZb7zZb7zZb7zZb7z",
+    "type": "user",
+    "created_at": datetime(2026, 1, 1),
+    "created_by": "6650f0e1a1b2c3d4e5f60718",
+}
+TASK = {
+    "_id": "6650f0e1a1b2c3d4e5f60719",
+    "summary": "Prepare the release notes",
+    "description": "Collect the merged changes and write the release notes for the next version.",
+    "status": "in_progress",
+    "created_at": datetime(2026, 1, 1),
+    "created_by": "6650f0e1a1b2c3d4e5f60718",
+}
+TASK_PAGE = [TASK] * 20
+
+
+def run_coroutine(coroutine):
+    """Runs a coroutine that never suspends (such as `build_field_projection`) without the event loop overhead."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("The coroutine suspended, it needs an event loop.")
+
+
+CASES = {
+    "crud.convert_bools": lambda: crud.convert_bools(value=QUERY),
+    "crud.replace_special_chars.query": lambda: crud.replace_special_chars(value=QUERY),
+    "crud.replace_special_chars.search": lambda: crud.replace_special_chars(value="release (v2.1) [hotfix]*"),
+    "crud.build_field_projection": lambda: run_coroutine(crud.build_field_projection(fields_limit="summary, status, created_at, created_by")),
+    "validator.check_email": lambda: validator.check_email(email="john.doe@example.com"),
+    "validator.check_phone": lambda: validator.check_phone(phone="0987654321"),
+    "models.users.validate": lambda: Users.model_validate(USER),
+    "models.tasks.validate": lambda: Tasks.model_validate(TASK),
+    "models.tasks.validate_page": lambda: [Tasks.model_validate(item) for item in TASK_PAGE],
+}
+
+
+def measure(func, rounds: int, min_time: float) -> dict:
+    """
+    Measures a function.
+
+    Args:
+        func (callable): The function to call.
+        rounds (int): The number of measured rounds.
+        min_time (float): The minimum duration of a round in seconds, used to choose the number of calls per round.
+
+    Returns:
+        dict: The median, minimum and standard deviation of the time per call in microseconds, and the calls per round.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= min_time:
+            break
+        loops *= 2
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - start) / loops * 1_000_000)
+    return {
+        "median_us": round(statistics.median(timings), 4),
+        "min_us": round(min(timings), 4),
+        "stdev_us": round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+        "loops": loops,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_us: float = 0.0) -> dict:
+    """
+    Compares the results with the baseline.
+
+    A case regresses when it is slower than its baseline by more than `tolerance` (relative) and `min_delta_us` (absolute).
+
+    Returns:
+        dict: Per case, the baseline and current medians, their ratio and whether it is a regression.
+    """
+    comparison = {}
+    for name, result in results.items():
+        reference = baseline["results"].get(name)
+        if not reference:
+            comparison[name] = {"current_us": result["median_us"], "baseline_us": None, "ratio": None, "regression": False}
+            continue
+        ratio = result["median_us"] / reference["median_us"]
+        regression = ratio > 1 + tolerance and result["median_us"] - reference["median_us"] > min_delta_us
+        comparison[name] = {"current_us": result["median_us"], "baseline_us": reference["median_us"], "ratio": round(ratio, 3), "regression": regression}
+    return comparison
+
+
+def get_environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(), "processor": platform.processor() or None}
+
+
+def main(args: argparse.Namespace) -> int:
+    selected = args.cases.split(",") if args.cases else list(CASES)
+    unknown = set(selected) - set(CASES)
+    if unknown:
+        raise SystemExit(f"Unknown cases: {', '.join(sorted(unknown))}. Available: {', '.join(CASES)}")
+    results = {name: measure(func=CASES[name], rounds=args.rounds, min_time=args.min_time) for name in selected}
+    report = {"environment": get_environment(), "settings": {"rounds": args.rounds, "min_time": args.min_time}, "results": results}
+
+    if args.save:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+    exit_code = 0
+    if args.compare:
+        with open(BASELINE_PATH) as file:
+            baseline = json.load(file)
+        # Patch releases do not change the performance profile, minor releases do
+        baseline_python = str(baseline.get("environment", {}).get("python"))
+        if baseline_python.split(".")[:2] != report["environment"]["python"].split(".")[:2]:
+            print(f"warning: the baseline was recorded with Python {baseline_python}", file=sys.stderr)
+        report["baseline_environment"] = baseline.get("environment")
+        report["comparison"] = compare(results=results, baseline=baseline, tolerance=args.tolerance, min_delta_us=args.min_delta_us)
+        report["regressions"] = [name for name, item in report["comparison"].items() if item["regression"]]
+        exit_code = 1 if report["regressions"] else 0
+
+    print(json.dumps(report, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=str, default=None, help="Comma-separated cases to run. Defaults to all.")
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum duration of a round in seconds.")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--compare", action="store_true", help="Compare the results with the stored baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown over the baseline, e.g. 0.2 for 20%%.")
+    parser.add_argument("--min-delta-us", type=float, default=0.5, help="Slowdowns of at most this many microseconds are never regressions.")
+    sys.exit(main(args=parser.parse_args()))
@@ -0,0 +1,107 @@
+"""
+Compares the pure ASGI `LogMiddleware` with the previous `BaseHTTPMiddleware` implementation.
+
+Both middlewares wrap the same minimal FastAPI application and are driven in-process through `httpx.ASGITransport`,
+so the numbers only reflect the middleware and framework overhead (no network, no database).
+
+Usage (from the `app` directory):
+    python -m benchmarks.middleware --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import traceback
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+from middlewares.v1.exceptions import MiddlewareErrorCode
+from middlewares.v1.log import LogMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from utils import value
+
+
+class LegacyLogMiddleware(BaseHTTPMiddleware):
+    """The `BaseHTTPMiddleware` based implementation that `LogMiddleware` replaced, kept as the baseline."""
+
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        try:
+            response = await call_next(request)
+        except Exception:
+            exc_list = traceback.format_exception(*sys.exc_info())
+            logger.debug("".join(exc_list))
+            response = MiddlewareErrorCode.SomeThingWentWrong()
+        process_time = time.time() - start_time
+        response.headers["X-PROCESS-TIME"] = f"{process_time:.4f}s"
+        response.headers["X-REQUEST-ID"] = value.get_uuid()
+        return response
+
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ping": "pong!"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(10):
+                yield b"x" * 1024
+
+        return StreamingResponse(chunks())
+
+    return app
+
+
+async def run(app: FastAPI, path: str, total_requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+
+        async def call():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+        # Warm up the application before measuring
+        await asyncio.gather(*(call() for _ in range(min(100, total_requests))))
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(total_requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "throughput": round(total_requests / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+    }
+
+
+async def main(total_requests: int, concurrency: int) -> dict:
+    logger.remove()
+    results = {}
+    for name, middleware in (("legacy", LegacyLogMiddleware), ("asgi", LogMiddleware)):
+        app = build_app(middleware=middleware)
+        results[name] = {path: await run(app=app, path=path, total_requests=total_requests, concurrency=concurrency) for path in ("/ping", "/stream")}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(total_requests=args.requests, concurrency=args.concurrency)), indent=2))
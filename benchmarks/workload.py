@@ -0,0 +1,481 @@
+"""
+Generates deterministic synthetic users and tasks, bulk loads them, and replays a mixed read/write workload against the API.
+
+Every user and its tasks are derived from `(seed, user index)` only, so two runs with the same profile produce
+the same documents and ids, and `replay` can pick existing users and tasks without reading them back.
+The documents are written with chunked unordered `insert_many` calls (several chunks in flight) and a password hash
+computed once, which loads millions of documents in minutes instead of the hours `UserServices.register` would take.
+
+Usage (from the `app` directory):
+    python -m benchmarks.workload seed --users 100000 --tasks-per-user 20 --drop
+    python -m benchmarks.workload replay --users 100000 --tasks-per-user 20 --base-url http://localhost:8000 --duration 60 --concurrency 100
+    python -m benchmarks.workload replay --users 1000 --in-process --mix get_detail=50,list=30,create=10,edit=10
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import struct
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from auth.services import auth_services
+from bson import ObjectId
+from core.config import settings as core_settings
+from db.backends.base import StorageBackend
+from db.base import BaseCRUD
+from db.config import settings as db_settings
+from db.engine import app_engine
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+from modules.v1.tasks.services import task_crud
+from users.services import user_crud
+
+WORDS = (
+    "deploy review release invoice meeting backup report migrate design budget customer sprint roadmap onboarding "
+    "security audit payment refund analytics dashboard feedback survey contract hiring training support incident "
+    "database cache latency index query backlog estimate demo launch partner vendor license renewal quarterly"
+).split()
+
+DEFAULT_MIX = "get_detail=30,list=25,list_search=10,list_deep=5,get_me=10,create=10,edit=9,login=1"
+
+
+def parse_weights(value: str) -> dict[str, float]:
+    """Parses `name=weight,name=weight` into a dictionary."""
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+@dataclass
+class Profile:
+    """
+    The shape of the synthetic data.
+
+    Attributes:
+        users (int): The number of users.
+        tasks_per_user (float): The mean number of tasks per user; counts follow a log-normal distribution (a few users own many tasks).
+        tasks_per_user_sigma (float): The spread of the log-normal distribution of tasks per user.
+        max_tasks_per_user (int): The upper bound of tasks per user.
+        status_mix (dict): The relative weight of each task status.
+        summary_words (int): The mean number of words of a summary.
+        description_words (int): The mean number of words of a description.
+        description_ratio (float): The ratio of tasks having a description.
+        deleted_ratio (float): The ratio of soft-deleted tasks.
+        days (int): The tasks are created over this many days before `reference_date`.
+        reference_date (datetime): The date of the most recent documents.
+        seed (int): The seed of every random choice.
+    """
+
+    users: int = 1000
+    tasks_per_user: float = 20
+    tasks_per_user_sigma: float = 1.0
+    max_tasks_per_user: int = 1000
+    status_mix: dict = field(default_factory=lambda: {"to_do": 0.5, "in_progress": 0.2, "done": 0.3})
+    summary_words: int = 5
+    description_words: int = 40
+    description_ratio: float = 0.7
+    deleted_ratio: float = 0.05
+    days: int = 365
+    reference_date: datetime = datetime(2026, 1, 1)
+    seed: int = 42
+
+
+class SyntheticDataset:
+    """
+    Derives users and tasks from a profile.
+
+    Args:
+        profile (Profile): The shape of the data.
+        hashed_password (bytes): The password hash shared by every user.
+    """
+
+    def __init__(self, profile: Profile, hashed_password: bytes) -> None:
+        self.profile = profile
+        self.hashed_password = hashed_password
+        self.statuses = list(profile.status_mix)
+        self.status_weights = list(profile.status_mix.values())
+        # Parameters of the log-normal distribution whose mean is `tasks_per_user`
+        self.tasks_sigma = profile.tasks_per_user_sigma
+        self.tasks_mu = math.log(max(profile.tasks_per_user, 1e-9)) - self.tasks_sigma**2 / 2
+
+    def make_object_id(self, kind: str, index: int, sub_index: int, created_at: datetime) -> ObjectId:
+        # The timestamp part follows created_at (like a real ObjectId); the rest is a hash, so ids are stable across runs.
+        digest = hashlib.blake2b(f"{self.profile.seed}:{kind}:{index}:{sub_index}".encode(), digest_size=8).digest()
+        return ObjectId(struct.pack(">I", int(created_at.timestamp())) + digest)
+
+    def email(self, index: int) -> str:
+        return f"user{index}@synthetic.example.com"
+
+    def user_created_at(self, index: int) -> datetime:
+        # Users sign up evenly over the period, before their tasks
+        return self.profile.reference_date - timedelta(days=self.profile.days) + timedelta(seconds=index * self.profile.days * 86400 / max(self.profile.users, 1) / 2)
+
+    def user_id(self, index: int) -> str:
+        return str(self.make_object_id(kind="user", index=index, sub_index=0, created_at=self.user_created_at(index)))
+
+    def user(self, index: int) -> dict:
+        created_at = self.user_created_at(index)
+        user_id = self.make_object_id(kind="user", index=index, sub_index=0, created_at=created_at)
+        rng = random.Random(f"{self.profile.seed}:user:{index}")
+        phone = "0" + "".join(rng.choice("0123456789") for _ in range(9)) if rng.random() < 0.5 else None
+        document = {"_id": user_id, "fullname": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}", "email": self.email(index)}
+        if phone:
+            document["phone"] = phone
+        document.update({"password": self.hashed_password, "type": "user", "created_at": created_at, "created_by": str(user_id)})
+        return document
+
+    def text(self, rng: random.Random, mean_words: int) -> str:
+        words = max(1, int(rng.expovariate(1 / mean_words)) if mean_words > 10 else int(rng.gauss(mean_words, mean_words / 3)))
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    def tasks(self, index: int) -> list[dict]:
+        """Returns the tasks of the user at `index`, always the same for a given profile."""
+        profile = self.profile
+        rng = random.Random(f"{profile.seed}:tasks:{index}")
+        count = min(profile.max_tasks_per_user, int(rng.lognormvariate(self.tasks_mu, self.tasks_sigma)))
+        user_id = self.user_id(index)
+        user_created_at = self.user_created_at(index)
+        span = max((profile.reference_date - user_created_at).total_seconds(), 1)
+        documents = []
+        for sub_index in range(count):
+            created_at = user_created_at + timedelta(seconds=rng.random() * span)
+            document = {
+                "_id": self.make_object_id(kind="task", index=index, sub_index=sub_index, created_at=created_at),
+                "summary": self.text(rng=rng, mean_words=profile.summary_words),
+                "status": rng.choices(self.statuses, weights=self.status_weights)[0],
+                "created_at": created_at,
+                "created_by": user_id,
+            }
+            if rng.random() < profile.description_ratio:
+                document["description"] = self.text(rng=rng, mean_words=profile.description_words)
+            if rng.random() < profile.deleted_ratio:
+                document["deleted_at"] = created_at + timedelta(seconds=rng.random() * (profile.reference_date - created_at).total_seconds())
+                document["deleted_by"] = user_id
+            documents.append(document)
+        return documents
+
+    def active_task_ids(self, index: int) -> list[str]:
+        return [str(task["_id"]) for task in self.tasks(index) if "deleted_at" not in task]
+
+
+def use_database(name: str, cruds: list[BaseCRUD]) -> StorageBackend:
+    """Points the given CRUD instances at another database of the same engine and returns its storage."""
+    storage = app_engine.get_storage(database_name=name)
+    for crud in cruds:
+        crud.use_storage(storage=storage)
+    return storage
+
+
+async def insert_chunks(crud: BaseCRUD, documents, chunk_size: int, parallelism: int) -> int:
+    """
+    Inserts documents with unordered `insert_many` calls, keeping up to `parallelism` chunks in flight.
+
+    Args:
+        crud (BaseCRUD): The CRUD of the target collection.
+        documents (Iterable[dict]): The documents, consumed lazily.
+        chunk_size (int): The number of documents per `insert_many`.
+        parallelism (int): The number of concurrent `insert_many` calls.
+
+    Returns:
+        int: The number of inserted documents.
+
+    Raises:
+        BulkWriteError: If a chunk could not be fully inserted (e.g. duplicates); the chunks still in flight are cancelled.
+    """
+    pending = set()
+    inserted = 0
+
+    async def insert(chunk: list) -> int:
+        # Unordered: the server applies the chunk in parallel and does not stop at the first duplicate
+        return len(await crud.collection.insert_many(documents=chunk, ordered=False))
+
+    async def wait(return_when: str) -> None:
+        nonlocal pending, inserted
+        done, pending = await asyncio.wait(pending, return_when=return_when)
+        # The error of a failed chunk (e.g. a BulkWriteError on duplicates) is raised instead of being lost
+        errors = [task.exception() for task in done if task.exception() is not None]
+        inserted += sum(task.result() for task in done if task.exception() is None)
+        if errors:
+            raise errors[0]
+
+    try:
+        chunk = []
+        for document in documents:
+            chunk.append(document)
+            if len(chunk) >= chunk_size:
+                if len(pending) >= parallelism:
+                    await wait(return_when=asyncio.FIRST_COMPLETED)
+                pending.add(asyncio.create_task(insert(chunk)))
+                chunk = []
+        if chunk:
+            pending.add(asyncio.create_task(insert(chunk)))
+        if pending:
+            await wait(return_when=asyncio.ALL_COMPLETED)
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return inserted
+
+
+async def seed(dataset: SyntheticDataset, chunk_size: int = 1000, parallelism: int = 4) -> dict:
+    """
+    Writes the users and tasks of a dataset.
+
+    Returns:
+        dict: The number of users and tasks written and the time it took.
+    """
+    start = time.perf_counter()
+    users = await insert_chunks(crud=user_crud, documents=(dataset.user(index) for index in range(dataset.profile.users)), chunk_size=chunk_size, parallelism=parallelism)
+    tasks = await insert_chunks(
+        crud=task_crud,
+        documents=(task for index in range(dataset.profile.users) for task in dataset.tasks(index)),
+        chunk_size=chunk_size,
+        parallelism=parallelism,
+    )
+    elapsed = time.perf_counter() - start
+    return {"users": users, "tasks": tasks, "seconds": round(elapsed, 3), "documents_per_second": round((users + tasks) / elapsed, 1)}
+
+
+def percentile(latencies: list[float], percent: float) -> float:
+    """Returns the nearest-rank percentile of sorted latencies, in milliseconds."""
+    index = max(0, min(len(latencies) - 1, int(round(percent / 100 * len(latencies))) - 1))
+    return round(latencies[index] * 1000, 3)
+
+
+def summarize(latencies: list[float], errors: dict, elapsed: float) -> dict:
+    """Returns the throughput and latency percentiles of a series of requests."""
+    latencies.sort()
+    if not latencies:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": percentile(latencies=latencies, percent=50),
+        "p95_ms": percentile(latencies=latencies, percent=95),
+        "p99_ms": percentile(latencies=latencies, percent=99),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+class Workload:
+    """
+    Builds the requests of a mixed workload over a synthetic dataset.
+
+    Each operation returns `(method, url, json body, user index)`; the user index selects the access token (None for anonymous).
+    """
+
+    def __init__(self, dataset: SyntheticDataset, password: str, rng: random.Random) -> None:
+        self.dataset = dataset
+        self.password = password
+        self.rng = rng
+        self.tokens = {}
+        self.admin_token = None
+        self.operations = {
+            "login": self.login,
+            "get_me": self.get_me,
+            "get_detail": self.get_detail,
+            "list": self.list,
+            "list_search": self.list_search,
+            "list_deep": self.list_deep,
+            "create": self.create,
+            "edit": self.edit,
+        }
+
+    async def get_token(self, index: int | None) -> str | None:
+        if index is None:
+            return None
+        if index == -1:
+            if not self.admin_token:
+                self.admin_token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="admin")
+            return self.admin_token
+        if index not in self.tokens:
+            self.tokens[index] = await auth_services.create_access_token(user_id=self.dataset.user_id(index), user_type="user")
+        return self.tokens[index]
+
+    def pick_user(self) -> int:
+        return self.rng.randrange(self.dataset.profile.users)
+
+    def pick_task(self) -> tuple[int, str | None]:
+        for _ in range(10):
+            index = self.pick_user()
+            task_ids = self.dataset.active_task_ids(index)
+            if task_ids:
+                return index, self.rng.choice(task_ids)
+        return index, None
+
+    def login(self):
+        return "POST", "/v1/auth/login", {"email": self.dataset.email(self.pick_user()), "password": self.password}, None
+
+    def get_me(self):
+        return "GET", "/v1/users/me", None, self.pick_user()
+
+    def get_detail(self):
+        index, task_id = self.pick_task()
+        return "GET", f"/v1/tasks/{task_id}", None, index
+
+    def list(self):
+        return "GET", f"/v1/tasks?page={self.rng.randint(1, 3)}&limit=20", None, self.pick_user()
+
+    def list_search(self):
+        return "GET", f"/v1/tasks?search={self.rng.choice(WORDS)}&limit=20", None, self.pick_user()
+
+    def list_deep(self):
+        # The admin sees every task, so deep pages skip over a large part of the collection
+        total_tasks = self.dataset.profile.users * self.dataset.profile.tasks_per_user
+        return "GET", f"/v1/tasks?page={self.rng.randint(1, max(1, int(total_tasks // 20)))}&limit=20", None, -1
+
+    def create(self):
+        body = {"summary": self.dataset.text(rng=self.rng, mean_words=self.dataset.profile.summary_words)}
+        return "POST", "/v1/tasks", body, self.pick_user()
+
+    def edit(self):
+        index, task_id = self.pick_task()
+        return "PUT", f"/v1/tasks/{task_id}", {"status": self.rng.choice(self.dataset.statuses)}, index
+
+
+async def replay(client: AsyncClient, workload: Workload, mix: dict[str, float], concurrency: int, duration: float = None, total_requests: int = None) -> dict:
+    """
+    Replays a weighted mix of operations with a fixed number of concurrent clients (closed loop).
+
+    The run stops after `duration` seconds or `total_requests` requests, whichever comes first.
+
+    Returns:
+        dict: The overall and per operation throughput and latency percentiles.
+    """
+    unknown = set(mix) - set(workload.operations)
+    if unknown:
+        raise SystemExit(f"Unknown operations: {', '.join(sorted(unknown))}. Available: {', '.join(workload.operations)}")
+    names = list(mix)
+    weights = list(mix.values())
+    latencies = {name: [] for name in names}
+    errors = {name: {} for name in names}
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    def should_continue() -> bool:
+        if total_requests is not None and sent >= total_requests:
+            return False
+        return deadline is None or time.perf_counter() < deadline
+
+    async def worker():
+        nonlocal sent
+        while should_continue():
+            sent += 1
+            name = workload.rng.choices(names, weights=weights)[0]
+            method, url, body, user_index = workload.operations[name]()
+            token = await workload.get_token(user_index)
+            headers = {"Authorization": f"Bearer {token}"} if token else None
+            request_start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body, headers=headers)
+                status = response.status_code
+            except Exception as exc:
+                status = type(exc).__name__
+            latencies[name].append(time.perf_counter() - request_start)
+            if not isinstance(status, int) or status >= 400:
+                errors[name][status] = errors[name].get(status, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    all_latencies = [latency for items in latencies.values() for latency in items]
+    all_errors = {}
+    for items in errors.values():
+        for status, count in items.items():
+            all_errors[status] = all_errors.get(status, 0) + count
+    return {
+        "total": summarize(latencies=all_latencies, errors=all_errors, elapsed=elapsed),
+        "operations": {name: summarize(latencies=latencies[name], errors=errors[name], elapsed=elapsed) for name in names},
+    }
+
+
+def build_profile(args: argparse.Namespace) -> Profile:
+    return Profile(
+        users=args.users,
+        tasks_per_user=args.tasks_per_user,
+        tasks_per_user_sigma=args.tasks_per_user_sigma,
+        max_tasks_per_user=args.max_tasks_per_user,
+        status_mix=parse_weights(args.status_mix),
+        summary_words=args.summary_words,
+        description_words=args.description_words,
+        description_ratio=args.description_ratio,
+        deleted_ratio=args.deleted_ratio,
+        days=args.days,
+        reference_date=datetime.fromisoformat(args.reference_date),
+        seed=args.seed,
+    )
+
+
+async def main(args: argparse.Namespace) -> dict:
+    logger.remove()
+    profile = build_profile(args=args)
+    database = args.database or db_settings.app_database_name
+    storage = use_database(name=database, cruds=[user_crud, task_crud])
+
+    if args.command == "seed":
+        if args.drop:
+            await user_crud.collection.drop()
+            await task_crud.collection.drop()
+            # The synthetic ids are stable across runs: counters left by a replay would no longer match the reseeded tasks
+            await storage.get_collection(core_settings.counters_collection).drop()
+        # bcrypt is deliberately slow: hash the shared password once instead of once per user
+        dataset = SyntheticDataset(profile=profile, hashed_password=await auth_services.hash(value=args.password))
+        result = await seed(dataset=dataset, chunk_size=args.chunk_size, parallelism=args.parallelism)
+        return {"database": database, "profile": {**vars(profile), "reference_date": args.reference_date}, "seed": result}
+
+    dataset = SyntheticDataset(profile=profile, hashed_password=b"")
+    workload = Workload(dataset=dataset, password=args.password, rng=random.Random(args.seed))
+    if args.in_process:
+        from main import app
+
+        transport = ASGITransport(app=app)
+        base_url = "http://workload"
+    else:
+        transport = None
+        base_url = args.base_url
+    async with AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout) as client:
+        result = await replay(client=client, workload=workload, mix=parse_weights(args.mix), concurrency=args.concurrency, duration=args.duration, total_requests=args.requests)
+    return {"target": base_url, "concurrency": args.concurrency, "mix": parse_weights(args.mix), "replay": result}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("seed", "replay"))
+    data = parser.add_argument_group("data profile (must match between seed and replay)")
+    data.add_argument("--users", type=int, default=1000)
+    data.add_argument("--tasks-per-user", type=float, default=20, help="Mean number of tasks per user.")
+    data.add_argument("--tasks-per-user-sigma", type=float, default=1.0, help="Spread of the log-normal distribution of tasks per user.")
+    data.add_argument("--max-tasks-per-user", type=int, default=1000)
+    data.add_argument("--status-mix", type=str, default="to_do=0.5,in_progress=0.2,done=0.3")
+    data.add_argument("--summary-words", type=int, default=5)
+    data.add_argument("--description-words", type=int, default=40)
+    data.add_argument("--description-ratio", type=float, default=0.7)
+    data.add_argument("--deleted-ratio", type=float, default=0.05)
+    data.add_argument("--days", type=int, default=365)
+    data.add_argument("--reference-date", type=str, default="2026-01-01")
+    data.add_argument("--seed", type=int, default=42)
+    data.add_argument("--password", type=str, default="synthetic-password")
+    seeding = parser.add_argument_group("seed")
+    seeding.add_argument("--database", type=str, default=None, help="Defaults to app_database_name.")
+    seeding.add_argument("--drop", action="store_true", help="Drop the users and tasks collections first.")
+    seeding.add_argument("--chunk-size", type=int, default=1000)
+    seeding.add_argument("--parallelism", type=int, default=4, help="Number of insert_many calls in flight.")
+    replaying = parser.add_argument_group("replay")
+    replaying.add_argument("--base-url", type=str, default="http://localhost:8000")
+    replaying.add_argument("--in-process", action="store_true", help="Drive the application in-process through ASGITransport instead of HTTP.")
+    replaying.add_argument("--mix", type=str, default=DEFAULT_MIX, help="Weighted operations, e.g. get_detail=50,list=30,create=20.")
+    replaying.add_argument("--concurrency", type=int, default=50)
+    replaying.add_argument("--duration", type=float, default=30, help="Seconds to run.")
+    replaying.add_argument("--requests", type=int, default=None, help="Stop after this many requests.")
+    replaying.add_argument("--timeout", type=float, default=30)
+    print(json.dumps(asyncio.run(main(args=parser.parse_args())), indent=2, default=str))
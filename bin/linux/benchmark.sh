@@ -0,0 +1,10 @@
+#!/bin/bash
+# Usage: bin/linux/benchmark.sh <benchmark module> [options], e.g. bin/linux/benchmark.sh middleware --requests 5000
+set -e
+
+BENCHMARK=$1
+shift
+
+docker compose -f docker-compose-test.yml build
+docker compose -f docker-compose-test.yml run --rm api-test python -m benchmarks.$BENCHMARK "$@"
+docker compose -f docker-compose-test.yml down -v
@@ -0,0 +1,3 @@
+docker compose -f docker-compose-test.yml build
+docker compose -f docker-compose-test.yml run --rm api-test python -m benchmarks.%*
+docker compose -f docker-compose-test.yml down -v
@@ -0,0 +1,34 @@
+import pytest
+from auth.dependencies import get_bearer_token
+from auth.services import auth_services
+from httpx import AsyncClient
+
+
+def test_get_bearer_token():
+    assert get_bearer_token("Bearer abc") == "abc"
+    assert get_bearer_token("bearer abc") == "abc"
+    assert get_bearer_token("Basic abc") is None
+    assert get_bearer_token("Bearer ") is None
+    assert get_bearer_token(None) is None
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_missing_or_invalid_token(client: AsyncClient):
+    response = await client.get("v1/users/me")
+    assert response.status_code == 401
+
+    response = await client.get("v1/users/me", headers={"Authorization": "Bearer invalid"})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_admin_route_forbidden_for_user(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id="6650f0e1a1b2c3d4e5f60718", user_type="user")
+    response = await client.get("v1/users", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_public_route(client: AsyncClient):
+    response = await client.get("v1/health/ping", headers={"Authorization": "Bearer invalid"})
+    assert response.status_code == 200
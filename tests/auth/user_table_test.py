@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from auth.user_table import HEADER, SharedUserTable
+from bson import ObjectId
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_shared_user_table():
+    name = f"user_table_test_{ObjectId()}"
+    admin_id, user_id, deleted_id = str(ObjectId()), str(ObjectId()), str(ObjectId())
+
+    async def loader():
+        return [(admin_id, "admin", False), (user_id, "user", False), (deleted_id, "user", True)]
+
+    loader_table = SharedUserTable(name=name, capacity=16, refresh_seconds=60)
+    reader_table = SharedUserTable(name=name, capacity=1024, refresh_seconds=60)
+    await loader_table.start(loader=loader)
+    await reader_table.start(loader=loader)
+    try:
+        assert loader_table.is_loader and not reader_table.is_loader
+        # The reader maps the segment of the loader, with its capacity
+        assert reader_table.capacity == 16
+        assert reader_table.get(user_id=admin_id).user_type == "admin"
+        assert reader_table.get(user_id=user_id).user_type == "user"
+        assert reader_table.get(user_id=deleted_id).deleted
+        assert reader_table.get(user_id=str(ObjectId())) is None
+        assert reader_table.get(user_id="not-an-id") is None
+
+        # Only the loader writes; the readers see its updates
+        reader_table.update(user_id=user_id, user_type="admin")
+        assert reader_table.get(user_id=user_id).user_type == "user"
+        loader_table.update(user_id=user_id, user_type="admin")
+        assert reader_table.get(user_id=user_id).user_type == "admin"
+        loader_table.update(user_id=user_id, user_type="admin", deleted=True)
+        assert reader_table.get(user_id=user_id).deleted
+
+        # A stale table is ignored, so callers fall back to the token claims
+        reader_table.stale_seconds = -1
+        assert reader_table.get(user_id=admin_id) is None
+    finally:
+        await reader_table.stop()
+        await loader_table.stop()
+
+    # The segment outlives the loader and the next loader reuses it
+    next_table = SharedUserTable(name=name, capacity=16, refresh_seconds=60)
+    assert next_table.elect()
+    assert next_table.get(user_id=admin_id).user_type == "admin"
+
+    # A loader that died mid-write left the sequence odd: the next write still ends on an even one
+    magic, capacity, sequence, loaded_at = HEADER.unpack_from(next_table.buffer, 0)
+    HEADER.pack_into(next_table.buffer, 0, magic, capacity, sequence | 1, loaded_at)
+    next_table.update(user_id=admin_id, user_type="user")
+    assert HEADER.unpack_from(next_table.buffer, 0)[2] % 2 == 0
+    assert next_table.get(user_id=admin_id).user_type == "user"
+    next_table.close(unlink=True)
+
+
+LOADER_SCRIPT = """
+import sys
+from auth.user_table import SharedUserTable
+
+table = SharedUserTable(name=sys.argv[1], capacity=16, refresh_seconds=60)
+assert table.elect()
+table.load([(sys.argv[2], "admin", False)])
+"""
+
+
+def test_shared_user_table_outlives_loader_process():
+    name = f"user_table_test_{ObjectId()}"
+    admin_id = str(ObjectId())
+    # The loader process exits without closing the table
+    result = subprocess.run([sys.executable, "-c", LOADER_SCRIPT, name, admin_id], env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "leaked shared_memory" not in result.stderr
+
+    table = SharedUserTable(name=name, capacity=16, refresh_seconds=60)
+    try:
+        assert table.attach()
+        assert table.get(user_id=admin_id).user_type == "admin"
+        assert table.elect()
+    finally:
+        table.close(unlink=True)
@@ -0,0 +1,37 @@
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_batch(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "first"})
+    task_id = response.json()["id"]
+
+    requests = [
+        {"id": "detail", "path": f"/v1/tasks/{task_id}"},
+        {"id": "create", "method": "POST", "path": "/v1/tasks", "body": {"summary": "second"}},
+        {"id": "missing", "path": f"/v1/tasks/{ObjectId()}"},
+        {"id": "invalid", "method": "POST", "path": "/v1/tasks", "body": {}},
+        {"id": "forbidden", "path": "/v1/users"},
+        {"id": "unknown", "path": "/v1/nope"},
+        {"id": "method", "method": "PATCH", "path": "/v1/users/me"},
+    ]
+    response = await client.post("v1/batch", headers=headers, json=requests)
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["id"] for result in results] == ["detail", "create", "missing", "invalid", "forbidden", "unknown", "method"]
+    assert [result["status"] for result in results] == [200, 201, 404, 422, 403, 404, 405]
+    assert results[5]["body"] == {"detail": "Not Found"}
+    assert results[6]["body"] == {"detail": "Method Not Allowed"}
+    assert results[0]["body"]["summary"] == "first"
+    assert results[0]["headers"]["etag"]
+    assert results[1]["body"]["summary"] == "second"
+
+    response = await client.post("v1/batch", headers=headers, json=[{"path": "/v1/batch"}])
+    assert response.status_code == 422
+    response = await client.post("v1/batch", json=[{"path": "/v1/users/me"}])
+    assert response.status_code == 401
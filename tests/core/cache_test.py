@@ -0,0 +1,45 @@
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from core.cache import QueryCache, normalize
+from httpx import AsyncClient
+from modules.v1.tasks.services import task_services
+
+
+def test_query_cache():
+    assert normalize({"a": 1, "b": ObjectId("6650f0e1a1b2c3d4e5f60718")}) == normalize({"b": ObjectId("6650f0e1a1b2c3d4e5f60718"), "a": 1})
+    assert normalize({"a": 1}) != normalize({"a": "1"})
+
+    cache = QueryCache(name="test", max_entries=2, ttl=60)
+    owner_key = (cache.versions.get(owner="alice"), "query")
+    global_key = (cache.versions.get(), "query")
+    cache.set(owner_key, "alice")
+    cache.set(global_key, "all")
+    cache.invalidate(owner="bob")
+    # A write of another owner only invalidates the reads across owners
+    assert (cache.versions.get(owner="alice"), "query") == owner_key
+    assert (cache.versions.get(), "query") != global_key
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get(owner_key) is None
+    assert len(cache.entries) == 2
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_cached_task_list(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "first"})
+    assert response.status_code == 201
+
+    first = await client.get("v1/tasks", headers=headers)
+    entries = len(task_services.list_cache.entries)
+    second = await client.get("v1/tasks", headers=headers)
+    assert first.json() == second.json()
+    assert len(task_services.list_cache.entries) == entries
+
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "second"})
+    assert response.status_code == 201
+    response = await client.get("v1/tasks", headers=headers)
+    assert response.json()["total_items"] == 2
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from httpx import AsyncClient
+from modules.v1.tasks.services import task_services
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_task_totals(client: AsyncClient):
+    user_id = str(ObjectId())
+    token = await auth_services.create_access_token(user_id=user_id, user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    task_ids = []
+    for summary in ("first", "second", "third"):
+        response = await client.post("v1/tasks", headers=headers, json={"summary": summary})
+        task_ids.append(response.json()["id"])
+
+    response = await client.get("v1/tasks", headers=headers)
+    assert response.json()["total_items"] == 3
+    assert response.json()["total_items_exact"] is True
+
+    # The counter of the owner is seeded by the first list, then maintained by the writes
+    response = await client.delete(f"v1/tasks/{task_ids[0]}", headers=headers)
+    assert response.status_code == 204
+    counters = task_services.owner_counters.get_collection()
+    assert (await counters.find_one(filter={"_id": f"tasks:{user_id}"}))["count"] == 2
+    response = await client.get("v1/tasks", headers=headers)
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (2, True)
+
+    # Filtered totals are reused by the other pages for a few seconds and flagged as estimated
+    response = await client.get("v1/tasks", headers=headers, params={"status": "to_do"})
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (2, True)
+    response = await client.get("v1/tasks", headers=headers, params={"status": "to_do", "limit": 1})
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (2, False)
+
+    # A write of the owner makes its cached totals unreachable
+    await client.post("v1/tasks", headers=headers, json={"summary": "fourth"})
+    response = await client.get("v1/tasks", headers=headers, params={"status": "to_do"})
+    assert len(response.json()["results"]) == 3
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (3, True)
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_concurrent_soft_deletes(client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+    user_id = str(ObjectId())
+    token = await auth_services.create_access_token(user_id=user_id, user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    for summary in ("first", "second"):
+        response = await client.post("v1/tasks", headers=headers, json={"summary": summary})
+    task_id = response.json()["id"]
+    response = await client.get("v1/tasks", headers=headers)
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (2, True)
+
+    # Both deletes read the active task before either writes, as they can on MongoDB
+    get_by_id = task_services.get_by_id
+    reads = []
+    both_read = asyncio.Event()
+
+    async def racing_get_by_id(*args, **kwargs):
+        item = await get_by_id(*args, **kwargs)
+        if not kwargs.get("include_deleted"):
+            reads.append(item)
+            if len(reads) == 2:
+                both_read.set()
+            await both_read.wait()
+        return item
+
+    monkeypatch.setattr(task_services, "get_by_id", racing_get_by_id)
+    responses = await asyncio.gather(*(client.delete(f"v1/tasks/{task_id}", headers=headers) for _ in range(2)))
+    monkeypatch.undo()
+    assert sorted(response.status_code for response in responses) == [204, 404]
+
+    response = await client.get("v1/tasks", headers=headers)
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (1, True)
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_owner_counter_reconciliation(client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+    user_id = str(ObjectId())
+    token = await auth_services.create_access_token(user_id=user_id, user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.post("v1/tasks", headers=headers, json={"summary": "first"})
+    response = await client.get("v1/tasks", headers=headers)
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (1, True)
+
+    # A drifted counter is corrected by the next reconciliation (each list uses another page size, to miss the list cache)
+    counters = task_services.owner_counters.get_collection()
+    await counters.update_one(filter={"_id": f"tasks:{user_id}"}, update={"$set": {"count": 5, "reconciled_at": 0.0}})
+    response = await client.get("v1/tasks", headers=headers, params={"limit": 11})
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (1, True)
+
+    # A write during the reconciliation leaves the counter inexact until the next one
+    count_documents = task_services.crud.count_documents
+
+    async def racing_count_documents(query: dict) -> int:
+        total = await count_documents(query=query)
+        await task_services.owner_counters.increment(owner=user_id, amount=0)
+        return total
+
+    await counters.update_one(filter={"_id": f"tasks:{user_id}"}, update={"$set": {"reconciled_at": 0.0}})
+    monkeypatch.setattr(task_services.crud, "count_documents", racing_count_documents)
+    response = await client.get("v1/tasks", headers=headers, params={"limit": 12})
+    monkeypatch.undo()
+    assert response.json()["total_items_exact"] is False
+    response = await client.get("v1/tasks", headers=headers, params={"limit": 13})
+    assert (response.json()["total_items"], response.json()["total_items_exact"]) == (1, True)
@@ -0,0 +1,64 @@
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from httpx import AsyncClient
+from modules.v1.tasks.services import task_services
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_conditional_get_task(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "first"})
+    task_id = response.json()["id"]
+
+    response = await client.get(f"v1/tasks/{task_id}", headers=headers)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.json()["summary"] == "first"
+
+    response = await client.get(f"v1/tasks/{task_id}", headers={**headers, "If-None-Match": f'W/"other", {etag}'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    response = await client.put(f"v1/tasks/{task_id}", headers=headers, json={"summary": "edited"})
+    assert response.status_code == 200
+    response = await client.get(f"v1/tasks/{task_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_conditional_get_tasks(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.post("v1/tasks", headers=headers, json={"summary": "first"})
+
+    response = await client.get("v1/tasks", headers=headers)
+    etag = response.headers["etag"]
+    response = await client.get("v1/tasks", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    await client.post("v1/tasks", headers=headers, json={"summary": "second"})
+    response = await client.get("v1/tasks", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total_items"] == 2
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_etag_follows_the_content(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "first"})
+    task_id = response.json()["id"]
+    response = await client.get(f"v1/tasks/{task_id}", headers=headers)
+    etag = response.headers["etag"]
+
+    # A write that keeps updated_at (the same millisecond, or outside the services) still changes the tag and the body
+    await task_services.crud.update_by_id(_id=task_id, data={"summary": "rewritten"})
+    task_services.invalidate_cache()
+    response = await client.get(f"v1/tasks/{task_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["summary"] == "rewritten"
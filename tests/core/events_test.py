@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from core.events import ChangeBus, change_bus
+from core.sync import encode_sync_token
+from httpx import AsyncClient
+from pydantic import BaseModel
+
+
+class Record(BaseModel):
+    id: str
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: datetime | None = None
+
+
+def make_record(minutes: int) -> Record:
+    created_at = datetime(2026, 1, 1) + timedelta(minutes=minutes)
+    return Record(id=str(ObjectId()), created_at=created_at, updated_at=created_at)
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_stream_resumes_and_evicts():
+    bus = ChangeBus(queue_size=2, heartbeat_seconds=0.01)
+    missed, replayed_live, live = make_record(1), make_record(2), make_record(3)
+
+    async def replay(token: str) -> dict:
+        return {"results": [missed, replayed_live], "next_token": None, "has_more": False}
+
+    stream = bus.stream(collection="tasks", owner="alice", serialize=lambda record: record, last_event_id=encode_sync_token(make_record(0).updated_at, ObjectId()), replay=replay)
+    assert (await anext(stream)).startswith(f"id: {encode_sync_token(missed.updated_at, missed.id)}\nevent: created\n")
+    # Published while the replay runs: delivered once, by the replay
+    bus.publish(collection="tasks", record=replayed_live, owner="alice")
+    bus.publish(collection="tasks", record=make_record(4), owner="bob")
+    assert replayed_live.id in await anext(stream)
+    bus.publish(collection="tasks", record=live, owner="alice")
+    assert live.id in await anext(stream)
+    assert await anext(stream) == ": heartbeat\n\n"
+
+    for minutes in range(5, 8):
+        bus.publish(collection="tasks", record=make_record(minutes), owner="alice")
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+    assert bus.subscribers["tasks"] == set()
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_task_writes_are_published(client: AsyncClient):
+    user_id = str(ObjectId())
+    token = await auth_services.create_access_token(user_id=user_id, user_type="user")
+    subscriber = change_bus.subscribe(collection="tasks", owner=user_id)
+    try:
+        response = await client.post("v1/tasks", headers={"Authorization": f"Bearer {token}"}, json={"summary": "first"})
+        event = subscriber.queue.get_nowait()
+        assert (event.action, str(event.record.id)) == ("created", response.json()["id"])
+    finally:
+        change_bus.unsubscribe(subscriber)
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from core.filters import FilterCompiler
+from exceptions import CustomException
+from httpx import AsyncClient
+from modules.v1.tasks.models import Tasks
+from users.models import Users
+
+
+def test_compile_typed_filters():
+    compiler = FilterCompiler(model=Tasks)
+    query = compiler.compile(params={"status__in": "to_do,done", "created_at__gte": "2026-01-01", "created_at__lt": "2026-02-01", "summary__startswith": "Fix (a)"})
+    assert query == {
+        "status": {"$in": ["to_do", "done"]},
+        "created_at": {"$gte": datetime(2026, 1, 1), "$lt": datetime(2026, 2, 1)},
+        "summary": {"$regex": r"^Fix\ \(a\)"},
+    }
+    assert compiler.compile(params={"id": "6650f0e1a1b2c3d4e5f60718", "page": "2"}) == {"_id": ObjectId("6650f0e1a1b2c3d4e5f60718")}
+    assert compiler.compile(params={"description__isnull": "true"}) == {"description": None}
+
+
+def test_reject_invalid_filters():
+    compiler = FilterCompiler(model=Users, exclude=["password"])
+    for params in ({"password": "secret"}, {"unknown": "1"}, {"type__gt": "admin"}, {"type": "superuser"}, {"created_at__gte": "yesterday"}):
+        with pytest.raises(CustomException) as exc_info:
+            compiler.compile(params=params)
+        assert exc_info.value.status == 400
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_filter_tasks(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    for summary in ("first", "second", "third"):
+        response = await client.post("v1/tasks", headers=headers, json={"summary": summary})
+        assert response.status_code == 201
+
+    response = await client.get("v1/tasks", headers=headers, params={"summary__in": "first,third", "status": "to_do"})
+    assert response.status_code == 200
+    assert sorted(task["summary"] for task in response.json()["results"]) == ["first", "third"]
+
+    response = await client.get("v1/tasks", headers=headers, params={"status": "archived"})
+    assert response.status_code == 400
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from core.idempotency import idempotency_store
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_idempotent_create_task(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": str(ObjectId())}
+
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "once"})
+    assert response.status_code == 201
+    assert "idempotent-replayed" not in response.headers
+    task_id = response.json()["id"]
+
+    retry = await client.post("v1/tasks", headers=headers, json={"summary": "once"})
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json()["id"] == task_id
+
+    # Replayed from the collection when the retry reaches another worker
+    idempotency_store.cache.clear()
+    retry = await client.post("v1/tasks", headers=headers, json={"summary": "once"})
+    assert retry.json()["id"] == task_id
+
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "another"})
+    assert response.status_code == 422
+
+    response = await client.get("v1/tasks", headers={"Authorization": headers["Authorization"]})
+    assert response.json()["total_items"] == 1
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_concurrent_duplicates(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": str(ObjectId())}
+
+    responses = await asyncio.gather(*[client.post("v1/tasks", headers=headers, json={"summary": "concurrent"}) for _ in range(5)])
+    assert {response.status_code for response in responses} == {201}
+    assert len({response.json()["id"] for response in responses}) == 1
+
+    response = await client.get("v1/tasks", headers={"Authorization": headers["Authorization"]})
+    assert response.json()["total_items"] == 1
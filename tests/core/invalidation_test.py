@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+from core.invalidation import InvalidationBus
+from db.backends.memory import MemoryStorage
+
+
+async def wait_for(condition, timeout: float = 1.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_invalidation_between_workers():
+    storage = MemoryStorage()
+    workers = [InvalidationBus(collection="cache_invalidations", size=1024 * 1024, max_documents=100, max_lag=5) for _ in range(2)]
+    invalidated = [[], []]
+    for bus, calls in zip(workers, invalidated):
+        bus.register(collection="tasks", handler=calls.append)
+        await bus.start(storage=storage)
+    try:
+        workers[0].publish(collection="tasks", _id=str(ObjectId()), owner="alice", version=1)
+        await wait_for(lambda: invalidated[1] == ["alice"])
+        # A worker does not apply its own events
+        assert invalidated[0] == []
+
+        # An event received later than the maximum lag means the tail fell behind: every owner is invalidated
+        workers[1].max_lag = timedelta(0)
+        workers[0].publish(collection="tasks", owner="bob", version=2)
+        await wait_for(lambda: "bob" in invalidated[1])
+        assert invalidated[1] == ["alice", None, "bob"]
+        assert not workers[1].healthy
+        # The caches are only flushed on the transition, not for every late event
+        workers[0].publish(collection="tasks", owner="dave", version=3)
+        await wait_for(lambda: "dave" in invalidated[1])
+        assert invalidated[1] == ["alice", None, "bob", "dave"]
+
+        workers[1].max_lag = timedelta(seconds=5)
+        workers[0].publish(collection="tasks", owner="carol", version=4)
+        await wait_for(lambda: "carol" in invalidated[1])
+        assert workers[1].healthy
+    finally:
+        for bus in workers:
+            await bus.stop()
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_invalidation_after_clock_skew():
+    storage = MemoryStorage()
+    bus = InvalidationBus(collection="cache_invalidations", size=1024 * 1024, max_documents=100, max_lag=5, retry_interval=0.05)
+    invalidated = []
+    bus.register(collection="tasks", handler=invalidated.append)
+    collection = await storage.create_capped_collection(name="cache_invalidations", size=1024 * 1024, max_documents=100)
+    tail = collection.tail
+
+    async def dying_tail(*args, **kwargs):
+        # The first cursor dies after its first event
+        async for event in tail(*args, **kwargs):
+            yield event
+            if collection.tail is dying_tail:
+                collection.tail = tail
+                return
+
+    collection.tail = dying_tail
+    await bus.start(storage=storage)
+    try:
+        await collection.insert_one(document={"_id": ObjectId(), "c": "tasks", "o": "alice", "w": "other"})
+        await wait_for(lambda: invalidated == ["alice"])
+        # Inserted after the event of alice by a worker whose clock is behind: the reopened tail still applies it, once
+        skewed_id = ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(seconds=1))
+        await collection.insert_one(document={"_id": skewed_id, "c": "tasks", "o": "bob", "w": "other"})
+        await wait_for(lambda: "bob" in invalidated)
+        await asyncio.sleep(0.1)
+        assert invalidated == ["alice", "bob"]
+        assert bus.healthy
+    finally:
+        await bus.stop()
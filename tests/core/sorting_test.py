@@ -0,0 +1,44 @@
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from core.sorting import SortRegistry, parse_sort
+from exceptions import CustomException
+from httpx import AsyncClient
+
+
+def test_parse_sort():
+    assert parse_sort(sort_by="status,-created_at", order_by="asc") == [("status", 1), ("created_at", -1)]
+    assert parse_sort(sort_by="created_at") == [("created_at", -1)]
+    assert parse_sort(sort_by="+id", order_by="desc") == [("_id", 1)]
+    for sort_by in ("status,status", "a,b,c,d", "created_at;drop", "-"):
+        with pytest.raises(CustomException) as exc_info:
+            parse_sort(sort_by=sort_by)
+        assert exc_info.value.status == 400
+
+
+def test_resolve_sort():
+    indexes = [[("created_by", 1), ("status", 1), ("created_at", -1), ("_id", -1)]]
+    registry = SortRegistry(service_name="tasks", sortable_fields=["status", "created_at", "summary"], indexes=indexes, require_index=True)
+    # The equality on created_by skips the first key of the index, and the index can be walked backwards
+    assert registry.resolve(sort=[("status", 1), ("created_at", -1)], query={"created_by": "a"}) == [("status", 1), ("created_at", -1), ("_id", -1)]
+    assert registry.resolve(sort=[("status", -1), ("created_at", 1)], query={"created_by": "a"}) == [("status", -1), ("created_at", 1), ("_id", 1)]
+    for sort, query in (([("summary", 1)], {"created_by": "a"}), ([("status", 1)], {}), ([("password", 1)], {})):
+        with pytest.raises(CustomException) as exc_info:
+            registry.resolve(sort=sort, query=query)
+        assert exc_info.value.status == 400
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_sort_tasks(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    for summary in ("b", "a", "c"):
+        response = await client.post("v1/tasks", headers=headers, json={"summary": summary})
+        assert response.status_code == 201
+
+    response = await client.get("v1/tasks", headers=headers, params={"sort_by": "status,summary", "order_by": "asc"})
+    assert response.status_code == 200
+    assert [task["summary"] for task in response.json()["results"]] == ["a", "b", "c"]
+
+    response = await client.get("v1/tasks", headers=headers, params={"sort_by": "created_by"})
+    assert response.status_code == 400
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+from db.backends.memory import MemoryCollection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+
+async def seed_collection() -> MemoryCollection:
+    collection = MemoryCollection(name="tasks")
+    await collection.insert_many(
+        documents=[
+            {"summary": "Write report", "status": "to_do", "priority": 2, "created_at": datetime(2026, 1, 3), "tags": ["work"]},
+            {"summary": "Review budget", "status": "done", "priority": 1, "created_at": datetime(2026, 1, 1), "deleted_at": datetime(2026, 1, 5)},
+            {"summary": "Plan sprint", "status": "in_progress", "priority": 2, "created_at": datetime(2026, 1, 2), "tags": ["work", "team"]},
+        ]
+    )
+    return collection
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_memory_filters():
+    collection = await seed_collection()
+    assert await collection.count_documents(filter={"deleted_at": None}) == 2
+    assert await collection.count_documents(filter={"status": {"$in": ["to_do", "done"]}}) == 2
+    assert await collection.count_documents(filter={"created_at": {"$gte": datetime(2026, 1, 2)}, "priority": {"$ne": 1}}) == 2
+    assert await collection.count_documents(filter={"tags": "team"}) == 1
+    assert await collection.count_documents(filter={"$or": [{"summary": {"$regex": ".*REPORT.*", "$options": "i"}}, {"status": "done"}]}) == 2
+    assert await collection.count_documents(filter={"priority": {"$gt": "1"}}) == 0
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_memory_find_sort_projection_pagination():
+    collection = await seed_collection()
+    documents = await collection.find(filter={}, projection={"summary": 1}, sort=[("priority", -1), ("created_at", 1)], skip=1, limit=1)
+    assert len(documents) == 1
+    assert set(documents[0]) == {"_id", "summary"}
+    assert documents[0]["summary"] == "Write report"
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_memory_updates():
+    collection = await seed_collection()
+    document = await collection.find_one(filter={"status": "to_do"})
+    assert await collection.update_one(filter={"_id": document["_id"]}, update={"$set": {"status": "done"}, "$unset": {"tags": 1}}) == 1
+    # Setting the same values again modifies nothing
+    assert await collection.update_one(filter={"_id": document["_id"]}, update={"$set": {"status": "done"}}) == 0
+    updated = await collection.find_one(filter={"_id": document["_id"]})
+    assert updated["status"] == "done" and "tags" not in updated
+
+    # Returned documents are copies
+    updated["status"] = "to_do"
+    assert (await collection.find_one(filter={"_id": document["_id"]}))["status"] == "done"
+
+    with pytest.raises(DuplicateKeyError):
+        await collection.insert_one(document={"_id": document["_id"]})
+
+    # An ordered insert stops at the first duplicate, an unordered one inserts the other documents
+    with pytest.raises(BulkWriteError) as error:
+        await collection.insert_many(documents=[{"_id": "a"}, {"_id": document["_id"]}, {"_id": "b"}])
+    assert error.value.details["nInserted"] == 1
+    assert await collection.find_one(filter={"_id": "b"}) is None
+    with pytest.raises(BulkWriteError) as error:
+        await collection.insert_many(documents=[{"_id": "a"}, {"_id": "c"}, {"_id": document["_id"]}, {"_id": "b"}], ordered=False)
+    assert [write_error["index"] for write_error in error.value.details["writeErrors"]] == [0, 2]
+    assert error.value.details["nInserted"] == 2
+    assert await collection.find_one(filter={"_id": "b"}) is not None
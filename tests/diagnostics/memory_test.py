@@ -0,0 +1,40 @@
+import pytest
+from auth.services import auth_services
+from httpx import AsyncClient
+
+
+async def get_admin_headers() -> dict:
+    token = await auth_services.create_access_token(user_id="6650f0e1a1b2c3d4e5f60718", user_type="admin")
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_memory_usage(client: AsyncClient):
+    headers = await get_admin_headers()
+    response = await client.get("v1/diagnostics/memory", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["gc"]["tracked_objects"] > 0
+
+    response = await client.get("v1/diagnostics/memory/objects", headers=headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_snapshot_diff(client: AsyncClient):
+    headers = await get_admin_headers()
+    response = await client.post("v1/diagnostics/memory/snapshots", headers=headers)
+    assert response.status_code == 400
+
+    response = await client.post("v1/diagnostics/memory/tracing/start", headers=headers, json={"frames": 1})
+    assert response.json()["tracing"] is True
+    old_id = (await client.post("v1/diagnostics/memory/snapshots", headers=headers)).json()["snapshot_id"]
+    new_id = (await client.post("v1/diagnostics/memory/snapshots", headers=headers)).json()["snapshot_id"]
+    response = await client.post("v1/diagnostics/memory/tracing/stop", headers=headers)
+    assert response.json()["tracing"] is False
+
+    response = await client.get(f"v1/diagnostics/memory/snapshots/{old_id}/diff/{new_id}", headers=headers, params={"group_by": "filename", "limit": 5})
+    assert response.status_code == 200
+    assert len(response.json()["statistics"]) <= 5
+
+    response = await client.get("v1/diagnostics/memory/snapshots/unknown", headers=headers)
+    assert response.status_code == 404
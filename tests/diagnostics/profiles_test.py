@@ -0,0 +1,39 @@
+import pytest
+from auth.services import auth_services
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_profile_request(client: AsyncClient):
+    response = await client.get("v1/health/ping", params={"_profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-PROFILE-ID"]
+    assert profile_id == response.headers["X-REQUEST-ID"]
+
+    token = await auth_services.create_access_token(user_id="6650f0e1a1b2c3d4e5f60718", user_type="admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.get(f"v1/diagnostics/profiles/{profile_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["path"] == "/v1/health/ping"
+    assert response.json()["functions"]
+
+    response = await client.get(f"v1/diagnostics/profiles/{profile_id}/folded", headers=headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_profiles_are_admin_only(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id="6650f0e1a1b2c3d4e5f60718", user_type="user")
+    response = await client.get("v1/diagnostics/profiles", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_profile_flag_is_stripped_with_header(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id="6650f0e1a1b2c3d4e5f60718", user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    # The query flag never reaches the filters of the list, whichever of the header or the query string decides
+    for header in ("1", "0"):
+        response = await client.get("v1/tasks", headers={**headers, "X-PROFILE": header}, params={"_profile": "1"})
+        assert response.status_code == 200
+        assert ("X-PROFILE-ID" in response.headers) is (header == "1")
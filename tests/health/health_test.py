@@ -0,0 +1,25 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_liveness(client: AsyncClient):
+    response = await client.get("v1/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    # The probe is answered before LogMiddleware
+    assert "X-REQUEST-ID" not in response.headers
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_readiness(client: AsyncClient):
+    response = await client.get("v1/health/ready")
+    assert response.status_code == 200
+    result = response.json()
+    assert result["ready"] is True
+    assert result["database"]["status"] == "ok"
+    assert {"checked_out", "open", "max_size", "occupancy"} <= result["connection_pool"].keys()
+
+    # The result is cached for a short interval
+    response = await client.get("v1/health/ready")
+    assert response.json()["checked_at"] == result["checked_at"]
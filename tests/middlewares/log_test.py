@@ -0,0 +1,19 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_request_id_is_generated(client: AsyncClient):
+    response = await client.get("v1/health/ping")
+    assert response.status_code == 200
+    assert response.headers["X-REQUEST-ID"]
+    assert response.headers["X-PROCESS-TIME"].endswith("s")
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_request_id_is_propagated(client: AsyncClient):
+    response = await client.get("v1/health/ping", headers={"X-REQUEST-ID": "client-id-1"})
+    assert response.headers["X-REQUEST-ID"] == "client-id-1"
+
+    response = await client.get("v1/health/ping", headers={"X-REQUEST-ID": "not valid!"})
+    assert response.headers["X-REQUEST-ID"] != "not valid!"
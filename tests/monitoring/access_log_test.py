@@ -0,0 +1,34 @@
+import json
+
+from monitoring.access_log import AccessLogger, AccessLogSampler, AccessLogWriter
+
+
+def test_sampler_keeps_errors_and_slow_requests():
+    sampler = AccessLogSampler(sample_rate=0, slow_request_ms=100)
+    assert sampler.should_keep(status=200, duration_ms=10) is False
+    assert sampler.should_keep(status=500, duration_ms=10) is True
+    assert sampler.should_keep(status=404, duration_ms=10) is True
+    assert sampler.should_keep(status=200, duration_ms=150) is True
+
+
+def test_writer_drops_when_queue_is_full(tmp_path):
+    writer = AccessLogWriter(path=str(tmp_path / "access.jsonl"), queue_size=2, batch_size=10, flush_interval=0.01, rotation_bytes=1024)
+    assert writer.emit(record={"n": 1}) is True
+    assert writer.emit(record={"n": 2}) is True
+    assert writer.emit(record={"n": 3}) is False
+    assert writer.stats()["dropped"] == 1
+
+
+def test_writer_writes_batches(tmp_path):
+    path = tmp_path / "access.jsonl"
+    writer = AccessLogWriter(path=str(path), queue_size=100, batch_size=10, flush_interval=0.01, rotation_bytes=1024 * 1024)
+    access_logger = AccessLogger(writer=writer, sampler=AccessLogSampler(sample_rate=1, slow_request_ms=100))
+    access_logger.start()
+    for index in range(25):
+        access_logger.log(request_id=str(index), method="GET", path="/v1/tasks", route="/v1/tasks", status=200, duration_ms=1.5)
+    access_logger.stop()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 25
+    assert json.loads(lines[0])["request_id"] == "0"
+    assert access_logger.stats()["written"] == 25
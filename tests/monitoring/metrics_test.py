@@ -0,0 +1,24 @@
+import pytest
+from auth.services import auth_services
+from httpx import AsyncClient
+from monitoring import metrics
+
+
+def test_cache_hit_ratio():
+    metrics.record_cache_access(cache="test", hit=True)
+    metrics.record_cache_access(cache="test", hit=True)
+    metrics.record_cache_access(cache="test", hit=False)
+    assert metrics.get_cache_hit_ratios()["test"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_metrics_route_is_admin_only(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id="6650f0e1a1b2c3d4e5f60718", user_type="user")
+    response = await client.get("v1/metrics", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+    await client.get("v1/health/ping")
+    token = await auth_services.create_access_token(user_id="6650f0e1a1b2c3d4e5f60718", user_type="admin")
+    response = await client.get("v1/metrics", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds_count{method="GET",route="/v1/health/ping",status="200"}' in response.text
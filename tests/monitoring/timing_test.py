@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from core.routing import TimedRoute
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from middlewares.v1.timing import ServerTimingMiddleware
+from monitoring.timing import (
+    NULL_SPAN,
+    ServerTiming,
+    server_timing_context,
+    span,
+    timed,
+)
+
+
+def test_span_is_noop_when_disabled():
+    assert span("db") is NULL_SPAN
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_nested_spans_are_counted_once():
+    @timed("db")
+    async def inner():
+        return 1
+
+    @timed("db")
+    async def outer():
+        return await inner() + await inner()
+
+    timing = ServerTiming()
+    token = server_timing_context.set(timing)
+    try:
+        assert await outer() == 2
+        with span("auth"):
+            pass
+    finally:
+        server_timing_context.reset(token)
+    assert timing.counts == {"db": 1, "auth": 1}
+    assert timing.header_value().startswith("db;dur=")
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_concurrent_spans_are_all_counted():
+    @timed("db")
+    async def query():
+        await asyncio.sleep(0.01)
+        return 1
+
+    @timed("db")
+    async def outer():
+        return await query()
+
+    timing = ServerTiming()
+    token = server_timing_context.set(timing)
+    try:
+        # Overlapping spans of the same name in other tasks of the request (e.g. batched sub-requests) are not re-entries
+        assert await asyncio.gather(outer(), outer(), query()) == [1, 1, 1]
+    finally:
+        server_timing_context.reset(token)
+    assert timing.counts == {"db": 3}
+    assert timing.durations["db"] >= 0.03
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_server_timing_header():
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/items")
+    async def items():
+        with span("db"):
+            return {"items": []}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ServerTimingMiddleware)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/items")
+    names = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert names == ["db", "router", "serialize", "total"]
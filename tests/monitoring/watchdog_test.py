@@ -0,0 +1,21 @@
+import asyncio
+import time
+
+import pytest
+from monitoring.watchdog import LoopWatchdog
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_watchdog_detects_blocking_callback():
+    watchdog = LoopWatchdog(interval=0.01, block_threshold=0.05, window=100)
+    watchdog.start()
+    await asyncio.sleep(0.05)
+    # Block the event loop the way a synchronous call inside a coroutine would
+    time.sleep(0.2)
+    await asyncio.sleep(0.05)
+    await watchdog.stop()
+
+    stats = watchdog.stats()
+    assert stats["blocked_count"] == 1
+    assert stats["samples"] > 0
+    assert stats["max_ms"] >= 100
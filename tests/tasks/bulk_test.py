@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from httpx import AsyncClient
+from modules.v1.tasks.services import task_services
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_bulk_tasks(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    other_token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    response = await client.post("v1/tasks", headers={"Authorization": f"Bearer {other_token}"}, json={"summary": "not mine"})
+    other_id = response.json()["id"]
+
+    response = await client.post("v1/tasks/bulk", headers=headers, json={"tasks": [{"summary": f"task {index}"} for index in range(4)]})
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [201] * 4
+    assert [result["task"]["summary"] for result in results] == [f"task {index}" for index in range(4)]
+    ids = [result["id"] for result in results]
+    # The returned versions are the stored ones, to the millisecond
+    assert all(datetime.fromisoformat(result["task"]["updated_at"]).microsecond % 1000 == 0 for result in results)
+
+    # The tasks of another user are not selected
+    response = await client.patch("v1/tasks/bulk", headers=headers, json={"ids": [ids[0], ids[1], other_id], "status": "done"})
+    assert response.status_code == 200
+    assert [(result["id"], result["status"]) for result in response.json()["results"]] == [(ids[0], 200), (ids[1], 200), (other_id, 404)]
+    assert response.json()["results"][0]["task"]["status"] == "done"
+
+    response = await client.patch("v1/tasks/bulk", headers=headers, json={"filters": {"status": "to_do"}, "status": "in_progress"})
+    assert sorted(result["id"] for result in response.json()["results"]) == sorted(ids[2:])
+
+    response = await client.request("DELETE", "v1/tasks/bulk", headers=headers, json={"filters": {"status": "done"}})
+    assert sorted(result["id"] for result in response.json()["results"]) == sorted(ids[:2])
+    assert {result["status"] for result in response.json()["results"]} == {204}
+
+    response = await client.get("v1/tasks", headers=headers)
+    assert response.json()["total_items"] == 2
+    assert {task["status"] for task in response.json()["results"]} == {"in_progress"}
+
+    response = await client.request("DELETE", "v1/tasks/bulk", headers=headers, json={"ids": [ids[0]], "filters": {"status": "done"}})
+    assert response.status_code == 400
+    response = await client.patch("v1/tasks/bulk", headers=headers, json={"status": "done"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_bulk_update_with_concurrent_edit(client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("v1/tasks/bulk", headers=headers, json={"tasks": [{"summary": f"task {index}"} for index in range(2)]})
+    ids = [result["id"] for result in response.json()["results"]]
+
+    # Another request edits a task between the bulk write and its read back
+    update_many = task_services.crud.update_many
+
+    async def racing_update_many(*args, **kwargs):
+        result = await update_many(*args, **kwargs)
+        await task_services.crud.update_by_id(_id=ids[0], data={"summary": "edited", "updated_at": datetime.now()})
+        return result
+
+    monkeypatch.setattr(task_services.crud, "update_many", racing_update_many)
+    response = await client.patch("v1/tasks/bulk", headers=headers, json={"ids": ids, "status": "done"})
+    monkeypatch.undo()
+    assert [(result["id"], result["status"]) for result in response.json()["results"]] == [(ids[0], 200), (ids[1], 200)]
+    assert response.json()["results"][0]["task"]["summary"] == "edited"
@@ -0,0 +1,42 @@
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from core.config import settings
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_task_changes(client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "sync_settle_seconds", 0)
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    task_ids = []
+    for summary in ("first", "second"):
+        response = await client.post("v1/tasks", headers=headers, json={"summary": summary})
+        task_ids.append(response.json()["id"])
+
+    response = await client.get("v1/tasks/changes", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert [(change["id"], change["action"]) for change in body["changes"]] == [(task_ids[0], "created"), (task_ids[1], "created")]
+    assert body["has_more"] is False
+
+    await client.put(f"v1/tasks/{task_ids[0]}", headers=headers, json={"summary": "first, renamed"})
+    await client.delete(f"v1/tasks/{task_ids[1]}", headers=headers)
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "third"})
+    task_ids.append(response.json()["id"])
+
+    response = await client.get("v1/tasks/changes", headers=headers, params={"since": body["next_token"], "limit": 2})
+    page = response.json()
+    assert [(change["id"], change["action"]) for change in page["changes"]] == [(task_ids[0], "updated"), (task_ids[1], "deleted")]
+    assert page["changes"][0]["task"]["summary"] == "first, renamed"
+    assert page["has_more"] is True
+
+    response = await client.get("v1/tasks/changes", headers=headers, params={"since": page["next_token"]})
+    page = response.json()
+    assert [(change["id"], change["action"]) for change in page["changes"]] == [(task_ids[2], "created")]
+
+    response = await client.get("v1/tasks/changes", headers=headers, params={"since": page["next_token"]})
+    assert response.json()["changes"] == []
+    response = await client.get("v1/tasks/changes", headers=headers, params={"since": "not-a-token"})
+    assert response.status_code == 400
@@ -0,0 +1,20 @@
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_fields_projection(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "projected", "description": "not selected"})
+    _id = response.json()["id"]
+
+    response = await client.get("v1/tasks", headers=headers, params={"fields": "summary,status"})
+    assert response.status_code == 200
+    assert response.json()["results"] == [{"id": _id, "summary": "projected", "status": "to_do"}]
+
+    response = await client.get(f"v1/tasks/{_id}", headers=headers, params={"fields": "summary"})
+    assert response.status_code == 200
+    assert response.json() == {"id": _id, "summary": "projected"}
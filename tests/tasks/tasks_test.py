@@ -0,0 +1,18 @@
+import pytest
+from auth.services import auth_services
+from bson import ObjectId
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_task_edit_status(client: AsyncClient):
+    token = await auth_services.create_access_token(user_id=str(ObjectId()), user_type="user")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("v1/tasks", headers=headers, json={"summary": "first"})
+    task_id = response.json()["id"]
+
+    response = await client.put(f"v1/tasks/{task_id}", headers=headers, json={"status": "done"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+    response = await client.get(f"v1/tasks/{task_id}", headers=headers)
+    assert (response.json()["summary"], response.json()["status"]) == ("first", "done")